@@ -0,0 +1,139 @@
+"""The FastAPI application, assembled from :class:`Settings`.
+
+Importing this module reads no settings. ``build_app(settings)`` installs them and sizes the
+process-wide hash pool, caches, probers and admission limits from them; engines and background
+tasks start in the lifespan, i.e. in each worker after a preloading server has forked.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
+from anyio import to_thread
+from fastapi import FastAPI, Request, status
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.core.admission import AdmissionMiddleware, admission_control, admission_limits
+from app.core.compression import CompressionMiddleware
+from app.core.config import Settings, use_settings
+from app.core.hashing import HashingQueueFull
+from app.core.logging import AccessLogMiddleware, configure_logging
+from app.core.metrics import MetricsMiddleware
+from app.core.principal_cache import listen_for_principal_changes, principal_cache
+from app.core.revocation import token_revocations
+from app.core.security import KeyRing, configure_password_hashing, password_hash_pool, use_key_ring
+from app.core.token_cache import verified_tokens
+from app.db.health import database_health
+from app.db.replicas import ReadYourWritesMiddleware, replica_router
+from app.db.session import dispose_engines, replica_names, use_databases
+from app.routers import auth, healthz, items, metrics, users
+from app.services.principals import apply_principal_change_payload
+
+
+def configure_components(settings: Settings) -> None:
+    """Size the process-wide singletons that requests share from ``settings``."""
+    use_settings(settings)
+    use_key_ring(KeyRing.from_settings(settings))
+    verified_tokens.configure(settings.token_cache_max_entries)
+    configure_password_hashing(settings)
+    principal_cache.configure(settings.principal_cache_max_entries, settings.principal_cache_ttl_seconds)
+    token_revocations.configure(retention_seconds=settings.access_token_expire_minutes * 60)
+    database_health.configure(
+        settings.health_probe_interval_seconds, settings.health_probe_timeout_seconds, settings.health_failure_threshold
+    )
+    replica_router.configure(
+        replica_names(settings),
+        settings.health_probe_interval_seconds,
+        settings.health_probe_timeout_seconds,
+        settings.db_replica_max_lag_seconds,
+    )
+    admission_control.configure(admission_limits(settings))
+
+
+def build_app(settings: Settings) -> FastAPI:
+    configure_logging(settings)
+    configure_components(settings)
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        # Bounds run_in_threadpool (sync dependencies, ThreadedSession calls in DB_ASYNC=false mode);
+        # Settings validation keeps it within the connection pool's capacity.
+        to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+        databases = await use_databases(settings)
+        prober = asyncio.create_task(database_health.run())
+        replica_prober = asyncio.create_task(replica_router.run()) if replica_router.enabled else None
+        listener = None
+        if settings.principal_cache_notify:
+            listener = asyncio.create_task(
+                listen_for_principal_changes(databases.libpq_dsn, apply_principal_change_payload, principal_cache.clear)
+            )
+        yield
+        for task in (listener, replica_prober, prober):
+            if task is not None:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        password_hash_pool.shutdown()
+        await dispose_engines()
+
+    app = FastAPI(title="Template FastAPI", version="0.1.0", lifespan=lifespan, default_response_class=ORJSONResponse)
+
+    if settings.admission_control:
+        # Innermost, so rejections still get CORS headers and are counted by the outer middleware.
+        app.add_middleware(AdmissionMiddleware, control=admission_control)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins or ["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["ETag", "X-DB-Primary-Until"],
+    )
+
+    if settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            content_types=settings.compression_content_types,
+            levels={
+                "gzip": settings.compression_gzip_level,
+                "br": settings.compression_brotli_level,
+                "zstd": settings.compression_zstd_level,
+            },
+        )
+
+    if replica_router.enabled:
+        app.add_middleware(ReadYourWritesMiddleware, window_seconds=replica_router.sticky_seconds)
+
+    app.add_middleware(
+        AccessLogMiddleware,
+        sample_rate=settings.access_log_sample_rate,
+        slow_seconds=settings.access_log_slow_ms / 1000,
+    )
+
+    if settings.metrics_enabled:
+        # Added last so it wraps CORS as well and times the full response.
+        app.add_middleware(MetricsMiddleware)
+
+    @app.exception_handler(HashingQueueFull)
+    async def hashing_queue_full_handler(_: Request, __: HashingQueueFull) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Authentication is busy, retry shortly"},
+            headers={"Retry-After": "1"},
+        )
+
+    app.include_router(healthz.router)
+    app.include_router(auth.router)
+    app.include_router(users.router)
+    app.include_router(items.router)
+    if settings.metrics_enabled:
+        app.include_router(metrics.router)
+
+    @app.get("/", tags=["root"])
+    async def read_root() -> dict[str, str]:
+        return {"message": "API is running"}
+
+    return app
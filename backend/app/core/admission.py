@@ -0,0 +1,218 @@
+"""Admission control: adaptive per-class concurrency limits in front of the application.
+
+Requests are classed as ``login`` (``POST /auth/login``, bcrypt-bound), ``write`` (any other
+unsafe method) or ``read``. Each class admits up to its current limit concurrently; the excess
+waits in a bounded FIFO queue and is turned away with ``503`` and ``Retry-After`` once the queue
+is full or a waiter's deadline passes. That answer costs microseconds, where admitting the
+request would add it to the threadpool and connection-pool backlog until the client gave up.
+
+Limits adapt to observed latency with a gradient rule: a short-term latency average rising
+above ``tolerance`` times the long-term baseline shrinks the limit, a steady one lets it grow
+by about ``sqrt(limit)`` per update, always within ``[min_limit, max_limit]``. Health, readiness
+and metrics endpoints are never limited.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+from starlette.responses import JSONResponse
+
+from app.core.config import Settings
+
+EXEMPT_PATHS = frozenset({"/healthz", "/livez", "/readyz", "/metrics"})
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class Overloaded(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdaptiveLimit:
+    """Concurrency limit for one request class, adjusted after every completed request.
+
+    Only touched from the event loop, so it needs no locking.
+    """
+
+    SHORT_WEIGHT = 0.1
+    LONG_WEIGHT = 0.002
+    SMOOTHING = 0.2
+
+    def __init__(
+        self, max_limit: int, queue_size: int, queue_timeout_seconds: float, min_limit: int = 1, tolerance: float = 2.0
+    ) -> None:
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.limit = float(max(self.min_limit, max_limit // 2))
+        self.queue_size = queue_size
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.tolerance = tolerance
+        self.in_flight = 0
+        self.rejected: dict[str, int] = {"queue_full": 0, "timeout": 0}
+        self._waiters: deque[asyncio.Future] = deque()
+        self._short: Optional[float] = None
+        self._long: Optional[float] = None
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting at most ``queue_timeout_seconds``; raises :class:`Overloaded`."""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.queue_size:
+            self.rejected["queue_full"] += 1
+            raise Overloaded("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # On success _wake_waiters has already counted the slot in in_flight.
+            await asyncio.wait_for(waiter, self.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            self.rejected["timeout"] += 1
+            raise Overloaded("timeout") from None
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+
+    def release(self, latency_seconds: Optional[float]) -> None:
+        self.in_flight -= 1
+        if latency_seconds is not None:
+            self._update(latency_seconds)
+        self._wake_waiters()
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # Granted a slot just as the wait ended: pass it on.
+            self.in_flight -= 1
+            self._wake_waiters()
+            return
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _update(self, latency: float) -> None:
+        if self._short is None or self._long is None:
+            self._short = self._long = latency
+            return
+        self._short += self.SHORT_WEIGHT * (latency - self._short)
+        self._long += self.LONG_WEIGHT * (latency - self._long)
+        if self._long > 2 * self._short:
+            # Load dropped well below the baseline's era; let the baseline catch up quickly.
+            self._long *= 0.95
+        # Growing the limit while it is not even half used would only measure idle latency.
+        if self.in_flight + 1 < self.limit / 2 and self._short <= self.tolerance * self._long:
+            return
+        gradient = max(0.5, min(1.0, self.tolerance * self._long / self._short))
+        target = self.limit * gradient + math.sqrt(self.limit)
+        smoothed = (1 - self.SMOOTHING) * self.limit + self.SMOOTHING * target
+        self.limit = max(float(self.min_limit), min(float(self.max_limit), smoothed))
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "rejected": dict(self.rejected),
+        }
+
+
+def request_class(scope: dict) -> Optional[str]:
+    """``login``, ``write`` or ``read``; ``None`` for exempt endpoints."""
+    path = scope["path"]
+    if path in EXEMPT_PATHS:
+        return None
+    method = scope["method"]
+    if method == "POST" and path == "/auth/login":
+        return "login"
+    return "read" if method in SAFE_METHODS else "write"
+
+
+class AdmissionControl:
+    def __init__(self, limits: dict[str, AdaptiveLimit], retry_after_seconds: int = 1) -> None:
+        self.limits = limits
+        self.retry_after_seconds = retry_after_seconds
+
+    def configure(self, limits: dict[str, AdaptiveLimit]) -> None:
+        self.limits = limits
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {name: limit.snapshot() for name, limit in self.limits.items()}
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware applying :class:`AdmissionControl` to HTTP requests."""
+
+    def __init__(self, app: Any, control: AdmissionControl) -> None:
+        self.app = app
+        self.control = control
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        name = request_class(scope) if scope["type"] == "http" else None
+        limit = self.control.limits.get(name) if name is not None else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limit.acquire()
+        except Overloaded:
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server is busy, retry shortly"},
+                headers={"Retry-After": str(self.control.retry_after_seconds)},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        latency: Optional[float] = None
+
+        async def send_timed(message: dict) -> None:
+            nonlocal latency
+            if message["type"] == "http.response.start":
+                # Time to the first byte: streamed exports would otherwise look like overload.
+                latency = time.perf_counter() - started
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            limit.release(latency)
+
+
+def admission_limits(settings: Settings) -> dict[str, AdaptiveLimit]:
+    def limit(max_limit: int) -> AdaptiveLimit:
+        return AdaptiveLimit(
+            max_limit,
+            queue_size=settings.admission_queue_size,
+            queue_timeout_seconds=settings.admission_queue_timeout_ms / 1000,
+            tolerance=settings.admission_latency_tolerance,
+        )
+
+    return {
+        "login": limit(settings.admission_limit_login),
+        "write": limit(settings.admission_limit_write),
+        "read": limit(settings.admission_limit_read),
+    }
+
+
+# Admits everything until build_app installs the limits from the settings.
+admission_control = AdmissionControl({})
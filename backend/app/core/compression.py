@@ -0,0 +1,279 @@
+"""Content-negotiated response compression.
+
+gzip is always available; brotli (``br``) and zstandard (``zstd``) are offered when the
+``brotli`` / ``zstandard`` packages are installed. The client's ``Accept-Encoding`` q-values pick
+among them, ties going to the server's order (zstd, br, gzip).
+
+Only allowlisted content types are compressed. Complete bodies below ``minimum_size`` are sent as
+they are; from ``offload_size`` up they are compressed on a worker thread so the event loop keeps
+serving other requests. Streaming bodies (exports) are compressed chunk by chunk and flushed after
+each one, so nothing is buffered and clients still receive rows as they are produced.
+
+A compressed body is a different representation, so a strong ``ETag`` gets a per-coding suffix
+(``"abc"`` becomes ``"abc-gzip"``). The suffix is stripped from ``If-Match`` / ``If-None-Match``
+before the application sees them, where the tag still names a row version that ``If-Match``
+turns back into a ``WHERE`` clause; a ``304`` answering a suffixed tag carries the suffix again.
+``Vary: Accept-Encoding`` keeps caches apart.
+"""
+
+import zlib
+from typing import Any, Callable, Optional, Protocol, Sequence
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+# Complete bodies at least this large are compressed off the event loop.
+OFFLOAD_SIZE = 64 * 1024
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+
+class Encoder(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class GzipEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+# Server preference order.
+ENCODERS: dict[str, Callable[[int], Encoder]] = {}
+if zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+ENCODERS["gzip"] = GzipEncoder
+
+
+def coded_etag(etag: str, coding: str) -> str:
+    """Tag of the ``coding``-compressed representation; weak tags already allow any encoding."""
+    if len(etag) >= 2 and etag[0] == etag[-1] == '"':
+        return f'{etag[:-1]}-{coding}"'
+    return etag
+
+
+def strip_coded_etags(value: str, codings: Sequence[str]) -> tuple[str, Optional[str]]:
+    """``If-Match`` / ``If-None-Match`` with coding suffixes removed, and the coding that was removed."""
+    stripped: Optional[str] = None
+    tags = []
+    for tag in value.split(","):
+        tag = tag.strip()
+        for coding in codings:
+            suffix = f'-{coding}"'
+            if tag.endswith(suffix) and len(tag) > len(suffix) + 1:
+                tag = tag[: -len(suffix)] + '"'
+                stripped = coding
+                break
+        tags.append(tag)
+    return ", ".join(tags), stripped
+
+
+def negotiate(accept_encoding: str, available: Sequence[str]) -> Optional[str]:
+    """The available coding the client weights highest (``q`` > 0), or ``None`` for identity."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    best: Optional[str] = None
+    best_q = 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing allowlisted responses in the negotiated coding."""
+
+    def __init__(
+        self,
+        app: Any,
+        minimum_size: int,
+        content_types: Sequence[str],
+        levels: dict[str, int],
+        encoders: Optional[dict[str, Callable[[int], Encoder]]] = None,
+        offload_size: int = OFFLOAD_SIZE,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = frozenset(content_type.lower() for content_type in content_types)
+        self.levels = levels
+        self.encoders = ENCODERS if encoders is None else encoders
+        self.offload_size = offload_size
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        scope, validated = self.strip_conditionals(scope)
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""), list(self.encoders))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(self, coding, send, validated))
+
+    def strip_conditionals(self, scope: dict) -> tuple[dict, Optional[str]]:
+        """Scope whose conditional headers name plain tags; also the coding an ``If-None-Match`` named."""
+        validated: Optional[str] = None
+        raw = []
+        changed = False
+        for name, value in scope["headers"]:
+            if name in (b"if-match", b"if-none-match"):
+                plain, coding = strip_coded_etags(value.decode("latin-1"), list(self.encoders))
+                if coding is not None:
+                    changed = True
+                    value = plain.encode("latin-1")
+                    if name == b"if-none-match":
+                        validated = coding
+            raw.append((name, value))
+        return ({**scope, "headers": raw} if changed else scope), validated
+
+    def compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        return media_type in self.content_types
+
+    def encoder(self, coding: str) -> Encoder:
+        return self.encoders[coding](self.levels[coding])
+
+    async def run(self, fn: Callable[[], bytes], size: int) -> bytes:
+        """``fn()``, on a worker thread when it compresses at least ``offload_size`` bytes."""
+        return await run_in_threadpool(fn) if size >= self.offload_size else fn()
+
+
+class _CompressingSend:
+    """``send`` for one response: decides at the first body message, then encodes every chunk."""
+
+    def __init__(
+        self, middleware: CompressionMiddleware, coding: str, send: Callable, validated: Optional[str] = None
+    ) -> None:
+        self.middleware = middleware
+        self.coding = coding
+        self.send = send
+        self.validated = validated
+        self.start: Optional[dict] = None
+        self.encoder: Optional[Encoder] = None
+        self.passthrough = False
+
+    async def __call__(self, message: dict) -> None:
+        if self.passthrough:
+            await self.send(message)
+            return
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message.get("headers", []))
+            if message["status"] == 304 and self.validated is not None and "etag" in headers:
+                # The client validated the compressed representation; confirm that tag.
+                mutable = MutableHeaders(raw=list(message.get("headers", [])))
+                mutable["ETag"] = coded_etag(mutable["ETag"], self.validated)
+                message["headers"] = mutable.raw
+            if message["status"] < 200 or message["status"] in (204, 304) or not self.middleware.compressible(headers):
+                self.passthrough = True
+                await self.send(message)
+            else:
+                # Held back until the first body chunk shows whether this is worth compressing.
+                self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.encoder is None:
+            assert self.start is not None
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                headers = MutableHeaders(raw=list(self.start.get("headers", [])))
+                headers.add_vary_header("Accept-Encoding")
+                self.start["headers"] = headers.raw
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.encoder = self.middleware.encoder(self.coding)
+            headers = MutableHeaders(raw=list(self.start.get("headers", [])))
+            self.start["headers"] = headers.raw
+            headers["Content-Encoding"] = self.coding
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers:
+                headers["ETag"] = coded_etag(headers["ETag"], self.coding)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                encoder = self.encoder
+                compressed = await self.middleware.run(lambda: encoder.compress(body) + encoder.finish(), len(body))
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            await self.send(self.start)
+
+        encoder = self.encoder
+        if more_body:
+            chunk = await self.middleware.run(lambda: encoder.compress(body) + encoder.flush(), len(body)) if body else b""
+        else:
+            chunk = await self.middleware.run(lambda: encoder.compress(body) + encoder.finish(), len(body))
+        if chunk or not more_body:
+            await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
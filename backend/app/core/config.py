@@ -1,18 +1,90 @@
-from functools import lru_cache
-from typing import List
+from typing import List, Literal, Optional
 
-from pydantic import Field
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     database_url: str = Field(..., alias="DATABASE_URL")
+    # Comma-separated read replicas for GET/HEAD requests; empty sends everything to DATABASE_URL.
+    database_replica_urls: str = Field(default="", alias="DATABASE_REPLICA_URLS")
+    # Replicas further behind than this are ejected; clients that just wrote read from the primary
+    # for this long (plus one probe interval).
+    db_replica_max_lag_seconds: float = Field(default=5.0, gt=0, alias="DB_REPLICA_MAX_LAG_SECONDS")
+    db_async: bool = Field(default=True, alias="DB_ASYNC")
     db_schema: str = Field(default="public", alias="DB_SCHEMA")
+    # "queue" keeps a per-process connection pool; "pgbouncer" targets a transaction-mode PgBouncer:
+    # no client-side pool, no prepared statements and no startup options.
+    db_pool_mode: Literal["queue", "pgbouncer"] = Field(default="queue", alias="DB_POOL_MODE")
+    db_pool_size: int = Field(default=10, ge=1, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, ge=0, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=10.0, gt=0, alias="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(default=1800, ge=-1, alias="DB_POOL_RECYCLE")
+    # "always" pings on every checkout, "idle" only connections unused for DB_POOL_PING_IDLE_SECONDS,
+    # "never" relies on DB_POOL_RECYCLE and disconnect detection.
+    db_pool_pre_ping: Literal["always", "idle", "never"] = Field(default="idle", alias="DB_POOL_PRE_PING")
+    db_pool_ping_idle_seconds: float = Field(default=30.0, ge=0, alias="DB_POOL_PING_IDLE_SECONDS")
+    db_statement_timeout_ms: int = Field(default=30_000, ge=0, alias="DB_STATEMENT_TIMEOUT_MS")
+    threadpool_size: int = Field(default=20, ge=1, alias="THREADPOOL_SIZE")
     env: str = Field(default="development", alias="ENV")
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
+    # Records waiting for the background log writer; beyond this they are dropped and counted.
+    log_queue_size: int = Field(default=10_000, ge=1, alias="LOG_QUEUE_SIZE")
+    # Share of ordinary requests written to the access log; 5xx responses and requests slower
+    # than ACCESS_LOG_SLOW_MS are always logged.
+    access_log_sample_rate: float = Field(default=1.0, ge=0, le=1, alias="ACCESS_LOG_SAMPLE_RATE")
+    access_log_slow_ms: float = Field(default=1000.0, ge=0, alias="ACCESS_LOG_SLOW_MS")
     jwt_secret: str = Field(..., alias="JWT_SECRET")
+    # Comma-separated secrets that still verify tokens but no longer sign them, for rotating JWT_SECRET.
+    jwt_previous_secrets: str = Field(default="", alias="JWT_PREVIOUS_SECRETS")
     allowed_origins: str = Field(default="*", alias="ALLOWED_ORIGINS")
     access_token_expire_minutes: int = 60 * 24
+    auth_strict_token_check: bool = Field(default=False, alias="AUTH_STRICT_TOKEN_CHECK")
+    # "bcrypt", or "argon2" (needs argon2-cffi). Hashes made with the other scheme or other parameters
+    # are rehashed on the next successful login; scripts/calibrate_password_hash.py picks the cost.
+    password_hash_scheme: Literal["bcrypt", "argon2"] = Field(default="bcrypt", alias="PASSWORD_HASH_SCHEME")
+    password_bcrypt_rounds: int = Field(default=12, ge=4, le=31, alias="PASSWORD_BCRYPT_ROUNDS")
+    password_argon2_time_cost: int = Field(default=3, ge=1, alias="PASSWORD_ARGON2_TIME_COST")
+    password_argon2_memory_kib: int = Field(default=65_536, ge=8, alias="PASSWORD_ARGON2_MEMORY_KIB")
+    password_argon2_parallelism: int = Field(default=4, ge=1, alias="PASSWORD_ARGON2_PARALLELISM")
+    password_hash_workers: int = Field(default=2, ge=1, alias="PASSWORD_HASH_WORKERS")
+    password_hash_queue_size: int = Field(default=32, ge=0, alias="PASSWORD_HASH_QUEUE_SIZE")
+    # Longest a role change, password change or deletion made by another worker goes unnoticed here;
+    # 0 disables the cache and every request reads the user row.
+    principal_cache_ttl_seconds: float = Field(default=5.0, ge=0, alias="PRINCIPAL_CACHE_TTL_SECONDS")
+    principal_cache_max_entries: int = Field(default=10_000, ge=0, alias="PRINCIPAL_CACHE_MAX_ENTRIES")
+    principal_cache_notify: bool = Field(default=False, alias="PRINCIPAL_CACHE_NOTIFY")
+    # Verified access tokens kept (by digest) until they expire, so repeat requests skip the HMAC check.
+    token_cache_max_entries: int = Field(default=10_000, ge=0, alias="TOKEN_CACHE_MAX_ENTRIES")
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
+    # Bearer token required by /metrics; when empty it only answers loopback clients.
+    metrics_token: str = Field(default="", alias="METRICS_TOKEN")
+    health_probe_interval_seconds: float = Field(default=5.0, gt=0, alias="HEALTH_PROBE_INTERVAL_SECONDS")
+    health_probe_timeout_seconds: float = Field(default=2.0, gt=0, alias="HEALTH_PROBE_TIMEOUT_SECONDS")
+    # Consecutive failed probes before database-backed requests are rejected with 503; 0 disables.
+    health_failure_threshold: int = Field(default=2, ge=0, alias="HEALTH_FAILURE_THRESHOLD")
+    # Responses of these types are compressed (gzip; br and zstd when brotli / zstandard are
+    # installed) once their body reaches COMPRESSION_MINIMUM_SIZE bytes; streams always are.
+    compression_enabled: bool = Field(default=True, alias="COMPRESSION_ENABLED")
+    compression_minimum_size: int = Field(default=1024, ge=0, alias="COMPRESSION_MINIMUM_SIZE")
+    compression_types: str = Field(
+        default="application/json,application/x-ndjson,text/csv,text/plain,text/html", alias="COMPRESSION_TYPES"
+    )
+    compression_gzip_level: int = Field(default=5, ge=1, le=9, alias="COMPRESSION_GZIP_LEVEL")
+    compression_brotli_level: int = Field(default=4, ge=0, le=11, alias="COMPRESSION_BROTLI_LEVEL")
+    compression_zstd_level: int = Field(default=3, ge=1, le=22, alias="COMPRESSION_ZSTD_LEVEL")
+    # DELETE /users/{id}?mode=background deletes items in batches of this size, pausing in between.
+    user_purge_batch_size: int = Field(default=5_000, ge=1, alias="USER_PURGE_BATCH_SIZE")
+    user_purge_pause_ms: float = Field(default=100.0, ge=0, alias="USER_PURGE_PAUSE_MS")
+    # Adaptive concurrency limits per request class; excess requests queue, then get 503.
+    admission_control: bool = Field(default=True, alias="ADMISSION_CONTROL")
+    admission_limit_login: int = Field(default=8, ge=1, alias="ADMISSION_LIMIT_LOGIN")
+    admission_limit_write: int = Field(default=32, ge=1, alias="ADMISSION_LIMIT_WRITE")
+    admission_limit_read: int = Field(default=64, ge=1, alias="ADMISSION_LIMIT_READ")
+    admission_queue_size: int = Field(default=64, ge=0, alias="ADMISSION_QUEUE_SIZE")
+    admission_queue_timeout_ms: float = Field(default=1000.0, gt=0, alias="ADMISSION_QUEUE_TIMEOUT_MS")
+    # Limits shrink while short-term latency exceeds this multiple of the long-term baseline.
+    admission_latency_tolerance: float = Field(default=2.0, ge=1, alias="ADMISSION_LATENCY_TOLERANCE")
 
     model_config = {
         "env_file": (".env", "backend/.env"),
@@ -20,11 +92,54 @@ class Settings(BaseSettings):
         "case_sensitive": False,
     }
 
+    @model_validator(mode="after")
+    def _check_pool_fit(self) -> "Settings":
+        problems: list[str] = []
+        capacity = self.db_pool_size + self.db_max_overflow
+        if not self.db_async and self.db_pool_mode == "queue" and capacity < self.threadpool_size:
+            # In sync mode every worker thread may hold a connection; the rest would queue on checkout.
+            problems.append(
+                f"DB_POOL_SIZE + DB_MAX_OVERFLOW ({capacity}) must be at least THREADPOOL_SIZE "
+                f"({self.threadpool_size}) when DB_ASYNC=false"
+            )
+        if self.db_pool_mode == "pgbouncer" and self.principal_cache_notify:
+            problems.append(
+                "PRINCIPAL_CACHE_NOTIFY needs a session-level connection; LISTEN does not work through "
+                "DB_POOL_MODE=pgbouncer"
+            )
+        if problems:
+            raise ValueError("; ".join(problems))
+        return self
+
+    @property
+    def replica_urls(self) -> List[str]:
+        return [replica.strip() for replica in self.database_replica_urls.split(",") if replica.strip()]
+
+    @property
+    def jwt_previous_secret_list(self) -> List[str]:
+        return [secret.strip() for secret in self.jwt_previous_secrets.split(",") if secret.strip()]
+
+    @property
+    def compression_content_types(self) -> List[str]:
+        return [content_type.strip() for content_type in self.compression_types.split(",") if content_type.strip()]
+
     @property
     def cors_origins(self) -> List[str]:
         return [origin.strip() for origin in self.allowed_origins.split(",") if origin.strip()]
 
 
-@lru_cache(maxsize=1)
+_settings: Optional[Settings] = None
+
+
 def get_settings() -> Settings:
-    return Settings()
+    """The process settings: whatever ``use_settings`` installed, else read from the environment once."""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
+
+
+def use_settings(settings: Settings) -> None:
+    """Install ``settings`` for the process. Call before building the app or touching the database."""
+    global _settings
+    _settings = settings
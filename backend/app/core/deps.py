@@ -1,44 +1,83 @@
+import math
 import uuid
-from typing import Generator
+from dataclasses import replace
+from typing import AsyncGenerator
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import decode_access_token
-from app.db.session import get_db
-from app.models import User
+from app.core.config import get_settings
+from app.core.principal_cache import Principal
+from app.core.revocation import token_revocations
+from app.core.security import AccessClaims, decode_access_token
+from app.db.health import database_health
+from app.db.replicas import replica_router
+from app.db.session import session_scope
+from app.services.principals import load_principal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
-def get_db_session() -> Generator[Session, None, None]:
-    yield from get_db()
+async def get_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for the request: a healthy replica for GET/HEAD when configured, else the primary."""
+    replica = replica_router.for_request(request)
+    if replica is None and database_health.circuit_open:
+        # Known outage: answer now rather than queue on the pool until the checkout timeout.
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database unavailable",
+            headers={"Retry-After": str(math.ceil(database_health.interval_seconds))},
+        )
+    async with session_scope(replica) as session:
+        yield session
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db_session)) -> User:
-    user_id = decode_access_token(token)
-    if not user_id:
+async def get_current_claims(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db_session)
+) -> AccessClaims:
+    """Verified token claims, with the role and ``token_version`` confirmed against the user row.
+
+    The row comes from the principal cache, so a demotion, password change or deletion made by
+    any worker is enforced everywhere within ``PRINCIPAL_CACHE_TTL_SECONDS`` (at once in strict mode).
+    """
+    claims = decode_access_token(token)
+    if not claims:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
+    if token_revocations.is_revoked(claims.id, claims.token_version):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+
+    strict = get_settings().auth_strict_token_check
+    principal = await load_principal(db, claims.id, fresh=strict)
+    if principal and principal.token_version < claims.token_version:
+        # Another worker bumped the version after this entry was cached.
+        principal = await load_principal(db, claims.id, fresh=True)
+    if not principal:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    if principal.token_version != claims.token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+    return replace(claims, role=principal.role)
 
-    try:
-        user_uuid = uuid.UUID(user_id)
-    except ValueError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
 
-    user = db.get(User, user_uuid)
-    if not user:
+async def get_current_user(
+    claims: AccessClaims = Depends(get_current_claims), db: AsyncSession = Depends(get_db_session)
+) -> Principal:
+    # get_current_claims has just loaded (and cached) this principal.
+    principal = await load_principal(db, claims.id)
+    if not principal:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+    if principal.token_version != claims.token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+    return principal
 
 
-def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_admin(current_user: AccessClaims = Depends(get_current_claims)) -> AccessClaims:
     if current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Administrator privileges required")
     return current_user
 
 
-def ensure_self_or_admin(user_id: uuid.UUID, current_user: User = Depends(get_current_user)) -> User:
+async def ensure_self_or_admin(user_id: uuid.UUID, current_user: AccessClaims = Depends(get_current_claims)) -> AccessClaims:
     if current_user.role == "admin" or current_user.id == user_id:
         return current_user
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
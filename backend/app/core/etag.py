@@ -0,0 +1,69 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from fastapi import Response, status
+
+# Clients may store conditional responses but must revalidate them on every use.
+CACHE_CONTROL = "private, no-cache"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _utc(moment: datetime) -> datetime:
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)
+
+
+def row_etag(updated_at: datetime) -> str:
+    """Strong ETag of one row: its ``updated_at`` in hex epoch microseconds.
+
+    The tag is reversible so ``If-Match`` can become a ``WHERE updated_at IN (...)`` clause on
+    the write itself instead of a separate read.
+    """
+    return f'"{(_utc(updated_at) - _EPOCH) // _MICROSECOND:x}"'
+
+
+def row_versions(if_match: Optional[str]) -> Optional[list[datetime]]:
+    """``updated_at`` values named by an ``If-Match`` header; ``None`` when any version is acceptable."""
+    if if_match is None:
+        return None
+    versions: list[datetime] = []
+    for tag in (part.strip() for part in if_match.split(",")):
+        if tag == "*":
+            return None
+        # Weak tags never satisfy If-Match, which uses strong comparison.
+        if len(tag) > 2 and tag[0] == tag[-1] == '"':
+            try:
+                versions.append(_EPOCH + int(tag[1:-1], 16) * _MICROSECOND)
+            except (ValueError, OverflowError):
+                continue
+    return versions
+
+
+def if_match_satisfied(if_match: Optional[str], etag: str) -> bool:
+    if if_match is None:
+        return True
+    return any(tag.strip() in ("*", etag) for tag in if_match.split(","))
+
+
+def collection_etag(*parts: Any) -> str:
+    """Strong ETag of a listing, from its version (a counter, or count and newest ``updated_at``)
+    and the request scope."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12)
+    return f'"{digest.hexdigest()}"'
+
+
+def none_match(if_none_match: Optional[str], etag: str) -> bool:
+    """``If-None-Match`` check (weak comparison): ``False`` means the client copy is current."""
+    if if_none_match is None:
+        return True
+    return not any(tag.strip() in ("*", etag, f"W/{etag}") for tag in if_none_match.split(","))
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
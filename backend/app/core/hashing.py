@@ -0,0 +1,93 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class HashingQueueFull(Exception):
+    """Raised when the password hashing pool already has ``workers + queue_size`` jobs in flight."""
+
+
+class PasswordHashPool:
+    """Bounded process pool for bcrypt work.
+
+    Hashing runs in separate processes so a login burst cannot starve unrelated requests of the
+    GIL. Jobs beyond ``workers + queue_size`` are rejected immediately instead of piling up.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: tuple[Any, ...] = (),
+    ) -> None:
+        self.in_flight = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.configure(workers, queue_size, initializer, initargs)
+
+    def configure(
+        self,
+        workers: int,
+        queue_size: int,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: tuple[Any, ...] = (),
+    ) -> None:
+        """Resize the pool; ``initializer(*initargs)`` runs once in each worker process it starts.
+
+        Workers are spawned, not forked, so anything they need from this process's settings
+        has to travel through ``initargs``. Running workers finish their jobs and are replaced.
+        """
+        with self._lock:
+            self.workers = workers
+            self.capacity = workers + queue_size
+            self.initializer = initializer
+            self.initargs = initargs
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self.initializer,
+                    initargs=self.initargs,
+                )
+            return self._executor
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise HashingQueueFull()
+            self.in_flight += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        self._acquire()
+        try:
+            return await asyncio.wrap_future(self._get_executor().submit(fn, *args))
+        except BrokenProcessPool:
+            # A crashed worker poisons the executor; drop it so the next call starts a fresh pool.
+            self.shutdown(wait=False)
+            raise
+        finally:
+            self._release()
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
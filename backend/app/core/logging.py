@@ -1,22 +1,186 @@
+"""Structured JSON logging that never blocks the request path.
+
+Records are put on a bounded in-memory queue; a background listener thread formats them and
+writes to stderr. When the drain falls behind and the queue is full, records are dropped and
+counted (``log_records_dropped_total``) rather than stalling requests.
+
+Access logging is done by :class:`AccessLogMiddleware` instead of ``uvicorn.access``: it keeps
+every error and slow response and a configurable sample of the rest.
+"""
+
+import atexit
+import copy
 import logging
+import os
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Optional
+
 from pythonjsonlogger import jsonlogger
 
-from .config import get_settings
+from .config import Settings
+
+access_logger = logging.getLogger("app.access")
+
+
+class DroppingQueueHandler(QueueHandler):
+    """``QueueHandler`` over a bounded queue that drops, and counts, records it cannot enqueue."""
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__(queue.Queue(maxsize))
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now (they may change after the call returns) but leave JSON
+        # formatting, including tracebacks, to the listener thread. A message without arguments
+        # is kept as it is, so dict messages still reach the formatter as fields.
+        record = copy.copy(record)
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def reset_queue(self) -> None:
+        self.queue = queue.Queue(self.maxsize)
+
+
+class LogPipeline:
+    """The root logger's queue handler and the listener thread draining it."""
+
+    def __init__(self, level: int, queue_size: int) -> None:
+        output = logging.StreamHandler()
+        output.setFormatter(jsonlogger.JsonFormatter("%(levelname)s %(name)s %(message)s %(asctime)s"))
+        self.output = output
+        self.handler = DroppingQueueHandler(queue_size)
+        self.handler.setLevel(level)
+        self.listener: Optional[QueueListener] = None
+
+    def start(self) -> None:
+        self.listener = QueueListener(self.handler.queue, self.output)
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Flush what is queued and stop the listener thread."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def restart_after_fork(self) -> None:
+        # The listener thread does not survive fork() and the queue's lock may have been held
+        # mid-put: a preloaded worker starts over with a fresh queue and thread.
+        self.listener = None
+        self.handler.reset_queue()
+        self.start()
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped
+
+    @property
+    def queued(self) -> int:
+        return self.handler.queue.qsize()
 
 
-def configure_logging() -> None:
-    settings = get_settings()
+_pipeline: Optional[LogPipeline] = None
+
+
+def _restart_in_child() -> None:
+    if _pipeline is not None:
+        _pipeline.restart_after_fork()
+
+
+def _flush_at_exit() -> None:
+    if _pipeline is not None:
+        _pipeline.stop()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_in_child)
+atexit.register(_flush_at_exit)
+
+
+def log_pipeline() -> Optional[LogPipeline]:
+    return _pipeline
+
+
+def configure_logging(settings: Settings) -> None:
+    global _pipeline
     log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
 
+    if _pipeline is not None:
+        _pipeline.stop()
+    _pipeline = LogPipeline(log_level, settings.log_queue_size)
+    _pipeline.start()
+
     logger = logging.getLogger()
-    logger.handlers = []
+    logger.handlers = [_pipeline.handler]
     logger.setLevel(log_level)
 
-    handler = logging.StreamHandler()
-    formatter = jsonlogger.JsonFormatter('%(levelname)s %(name)s %(message)s %(asctime)s')
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    # Replaced by the sampled AccessLogMiddleware.
+    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+    access_logger.setLevel(logging.INFO)
+    if settings.env.lower() == "production":
+        logging.getLogger("uvicorn.error").setLevel(logging.INFO)
+
+
+class AccessLogMiddleware:
+    """Pure ASGI middleware logging one ``app.access`` line per sampled request.
+
+    Responses with status >= 500 and requests slower than ``slow_seconds`` are always logged;
+    the rest with probability ``sample_rate``.
+    """
+
+    def __init__(
+        self, app: Any, sample_rate: float, slow_seconds: float, rng: Callable[[], float] = random.random
+    ) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self._rng = rng
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
-    if settings.env.lower() == 'production':
-        logging.getLogger('uvicorn.error').setLevel(logging.INFO)
-        logging.getLogger('uvicorn.access').setLevel(logging.INFO)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            if status_code >= 500 or elapsed >= self.slow_seconds or self._rng() < self.sample_rate:
+                client = scope.get("client")
+                access_logger.info(
+                    "%s %s %d",
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status_code,
+                        "duration_ms": round(elapsed * 1000, 3),
+                        "client": client[0] if client else None,
+                        "sampled": status_code < 500 and elapsed < self.slow_seconds,
+                    },
+                )
@@ -0,0 +1,268 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Instruments are plain counters and fixed-bucket histograms guarded by a lock each, cheap enough
+to leave on in production. Values that already live elsewhere (pool state, cache stats) are read
+by callbacks at scrape time instead of being mirrored on every change.
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+Samples = Iterable[tuple[Sequence[str], float]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+    def render(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> Iterator[str]:
+        yield from self.header()
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (last slot is +Inf) and the running sum.
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> Iterator[str]:
+        yield from self.header()
+        with self._lock:
+            snapshot = [(labels, list(counts), total[0]) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}"
+
+
+class CallbackMetric(_Metric):
+    """Gauge or counter whose samples are read from ``collect`` at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Samples],
+        kind: str = "gauge",
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self._collect = collect
+
+    def render(self) -> Iterator[str]:
+        yield from self.header()
+        for labels, value in self._collect():
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> Any:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.register(
+    Counter(
+        "http_requests_total", "HTTP responses by method, route template and status.", ("method", "route", "status")
+    )
+)
+http_request_duration = registry.register(
+    Histogram("http_request_duration_seconds", "Time to fully send an HTTP response.", ("method", "route"))
+)
+request_db_queries = registry.register(
+    Histogram(
+        "http_request_db_queries", "SQL statements executed per request.", ("route",), buckets=QUERY_COUNT_BUCKETS
+    )
+)
+request_db_duration = registry.register(
+    Histogram("http_request_db_duration_seconds", "Time spent in SQL statements per request.", ("route",))
+)
+db_query_duration = registry.register(
+    Histogram("db_query_duration_seconds", "Execution time of individual SQL statements.", ("engine",))
+)
+pool_checkout_wait = registry.register(
+    Histogram("db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.", ("engine",))
+)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+# Set per request by the middleware. The accumulator is mutable so statements run inside
+# SQLAlchemy's greenlets or AnyIO worker threads (which see a copy of the context) still count.
+_request_queries: ContextVar[Optional[QueryStats]] = ContextVar("request_queries", default=None)
+
+_engines: list[tuple[str, Engine]] = []
+
+
+def instrument_engine(engine: Engine, label: str) -> None:
+    """Time every cursor execution on ``engine`` and expose its pool state."""
+    _engines.append((label, engine))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        db_query_duration.observe(elapsed, label)
+        stats = _request_queries.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _failed(context: Any) -> None:
+        # after_cursor_execute never fires for a failed statement; keep the stack balanced.
+        if context.connection is not None and context.connection.info.get("query_started"):
+            context.connection.info["query_started"].pop()
+
+
+def forget_engine(engine: Engine) -> None:
+    """Stop reporting ``engine``'s pool, once the engine has been replaced."""
+    _engines[:] = [(label, known) for label, known in _engines if known is not engine]
+
+
+def _pool_samples(read: Callable[[QueuePool], int]) -> Callable[[], Samples]:
+    def collect() -> Samples:
+        return [((label,), read(engine.pool)) for label, engine in _engines if isinstance(engine.pool, QueuePool)]
+
+    return collect
+
+
+for _name, _doc, _read in (
+    ("db_pool_size", "Configured pool size.", QueuePool.size),
+    ("db_pool_checked_out", "Connections currently checked out.", QueuePool.checkedout),
+    ("db_pool_checked_in", "Idle connections held by the pool.", QueuePool.checkedin),
+    ("db_pool_overflow", "Connections opened beyond the pool size (negative while below it).", QueuePool.overflow),
+):
+    registry.register(CallbackMetric(_name, _doc, ("engine",), _pool_samples(_read)))
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, status and per-request DB usage by route template."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        stats = QueryStats()
+        token = _request_queries.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_status(message: dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_queries.reset(token)
+            # The router stores the matched route on the shared scope; templates keep label
+            # cardinality bounded, unlike raw paths.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            http_requests.inc(method, route, str(status_code))
+            http_request_duration.observe(elapsed, method, route)
+            request_db_queries.observe(stats.count, route)
+            request_db_duration.observe(stats.seconds, route)
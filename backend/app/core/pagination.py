@@ -0,0 +1,44 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any
+
+
+def _pack(*values: Any) -> str:
+    raw = json.dumps(list(values), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _unpack(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+
+def encode_cursor(created_at: datetime, item_id: uuid.UUID) -> str:
+    return _pack(created_at.isoformat(), str(item_id))
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Reverse :func:`encode_cursor`, raising ``ValueError`` for anything malformed."""
+    try:
+        created_at, item_id = _unpack(cursor)
+        return datetime.fromisoformat(created_at), uuid.UUID(item_id)
+    except (TypeError, ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def encode_rank_cursor(rank: float, item_id: uuid.UUID) -> str:
+    # JSON floats round-trip exactly, so the next page resumes strictly after this row.
+    return _pack(rank, str(item_id))
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, uuid.UUID]:
+    """Reverse :func:`encode_rank_cursor`, raising ``ValueError`` for anything malformed."""
+    try:
+        rank, item_id = _unpack(cursor)
+        if isinstance(rank, bool) or not isinstance(rank, (int, float)):
+            raise ValueError("rank must be a number")
+        return float(rank), uuid.UUID(item_id)
+    except (TypeError, ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
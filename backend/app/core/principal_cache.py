@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+import psycopg
+
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "principal_invalidate"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated caller, detached from any session."""
+
+    id: uuid.UUID
+    email: str
+    role: str
+    created_at: datetime
+    token_version: int = 0
+
+
+class PrincipalCache:
+    """Thread-safe TTL + LRU map of user id to :class:`Principal`."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[uuid.UUID, tuple[float, Principal]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: uuid.UUID) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, principal: Principal) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def configure(self, max_entries: int, ttl_seconds: float) -> None:
+        with self._lock:
+            self.max_entries = max_entries
+            self.ttl_seconds = ttl_seconds
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# Disabled until build_app sizes it from the settings.
+principal_cache = PrincipalCache(max_entries=0, ttl_seconds=0.0)
+
+
+async def listen_for_principal_changes(
+    dsn: str,
+    on_change: Callable[[str], None],
+    on_connect: Callable[[], None],
+    retry_seconds: float = 5.0,
+) -> None:
+    """Feed payloads from the Postgres ``principal_invalidate`` channel to ``on_change`` until cancelled.
+
+    Notifications sent while disconnected are lost, so ``on_connect`` runs after every (re)connect
+    to let the caller drop whatever it can no longer trust.
+    """
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(dsn, autocommit=True) as conn:
+                await conn.execute(f"LISTEN {INVALIDATION_CHANNEL}")
+                on_connect()
+                async for notify in conn.notifies():
+                    try:
+                        on_change(notify.payload)
+                    except ValueError:
+                        logger.warning("Ignoring malformed principal change %r", notify.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Principal change listener disconnected; retrying")
+            await asyncio.sleep(retry_seconds)
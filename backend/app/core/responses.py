@@ -0,0 +1,14 @@
+from typing import Optional
+
+from fastapi import Response, status
+
+
+def json_bytes_response(
+    body: bytes, status_code: int = status.HTTP_200_OK, headers: Optional[dict[str, str]] = None
+) -> Response:
+    """Send already-serialized JSON as is.
+
+    Returning a ``Response`` skips FastAPI's ``response_model`` pass, which would otherwise
+    re-validate and re-encode every row a list endpoint has just serialized.
+    """
+    return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
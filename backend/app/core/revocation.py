@@ -0,0 +1,48 @@
+import threading
+import time
+import uuid
+
+
+# Floor recorded for deleted users: no token version can reach it.
+REVOKE_ALL = 2**63 - 1
+
+
+class TokenRevocations:
+    """Per-user floor on accepted ``token_version`` values.
+
+    Only users whose tokens were revoked recently have an entry, and an entry is dropped once
+    every token it could reject has expired, so the map stays small.
+    """
+
+    def __init__(self, retention_seconds: float) -> None:
+        self.retention_seconds = retention_seconds
+        self._floors: dict[uuid.UUID, tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, retention_seconds: float) -> None:
+        self.retention_seconds = retention_seconds
+
+    def revoke_below(self, user_id: uuid.UUID, token_version: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            current = self._floors.get(user_id)
+            if current is None or current[0] < token_version:
+                self._floors[user_id] = (token_version, now)
+            self._prune(now)
+
+    def is_revoked(self, user_id: uuid.UUID, token_version: int) -> bool:
+        entry = self._floors.get(user_id)
+        return entry is not None and token_version < entry[0]
+
+    def __len__(self) -> int:
+        return len(self._floors)
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.retention_seconds
+        expired = [user_id for user_id, (_, recorded) in self._floors.items() if recorded < cutoff]
+        for user_id in expired:
+            del self._floors[user_id]
+
+
+# build_app sets the retention to the access-token lifetime.
+token_revocations = TokenRevocations(retention_seconds=0.0)
@@ -1,33 +1,187 @@
+import hashlib
+import uuid
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
-from .config import get_settings
+from .config import Settings, get_settings
+from .hashing import PasswordHashPool
+from .token_cache import token_digest, verified_tokens
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def build_password_context(settings: Settings) -> CryptContext:
+    """Hashes with the configured scheme and cost; anything else verifies but reports ``needs_update``."""
+    if settings.password_hash_scheme == "argon2":
+        rounds = settings.password_argon2_time_cost
+        options: dict[str, Any] = {
+            "argon2__memory_cost": settings.password_argon2_memory_kib,
+            "argon2__parallelism": settings.password_argon2_parallelism,
+        }
+    else:
+        rounds = settings.password_bcrypt_rounds
+        options = {}
+    scheme = settings.password_hash_scheme
+    # Pinning min and max to the configured cost flags hashes made at a higher or lower cost alike.
+    options.update({f"{scheme}__rounds": rounds, f"{scheme}__min_rounds": rounds, f"{scheme}__max_rounds": rounds})
+    return CryptContext(schemes=["argon2", "bcrypt"], default=scheme, deprecated="auto", **options)
+
+
+# Built from the settings by build_app (or from get_settings() on first use, e.g. in scripts);
+# hash workers receive the same configuration through the pool's initializer.
+_pwd_context: Optional[CryptContext] = None
+
+# Sized by build_app through configure_password_hashing.
+password_hash_pool = PasswordHashPool(workers=1, queue_size=0)
+
+
+def password_context() -> CryptContext:
+    global _pwd_context
+    if _pwd_context is None:
+        _pwd_context = build_password_context(get_settings())
+    return _pwd_context
+
+
+def use_password_context(config: dict[str, Any]) -> None:
+    """Hash and verify with the ``CryptContext`` described by ``config`` (``CryptContext.to_dict()``)."""
+    global _pwd_context
+    _pwd_context = CryptContext(**config)
+
+
+def configure_password_hashing(settings: Settings) -> None:
+    """Apply the hashing settings here and, on their next start, in every hash worker process."""
+    config = build_password_context(settings).to_dict()
+    use_password_context(config)
+    password_hash_pool.configure(
+        workers=settings.password_hash_workers,
+        queue_size=settings.password_hash_queue_size,
+        initializer=use_password_context,
+        initargs=(config,),
+    )
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_context().hash(password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """``(verified, new_hash)``; ``new_hash`` is set when the stored hash predates the current cost."""
+    return password_context().verify_and_update(plain_password, hashed_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    return await password_hash_pool.run(verify_and_update_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hash_pool.run(get_password_hash, password)
+
 
+@dataclass(frozen=True)
+class AccessClaims:
+    """Verified access-token claims; ``role`` is ``None`` for tokens issued before it was embedded."""
 
-def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
+    id: uuid.UUID
+    role: Optional[str]
+    token_version: int
+
+
+def key_id(secret: str) -> str:
+    return hashlib.sha256(secret.encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class KeyRing:
+    """HS256 secrets by ``kid``: the signing secret plus any that still verify during a rotation."""
+
+    signing_kid: str
+    secrets: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "KeyRing":
+        secrets = {key_id(secret): secret for secret in settings.jwt_previous_secret_list}
+        signing_kid = key_id(settings.jwt_secret)
+        secrets[signing_kid] = settings.jwt_secret
+        return cls(signing_kid=signing_kid, secrets=secrets)
+
+    @property
+    def signing_secret(self) -> str:
+        return self.secrets[self.signing_kid]
+
+    def candidates(self, kid: Optional[str]) -> list[str]:
+        if kid is None:
+            # Issued before tokens carried a kid.
+            return list(self.secrets.values())
+        secret = self.secrets.get(kid)
+        return [secret] if secret is not None else []
+
+
+# Installed by build_app; scripts that only sign or verify fall back to get_settings().
+_key_ring: Optional[KeyRing] = None
+
+
+def current_key_ring() -> KeyRing:
+    global _key_ring
+    if _key_ring is None:
+        _key_ring = KeyRing.from_settings(get_settings())
+    return _key_ring
+
+
+def use_key_ring(key_ring: KeyRing) -> None:
+    """Sign and verify with ``key_ring`` from now on; cached verifications are dropped if it changed."""
+    global _key_ring
+    if key_ring != _key_ring:
+        _key_ring = key_ring
+        verified_tokens.clear()
+
+
+def create_access_token(
+    subject: str,
+    expires_delta: Optional[timedelta] = None,
+    *,
+    role: str = "user",
+    token_version: int = 0,
+) -> str:
     settings = get_settings()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.access_token_expire_minutes))
-    to_encode: dict[str, Any] = {"sub": subject, "exp": expire}
-    return jwt.encode(to_encode, settings.jwt_secret, algorithm="HS256")
+    to_encode: dict[str, Any] = {"sub": subject, "role": role, "ver": token_version, "exp": expire}
+    key_ring = current_key_ring()
+    return jwt.encode(to_encode, key_ring.signing_secret, algorithm="HS256", headers={"kid": key_ring.signing_kid})
 
 
-def decode_access_token(token: str) -> Optional[str]:
-    settings = get_settings()
+def decode_access_token(token: str) -> Optional[AccessClaims]:
+    """Claims of a valid, unexpired token; repeat presentations are answered from ``verified_tokens``."""
+    digest = token_digest(token)
+    claims = verified_tokens.get(digest)
+    if claims is not None:
+        return claims
+
+    key_ring = current_key_ring()
     try:
-        payload = jwt.decode(token, settings.jwt_secret, algorithms=["HS256"])
-        return str(payload.get("sub"))
+        kid = jwt.get_unverified_header(token).get("kid")
     except JWTError:
         return None
+    for secret in key_ring.candidates(kid):
+        try:
+            payload = jwt.decode(token, secret, algorithms=["HS256"])
+            claims = AccessClaims(
+                id=uuid.UUID(str(payload.get("sub"))),
+                role=payload.get("role"),
+                token_version=int(payload.get("ver", 0)),
+            )
+        except (JWTError, TypeError, ValueError):
+            continue
+        if "exp" in payload and key_ring is _key_ring:
+            verified_tokens.put(digest, float(payload["exp"]), claims)
+        return claims
+    return None
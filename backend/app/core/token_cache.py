@@ -0,0 +1,75 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from .config import get_settings
+
+
+def token_digest(token: str) -> bytes:
+    """Cache key for a bearer token, so the cache never holds usable credentials."""
+    return hashlib.sha256(token.encode()).digest()
+
+
+class VerifiedTokenCache:
+    """Thread-safe LRU map of token digest to the claims its signature check produced.
+
+    Entries live until the token's own ``exp``; only tokens that verified are stored. Revocation
+    is checked by the caller on every request, so a cached token can still be turned away.
+    Without ``max_entries`` the size is read from ``TOKEN_CACHE_MAX_ENTRIES`` on first use.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[bytes, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: bytes) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, digest: bytes, expires_at: float, claims: Any) -> None:
+        if self.max_entries is None:
+            self.max_entries = get_settings().token_cache_max_entries
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[digest] = (expires_at, claims)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def configure(self, max_entries: int) -> None:
+        with self._lock:
+            self.max_entries = max_entries
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Sized by build_app; importing this module (and app.core.security) reads no settings.
+verified_tokens = VerifiedTokenCache()
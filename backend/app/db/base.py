@@ -1,10 +1,10 @@
 from sqlalchemy import MetaData
 from sqlalchemy.orm import DeclarativeBase
 
-from app.core.config import get_settings
 
-
-metadata_obj = MetaData(schema=get_settings().db_schema)
+# No schema here: engines map the default schema to DB_SCHEMA (schema_translate_map), so the
+# models can be imported before settings exist.
+metadata_obj = MetaData()
 
 
 class Base(DeclarativeBase):
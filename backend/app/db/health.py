@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+from typing import Any, Optional
+
+from sqlalchemy import text
+
+from app.db.session import pool_status, session_scope
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseHealth:
+    """Latest result of a background ``SELECT 1`` probe, shared by ``/readyz`` and request handling.
+
+    Probes run on one task at a fixed interval, so orchestrator probes never touch the pool. After
+    ``failure_threshold`` consecutive failures the circuit opens and database-backed requests fail
+    fast until a probe succeeds again.
+    """
+
+    def __init__(self, interval_seconds: float, timeout_seconds: float, failure_threshold: int) -> None:
+        self.configure(interval_seconds, timeout_seconds, failure_threshold)
+        self.last_success: Optional[float] = None
+        self.last_probe: Optional[float] = None
+        self.last_latency: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.consecutive_failures = 0
+
+    def configure(self, interval_seconds: float, timeout_seconds: float, failure_threshold: int) -> None:
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.failure_threshold = failure_threshold
+
+    @property
+    def circuit_open(self) -> bool:
+        return 0 < self.failure_threshold <= self.consecutive_failures
+
+    @property
+    def ready(self) -> bool:
+        # A result older than a few intervals means the prober itself stopped; don't vouch for it.
+        if self.last_success is None or self.consecutive_failures:
+            return False
+        return time.monotonic() - self.last_success < max(3 * self.interval_seconds, self.timeout_seconds)
+
+    async def probe(self) -> bool:
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._select_one(), self.timeout_seconds)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self.last_probe = time.monotonic()
+            self.consecutive_failures += 1
+            self.last_error = f"{type(exc).__name__}: {exc}"[:200] if str(exc) else type(exc).__name__
+            if self.consecutive_failures == self.failure_threshold:
+                logger.warning("Database unreachable; failing database requests fast (%s)", self.last_error)
+            return False
+
+        self.last_probe = self.last_success = time.monotonic()
+        self.last_latency = self.last_success - started
+        if self.circuit_open:
+            logger.info("Database reachable again")
+        self.consecutive_failures = 0
+        self.last_error = None
+        return True
+
+    async def run(self) -> None:
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.interval_seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "ready": self.ready,
+            "circuit_open": self.circuit_open,
+            "last_success_age_seconds": round(now - self.last_success, 3) if self.last_success is not None else None,
+            "last_probe_age_seconds": round(now - self.last_probe, 3) if self.last_probe is not None else None,
+            "latency_ms": round(self.last_latency * 1000, 2) if self.last_latency is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "pool": pool_status(),
+        }
+
+    @staticmethod
+    async def _select_one() -> None:
+        async with session_scope() as db:
+            await db.execute(text("SELECT 1"))
+
+
+# The circuit stays closed until build_app applies the HEALTH_* settings.
+database_health = DatabaseHealth(interval_seconds=5.0, timeout_seconds=2.0, failure_threshold=0)
@@ -0,0 +1,35 @@
+import time
+from typing import Any
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.metrics import pool_checkout_wait
+
+
+class TimedCheckout:
+    """Records how long each checkout waited for a connection (including opening a new one).
+
+    ``metrics_label`` names the engine (``sync``, ``replica1-async``, ...) and survives ``dispose()``.
+    """
+
+    metrics_label = ""
+
+    def recreate(self) -> Any:
+        pool = super().recreate()  # type: ignore[misc]
+        pool.metrics_label = self.metrics_label
+        return pool
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        finally:
+            pool_checkout_wait.observe(time.perf_counter() - started, self.metrics_label)
+
+
+class TimedQueuePool(TimedCheckout, QueuePool):
+    metrics_label = "sync"
+
+
+class TimedAsyncAdaptedQueuePool(TimedCheckout, AsyncAdaptedQueuePool):
+    metrics_label = "async"
@@ -0,0 +1,196 @@
+"""Read-replica routing for safe requests.
+
+GET and HEAD requests are spread round-robin over the replicas that passed their latest
+background probe: reachable, and replaying WAL no more than ``DB_REPLICA_MAX_LAG_SECONDS``
+behind the primary. Everything else, and every request when no replica qualifies, uses the
+primary.
+
+After a successful write the response pins the client to the primary for ``sticky_seconds``
+via a cookie, echoed in a header for non-browser clients to send back, so the client reads its
+own writes even from a lagging replica.
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Sequence
+
+from sqlalchemy import text
+from starlette.requests import HTTPConnection
+
+from app.db.session import Replica, databases, session_scope
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+PRIMARY_UNTIL_COOKIE = "db_primary_until"
+PRIMARY_UNTIL_HEADER = "X-DB-Primary-Until"
+
+# Seconds of replay lag. A replica that has replayed everything it received from a live stream
+# is current, even when the primary is idle and the last replayed commit is old. NULL (no replay
+# yet) counts as unknown and ejects the replica. A server that is not in recovery reports 0.
+LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+             AND EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+
+@dataclass
+class ReplicaState:
+    healthy: bool = False
+    lag_seconds: Optional[float] = None
+    last_probe: Optional[float] = None
+    last_error: Optional[str] = None
+
+
+class ReplicaRouter:
+    """Chooses a replica per request and keeps each replica's health current from one background task.
+
+    Replicas start ejected and join after their first successful probe. The router knows them by
+    name; their engines are only built when the databases are initialised.
+    """
+
+    def __init__(
+        self, names: Sequence[str], interval_seconds: float, timeout_seconds: float, max_lag_seconds: float
+    ) -> None:
+        self.configure(names, interval_seconds, timeout_seconds, max_lag_seconds)
+        self._turn = itertools.count()
+
+    def configure(
+        self, names: Sequence[str], interval_seconds: float, timeout_seconds: float, max_lag_seconds: float
+    ) -> None:
+        """Route to the replicas called ``names``; each starts ejected until its first probe passes."""
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self.states = {name: ReplicaState() for name in names}
+
+    @property
+    def replicas(self) -> list[Replica]:
+        return databases().replicas if self.states else []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.states)
+
+    @property
+    def sticky_seconds(self) -> float:
+        # A replica may fall behind right after passing a probe; cover one probe interval beyond the lag bound.
+        return self.max_lag_seconds + self.interval_seconds
+
+    def choose(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if self.states[replica.name].healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+    def for_request(self, connection: HTTPConnection) -> Optional[Replica]:
+        """The replica to serve this request, or ``None`` for the primary."""
+        if not self.states or connection.scope.get("method") not in SAFE_METHODS:
+            return None
+        if pinned_to_primary(connection):
+            return None
+        return self.choose()
+
+    async def probe(self, replica: Replica) -> None:
+        state = self.states[replica.name]
+        try:
+            lag = await asyncio.wait_for(self._lag(replica), self.timeout_seconds)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            lag = None
+            state.last_error = f"{type(exc).__name__}: {exc}"[:200] if str(exc) else type(exc).__name__
+        else:
+            state.last_error = None if lag is not None else "replay position unknown"
+
+        state.last_probe = time.monotonic()
+        state.lag_seconds = lag
+        healthy = lag is not None and lag <= self.max_lag_seconds
+        if healthy != state.healthy:
+            if healthy:
+                logger.info("Replica %s admitted (lag %.3fs)", replica.name, lag)
+            else:
+                reason = state.last_error or f"lag {lag:.3f}s"
+                logger.warning("Replica %s ejected (%s)", replica.name, reason)
+        state.healthy = healthy
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.gather(*(self.probe(replica) for replica in self.replicas))
+            await asyncio.sleep(self.interval_seconds)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        now = time.monotonic()
+        snapshots = []
+        for replica in self.replicas:
+            state = self.states[replica.name]
+            snapshots.append(
+                {
+                    "name": replica.name,
+                    "healthy": state.healthy,
+                    "lag_seconds": round(state.lag_seconds, 3) if state.lag_seconds is not None else None,
+                    "last_probe_age_seconds": round(now - state.last_probe, 3) if state.last_probe is not None else None,
+                    "last_error": state.last_error,
+                }
+            )
+        return snapshots
+
+    @staticmethod
+    async def _lag(replica: Replica) -> Optional[float]:
+        async with session_scope(replica) as db:
+            lag = (await db.execute(LAG_QUERY)).scalar()
+            return float(lag) if lag is not None else None
+
+
+def pinned_to_primary(connection: HTTPConnection) -> bool:
+    raw = connection.headers.get(PRIMARY_UNTIL_HEADER) or connection.cookies.get(PRIMARY_UNTIL_COOKIE)
+    if not raw:
+        return False
+    try:
+        return float(raw) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware pinning a client to the primary for a while after each successful write."""
+
+    def __init__(self, app: Any, window_seconds: float) -> None:
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message: dict) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                # Wall-clock epoch: any worker or instance can check it without shared state.
+                until = f"{time.time() + self.window_seconds:.3f}"
+                cookie = (
+                    f"{PRIMARY_UNTIL_COOKIE}={until}; Max-Age={math.ceil(self.window_seconds)}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"set-cookie", cookie.encode("latin-1")),
+                    (PRIMARY_UNTIL_HEADER.lower().encode("latin-1"), until.encode("latin-1")),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
+
+
+# No replicas until build_app applies DATABASE_REPLICA_URLS.
+replica_router = ReplicaRouter((), interval_seconds=5.0, timeout_seconds=2.0, max_lag_seconds=0.0)
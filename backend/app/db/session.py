@@ -1,24 +1,357 @@
-from sqlalchemy import create_engine
-from sqlalchemy.engine import make_url
-from sqlalchemy.orm import sessionmaker
+"""Engines and sessions for the primary database and its read replicas.
 
-from app.core.config import get_settings
+Nothing connects or even builds an engine at import time: :func:`use_databases` runs at
+lifespan start with the app's settings (:func:`init_databases` on first use otherwise), so
+``create_app(settings)`` configures them and forked workers never inherit pooled connections.
+``engine``, ``SessionLocal`` and friends remain importable as lazy module attributes for scripts
+and tests.
+"""
 
-settings = get_settings()
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Iterator, Optional, Sequence, TypeVar
 
-url = make_url(settings.database_url)
+from sqlalchemy import Row, create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
+from starlette.concurrency import run_in_threadpool
 
-connect_args: dict[str, str] = {}
-if url.get_backend_name().startswith("postgresql"):
-    connect_args["options"] = f'-csearch_path="{settings.db_schema}"'
+from app.core.config import Settings, get_settings
+from app.core.metrics import forget_engine, instrument_engine
+from app.db.pool import TimedAsyncAdaptedQueuePool, TimedCheckout, TimedQueuePool
 
-engine = create_engine(settings.database_url, pool_pre_ping=True, future=True, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
+T = TypeVar("T")
+
+
+def ping_idle_connections(engine: Engine, idle_seconds: float) -> None:
+    """Pessimistic disconnect handling for connections that sat unused longer than ``idle_seconds``.
+
+    Busy connections skip the extra round-trip that ``pool_pre_ping`` adds to every checkout; a
+    dead connection raises ``DisconnectionError`` so the pool discards it and retries.
+    """
+    dialect = engine.dialect
+
+    @event.listens_for(engine, "connect")
+    def _fresh(dbapi_connection: Any, record: Any) -> None:
+        record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection: Any, record: Any) -> None:
+        record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection: Any, record: Any, proxy: Any) -> None:
+        if time.monotonic() - record.info.get("checked_in_at", 0.0) < idle_seconds:
+            return
+        try:
+            dialect.do_ping(dbapi_connection)
+        except dialect.loaded_dbapi.Error as exc:
+            if dialect.is_disconnect(exc, dbapi_connection, None):
+                raise DisconnectionError() from exc
+            raise
+
+
+def replica_names(settings: Settings) -> list[str]:
+    return [f"replica{n}" for n in range(1, len(settings.replica_urls) + 1)]
+
+
+@dataclass(frozen=True)
+class Replica:
+    """Engines and session factories for one read replica from ``DATABASE_REPLICA_URLS``."""
+
+    name: str
+    engine: Engine
+    session_factory: sessionmaker
+    async_engine: Optional[AsyncEngine] = None
+    async_session_factory: Optional[async_sessionmaker] = None
+
+
+class Databases:
+    """Every engine and session factory the process uses, built from one :class:`Settings`."""
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self.url = make_url(settings.database_url)
+        self.is_postgres = self.url.get_backend_name() == "postgresql"
+        self.pgbouncer = settings.db_pool_mode == "pgbouncer"
+
+        self.connect_args: dict[str, Any] = {}
+        if self.is_postgres and self.pgbouncer:
+            # Transaction pooling hands each transaction a different server connection: prepared
+            # statements would not exist there and startup options are rejected. Set search_path and
+            # statement_timeout on the database role instead (ALTER ROLE ... SET ...).
+            self.connect_args["prepare_threshold"] = None
+        elif self.is_postgres:
+            options = f'-csearch_path="{settings.db_schema}"'
+            if settings.db_statement_timeout_ms:
+                options += f" -cstatement_timeout={settings.db_statement_timeout_ms}"
+            self.connect_args["options"] = options
+
+        # Plain libpq DSN for code that talks to psycopg directly (e.g. LISTEN/NOTIFY).
+        self.libpq_dsn = self.url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+        self.engine = self._create_engine(self.url, "sync")
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine, future=True)
+        self.async_engine: Optional[AsyncEngine] = None
+        self.AsyncSessionLocal: Optional[async_sessionmaker] = None
+        if settings.db_async:
+            self.async_engine = self._create_async_engine(self.url, "async")
+            # Attributes must stay loaded after commit: an expired attribute would lazy-load outside the greenlet.
+            self.AsyncSessionLocal = async_sessionmaker(self.async_engine, autoflush=False, expire_on_commit=False)
+
+        self.replicas = [
+            self._build_replica(name, make_url(replica_url))
+            for name, replica_url in zip(replica_names(settings), settings.replica_urls)
+        ]
+
+    def engine_options(self, timed_poolclass: type) -> dict[str, Any]:
+        settings = self.settings
+        # Models carry no schema; every statement is compiled against DB_SCHEMA.
+        options: dict[str, Any] = {
+            "connect_args": self.connect_args,
+            "execution_options": {"schema_translate_map": {None: settings.db_schema}},
+        }
+        if not self.is_postgres:
+            return options
+        if self.pgbouncer:
+            return {**options, "poolclass": NullPool}
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping == "always",
+        )
+        if settings.metrics_enabled:
+            # Timed pools feed db_pool_checkout_wait_seconds.
+            options["poolclass"] = timed_poolclass
+        return options
+
+    def _configure_engine(self, target: Engine, label: str) -> None:
+        if self.is_postgres and not self.pgbouncer and self.settings.db_pool_pre_ping == "idle":
+            ping_idle_connections(target, self.settings.db_pool_ping_idle_seconds)
+        if self.settings.metrics_enabled:
+            instrument_engine(target, label)
+            if isinstance(target.pool, TimedCheckout):
+                target.pool.metrics_label = label
+
+    def _create_engine(self, sync_url: URL, label: str) -> Engine:
+        created = create_engine(sync_url, future=True, **self.engine_options(TimedQueuePool))
+        self._configure_engine(created, label)
+        return created
+
+    def _create_async_engine(self, sync_url: URL, label: str) -> AsyncEngine:
+        async_url = sync_url.set(drivername="postgresql+psycopg_async") if self.is_postgres else sync_url
+        created = create_async_engine(async_url, **self.engine_options(TimedAsyncAdaptedQueuePool))
+        self._configure_engine(created.sync_engine, label)
+        return created
+
+    def _build_replica(self, name: str, replica_url: URL) -> Replica:
+        replica_engine = self._create_engine(replica_url, name)
+        replica_async_engine = None
+        async_factory = None
+        if self.settings.db_async:
+            replica_async_engine = self._create_async_engine(replica_url, f"{name}-async")
+            async_factory = async_sessionmaker(replica_async_engine, autoflush=False, expire_on_commit=False)
+        return Replica(
+            name,
+            replica_engine,
+            sessionmaker(autoflush=False, bind=replica_engine, future=True),
+            replica_async_engine,
+            async_factory,
+        )
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            if replica.async_engine is not None:
+                await replica.async_engine.dispose()
+            await run_in_threadpool(replica.engine.dispose)
+        if self.async_engine is not None:
+            await self.async_engine.dispose()
+        await run_in_threadpool(self.engine.dispose)
+
+    async def close(self) -> None:
+        """Dispose the engines for good: unlike :meth:`dispose`, they are no longer reported in metrics."""
+        await self.dispose()
+        for replica in self.replicas:
+            if replica.async_engine is not None:
+                forget_engine(replica.async_engine.sync_engine)
+            forget_engine(replica.engine)
+        if self.async_engine is not None:
+            forget_engine(self.async_engine.sync_engine)
+        forget_engine(self.engine)
+
+
+_databases: Optional[Databases] = None
+_databases_lock = threading.Lock()
+
+
+def init_databases(settings: Optional[Settings] = None) -> Databases:
+    """Build the process's engines from ``settings`` (default ``get_settings()``) once.
+
+    Later calls with equal settings return the same instance; engines built from other settings
+    are replaced through :func:`use_databases`.
+    """
+    global _databases
+    with _databases_lock:
+        settings = settings or get_settings()
+        if _databases is None:
+            _databases = Databases(settings)
+        elif _databases.settings != settings:
+            raise RuntimeError("Databases were initialised from other settings; use use_databases() to replace them")
+        return _databases
+
+
+async def use_databases(settings: Settings) -> Databases:
+    """Engines for ``settings``, replacing (and disposing) any built earlier from different settings."""
+    global _databases
+    stale = _databases
+    if stale is not None and stale.settings != settings:
+        with _databases_lock:
+            if _databases is stale:
+                _databases = None
+        await stale.close()
+    return init_databases(settings)
+
+
+def databases() -> Databases:
+    return _databases if _databases is not None else init_databases()
+
+
+_LAZY_ATTRIBUTES = frozenset({"engine", "SessionLocal", "async_engine", "AsyncSessionLocal", "replicas", "libpq_dsn"})
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(databases(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def pool_status() -> Optional[dict[str, Any]]:
+    """Occupancy of the pool serving requests; ``None`` for pools without a fixed size (e.g. NullPool)."""
+    current = databases()
+    pool = (current.async_engine or current.engine).pool
+    if not isinstance(pool, QueuePool):
+        return None
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "saturation": round(pool.checkedout() / capacity, 3) if capacity else 1.0,
+    }
+
+
+class ThreadedStreamResult:
+    """Async iteration over a sync streaming :class:`Result`, one partition per worker-thread hop."""
+
+    def __init__(self, result: Any) -> None:
+        self._result = result
+
+    async def partitions(self, size: Optional[int] = None) -> AsyncIterator[Sequence[Row]]:
+        iterator: Iterator[Sequence[Row]] = self._result.partitions(size)
+        while True:
+            partition = await run_in_threadpool(next, iterator, None)
+            if partition is None:
+                return
+            yield partition
+
+    async def close(self) -> None:
+        await run_in_threadpool(self._result.close)
+
+
+class ThreadedSession:
+    """Awaitable facade over a sync :class:`Session`, used when ``DB_ASYNC`` is off.
+
+    Routers are written once against the :class:`AsyncSession` API; in sync mode each call is
+    handed to AnyIO's worker threads so the event loop never waits on the driver.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self.sync_session = session
+
+    def add(self, instance: object) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances: Any) -> None:
+        self.sync_session.add_all(instances)
+
+    async def run_sync(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def execute(self, statement: Any, params: Any = None, **kwargs: Any) -> Any:
+        return await run_in_threadpool(self.sync_session.execute, statement, params, **kwargs)
+
+    async def stream(self, statement: Any, params: Any = None) -> ThreadedStreamResult:
+        result = await run_in_threadpool(
+            self.sync_session.execute, statement, params, execution_options={"stream_results": True}
+        )
+        return ThreadedStreamResult(result)
+
+    async def scalar(self, statement: Any, params: Any = None, **kwargs: Any) -> Any:
+        return await run_in_threadpool(self.sync_session.scalar, statement, params, **kwargs)
+
+    async def scalars(self, statement: Any, params: Any = None, **kwargs: Any) -> Any:
+        return await run_in_threadpool(self.sync_session.scalars, statement, params, **kwargs)
+
+    async def get(self, entity: Any, ident: Any, **kwargs: Any) -> Any:
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def refresh(self, instance: object, **kwargs: Any) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, **kwargs)
+
+    async def delete(self, instance: object) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
 
 
 def get_db():
-    db = SessionLocal()
+    db = databases().SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+@asynccontextmanager
+async def session_scope(replica: Optional[Replica] = None) -> AsyncIterator[AsyncSession]:
+    """Session on the primary, or on ``replica`` for read-only work."""
+    current = databases()
+    async_factory = current.AsyncSessionLocal if replica is None else replica.async_session_factory
+    if async_factory is not None:
+        async with async_factory() as session:
+            yield session
+        return
+
+    sync_factory = current.SessionLocal if replica is None else replica.session_factory
+    threaded = ThreadedSession(sync_factory(expire_on_commit=False))
+    try:
+        yield threaded  # type: ignore[misc]
+    finally:
+        await threaded.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with session_scope() as session:
+        yield session
+
+
+async def dispose_engines() -> None:
+    if _databases is not None:
+        await _databases.dispose()
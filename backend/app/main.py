@@ -1,30 +1,30 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+"""ASGI entry points.
 
-from app.core.config import get_settings
-from app.core.logging import configure_logging
-from app.routers import auth, healthz, items, users
+``create_app(settings)`` builds a configured application. ``app`` is created from the
+environment on first access, so ``uvicorn app.main:app``, ``gunicorn app.main:app`` and
+``from app.main import app`` keep working while importing this module stays cheap: nothing is
+read, connected or even imported until an application is requested.
+"""
 
-configure_logging()
+from typing import TYPE_CHECKING, Any, Optional
 
-settings = get_settings()
+if TYPE_CHECKING:
+    from fastapi import FastAPI
 
-app = FastAPI(title="Template FastAPI", version="0.1.0")
+    from app.core.config import Settings
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins or ["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-app.include_router(healthz.router)
-app.include_router(auth.router)
-app.include_router(users.router)
-app.include_router(items.router)
+def create_app(settings: Optional["Settings"] = None) -> "FastAPI":
+    """Application for ``settings``, or for the environment's settings when none are given."""
+    from app.application import build_app
+    from app.core.config import get_settings
 
+    return build_app(settings or get_settings())
 
-@app.get("/", tags=["root"])
-def read_root() -> dict[str, str]:
-    return {"message": "API is running"}
+
+def __getattr__(name: str) -> Any:
+    if name == "app":
+        application = create_app()
+        globals()["app"] = application
+        return application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,4 +1,4 @@
-from .user import User
-from .item import Item
+from .user import CollectionVersion, User
+from .item import Item, ItemVersion
 
-__all__ = ["User", "Item"]
+__all__ = ["User", "Item", "ItemVersion", "CollectionVersion"]
@@ -1,3 +1,3 @@
-from . import auth, healthz, items, users
+from . import auth, healthz, items, metrics, users
 
-__all__ = ["auth", "healthz", "items", "users"]
+__all__ = ["auth", "healthz", "items", "metrics", "users"]
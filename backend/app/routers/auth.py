@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user, get_db_session
-from app.core.security import create_access_token
-from app.models import User
+from app.core.deps import get_current_admin, get_current_user, get_db_session
+from app.core.principal_cache import Principal, principal_cache
+from app.core.security import AccessClaims, create_access_token
 from app.schemas.auth import AuthUser, LoginRequest, Token
 from app.services.auth import authenticate
 
@@ -11,15 +11,20 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/login", response_model=Token)
-def login(data: LoginRequest, db: Session = Depends(get_db_session)) -> Token:
-    user = authenticate(db, data.email, data.password)
+async def login(data: LoginRequest, db: AsyncSession = Depends(get_db_session)) -> Token:
+    user = await authenticate(db, data.email, data.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email or password")
 
-    token = create_access_token(str(user.id))
+    token = create_access_token(str(user.id), role=user.role, token_version=user.token_version)
     return Token(access_token=token)
 
 
 @router.get("/me", response_model=AuthUser)
-def read_profile(current_user: User = Depends(get_current_user)) -> AuthUser:
+async def read_profile(current_user: Principal = Depends(get_current_user)) -> AuthUser:
     return AuthUser.model_validate(current_user)
+
+
+@router.get("/principal-cache", tags=["auth"])
+async def read_principal_cache_stats(_: AccessClaims = Depends(get_current_admin)) -> dict[str, int]:
+    return principal_cache.stats()
@@ -1,15 +1,20 @@
+from typing import Any
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
 from app.core.deps import get_db_session
+from app.db.health import database_health
+from app.db.replicas import replica_router
 
 router = APIRouter(tags=["health"])
 
 
 @router.get("/healthz")
-def health_check(db: Session = Depends(get_db_session)) -> dict[str, str]:
+async def health_check(db: AsyncSession = Depends(get_db_session)) -> dict[str, str]:
     settings = get_settings()
     required = {
         "database_url": settings.database_url,
@@ -20,8 +25,30 @@ def health_check(db: Session = Depends(get_db_session)) -> dict[str, str]:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Missing configuration")
 
     try:
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
     except Exception as exc:  # pragma: no cover - surfaces connection issues
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Database unavailable") from exc
 
     return {"status": "ok"}
+
+
+@router.get("/livez")
+async def liveness() -> dict[str, str]:
+    """The process is up and serving; never touches the database."""
+    return {"status": "alive"}
+
+
+@router.get("/readyz")
+async def readiness() -> Any:
+    """Latest background probe result: no connection is taken from the pool per request.
+
+    Readiness follows the primary only; ejected replicas just send reads back to it.
+    """
+    snapshot = database_health.snapshot()
+    ready = snapshot["ready"]
+    content: dict[str, Any] = {"status": "ready" if ready else "unavailable", "database": snapshot}
+    if replica_router.enabled:
+        content["replicas"] = replica_router.snapshot()
+    return ORJSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE, content=content
+    )
@@ -1,77 +1,304 @@
 import uuid
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import and_, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user, get_db_session
-from app.models import Item, User
-from app.schemas.item import ItemCreate, ItemRead, ItemUpdate
+from app.core.deps import get_current_claims, get_db_session
+from app.core.etag import (
+    collection_etag,
+    etag_headers,
+    if_match_satisfied,
+    none_match,
+    not_modified,
+    row_etag,
+    row_versions,
+)
+from app.core.pagination import decode_cursor, decode_rank_cursor, encode_cursor, encode_rank_cursor
+from app.core.responses import json_bytes_response
+from app.core.security import AccessClaims
+from app.db.replicas import replica_router
+from app.models import Item
+from app.schemas.item import (
+    ITEM_LIST_ADAPTER,
+    ItemBulkCreate,
+    ItemBulkDelete,
+    ItemBulkDeleteResult,
+    ItemBulkError,
+    ItemBulkResult,
+    ItemBulkUpdate,
+    ItemBulkUpdateEntry,
+    ItemCreate,
+    ItemPage,
+    ItemRead,
+    ItemUpdate,
+)
+from app.services.export import ExportFormat, export_response
+from app.services.items import (
+    ITEM_COLUMNS,
+    delete_items,
+    delete_owned_item,
+    insert_items,
+    item_collection_version,
+    rename_owned_item,
+    search_criteria,
+    search_rank,
+    select_owned_item,
+    update_item_names,
+)
 
 router = APIRouter(prefix="/items", tags=["items"])
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
 
 @router.post("", response_model=ItemRead, status_code=status.HTTP_201_CREATED)
-def create_item(
+async def create_item(
     item_in: ItemCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db_session),
+    current_user: AccessClaims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_db_session),
 ) -> ItemRead:
-    item = Item(name=item_in.name, owner_id=current_user.id)
-    db.add(item)
-    db.commit()
-    db.refresh(item)
-    return ItemRead.model_validate(item)
-
-
-@router.get("", response_model=list[ItemRead])
-def list_items(current_user: User = Depends(get_current_user), db: Session = Depends(get_db_session)) -> list[ItemRead]:
-    items = (
-        db.query(Item)
-        .filter(Item.owner_id == current_user.id)
-        .order_by(Item.created_at.desc())
-        .all()
+    (row,) = await insert_items(db, current_user.id, [item_in.name])
+    await db.commit()
+    return ItemRead.model_validate(row)
+
+
+@router.get("", response_model=ItemPage)
+async def list_items(
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(default=None, description="Opaque cursor returned as next_cursor"),
+    q: Optional[str] = Query(
+        default=None, min_length=1, max_length=100, description="Substring or fuzzy match on the name, best first"
+    ),
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: AccessClaims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    # The page is only read and serialized when the owner's collection changed since the
+    # client's copy; otherwise one primary-key lookup of its version answers with 304.
+    version = await item_collection_version(db, current_user.id)
+    etag = collection_etag(version, current_user.id, limit, after, q)
+    if not none_match(if_none_match, etag):
+        return not_modified(etag)
+
+    if q is not None:
+        rows, next_cursor = await _search_page(db, current_user.id, q, limit, after)
+    else:
+        rows, next_cursor = await _recent_page(db, current_user.id, limit, after)
+    # Plain column rows are validated once as a list and serialized straight to bytes.
+    items = ITEM_LIST_ADAPTER.validate_python(rows, from_attributes=True)
+    page = ItemPage.model_construct(items=items, next_cursor=next_cursor)
+    return json_bytes_response(page.model_dump_json(), headers=etag_headers(etag))
+
+
+def _cursor_error() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+async def _recent_page(
+    db: AsyncSession, owner_id: uuid.UUID, limit: int, after: Optional[str]
+) -> tuple[list, Optional[str]]:
+    # Ordering matches idx_items_owner_created_at_id (owner_id, created_at DESC, id) so every
+    # page is a single index range scan starting at the cursor, never an OFFSET walk.
+    query = select(*ITEM_COLUMNS).where(Item.owner_id == owner_id)
+    if after is not None:
+        try:
+            after_created_at, after_id = decode_cursor(after)
+        except ValueError:
+            raise _cursor_error()
+        query = query.where(
+            or_(
+                Item.created_at < after_created_at,
+                and_(Item.created_at == after_created_at, Item.id > after_id),
+            )
+        )
+
+    result = await db.execute(query.order_by(Item.created_at.desc(), Item.id.asc()).limit(limit + 1))
+    rows = list(result)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+async def _search_page(
+    db: AsyncSession, owner_id: uuid.UUID, q: str, limit: int, after: Optional[str]
+) -> tuple[list, Optional[str]]:
+    # idx_items_name_trgm narrows the owner's rows to the matches; only those are ranked. The
+    # (rank, id) cursor resumes strictly after the previous page instead of re-reading it.
+    rank = search_rank(q)
+    query = select(*ITEM_COLUMNS, rank.label("rank")).where(Item.owner_id == owner_id, search_criteria(q))
+    if after is not None:
+        try:
+            after_rank, after_id = decode_rank_cursor(after)
+        except ValueError:
+            raise _cursor_error()
+        query = query.where(tuple_(rank, Item.id) < tuple_(after_rank, after_id))
+
+    result = await db.execute(query.order_by(rank.desc(), Item.id.desc()).limit(limit + 1))
+    rows = list(result)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_rank_cursor(rows[-1].rank, rows[-1].id)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_items(
+    request: Request,
+    format: ExportFormat = Query(default="ndjson"),
+    current_user: AccessClaims = Depends(get_current_claims),
+) -> StreamingResponse:
+    query = select(*ITEM_COLUMNS).where(Item.owner_id == current_user.id).order_by(Item.created_at.desc(), Item.id.asc())
+    return export_response(query, format, "items", replica_router.for_request(request))
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    error = exc.errors()[0]
+    location = ".".join(str(part) for part in error["loc"])
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+
+# Export and bulk routes are declared before /{item_id} so "export"/"bulk" are never parsed as ids.
+# Each batch is one statement in one transaction; invalid elements are reported by index.
+@router.post("/bulk", response_model=ItemBulkResult)
+async def bulk_create_items(
+    payload: ItemBulkCreate,
+    current_user: AccessClaims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_db_session),
+) -> ItemBulkResult:
+    names: list[str] = []
+    errors: list[ItemBulkError] = []
+    for index, raw in enumerate(payload.items):
+        try:
+            names.append(ItemCreate.model_validate(raw).name)
+        except ValidationError as exc:
+            errors.append(ItemBulkError(index=index, detail=_validation_detail(exc)))
+
+    rows = await insert_items(db, current_user.id, names)
+    await db.commit()
+    return ItemBulkResult(items=[ItemRead.model_validate(row) for row in rows], errors=errors)
+
+
+@router.patch("/bulk", response_model=ItemBulkResult)
+async def bulk_update_items(
+    payload: ItemBulkUpdate,
+    current_user: AccessClaims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_db_session),
+) -> ItemBulkResult:
+    changes: dict[uuid.UUID, tuple[int, str]] = {}
+    errors: list[ItemBulkError] = []
+    for index, raw in enumerate(payload.items):
+        try:
+            entry = ItemBulkUpdateEntry.model_validate(raw)
+        except ValidationError as exc:
+            errors.append(ItemBulkError(index=index, detail=_validation_detail(exc)))
+            continue
+        if entry.id in changes:
+            errors.append(ItemBulkError(index=index, id=entry.id, detail="Duplicate id in batch"))
+            continue
+        changes[entry.id] = (index, entry.name)
+
+    rows = await update_item_names(db, current_user.id, [(item_id, name) for item_id, (_, name) in changes.items()])
+    await db.commit()
+
+    updated = {row.id: row for row in rows}
+    errors.extend(
+        ItemBulkError(index=index, id=item_id, detail="Item not found")
+        for item_id, (index, _) in changes.items()
+        if item_id not in updated
+    )
+    errors.sort(key=lambda error: error.index)
+    return ItemBulkResult(
+        items=[ItemRead.model_validate(updated[item_id]) for item_id in changes if item_id in updated],
+        errors=errors,
     )
-    return [ItemRead.model_validate(item) for item in items]
 
 
-def _get_owned_item(db: Session, item_id: uuid.UUID, user: User) -> Item:
-    item = db.get(Item, item_id)
-    if not item or item.owner_id != user.id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
-    return item
+@router.delete("/bulk", response_model=ItemBulkDeleteResult)
+async def bulk_delete_items(
+    payload: ItemBulkDelete,
+    current_user: AccessClaims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_db_session),
+) -> ItemBulkDeleteResult:
+    ids: dict[uuid.UUID, int] = {}
+    errors: list[ItemBulkError] = []
+    for index, raw in enumerate(payload.ids):
+        try:
+            ids.setdefault(uuid.UUID(str(raw)), index)
+        except ValueError:
+            errors.append(ItemBulkError(index=index, detail="id: Input should be a valid UUID"))
+
+    deleted = set(await delete_items(db, current_user.id, list(ids)))
+    await db.commit()
+
+    errors.extend(
+        ItemBulkError(index=index, id=item_id, detail="Item not found") for item_id, index in ids.items() if item_id not in deleted
+    )
+    errors.sort(key=lambda error: error.index)
+    return ItemBulkDeleteResult(deleted=[item_id for item_id in ids if item_id in deleted], errors=errors)
+
+
+async def _write_miss(
+    db: AsyncSession, owner_id: uuid.UUID, item_id: uuid.UUID, if_match: Optional[str]
+) -> HTTPException:
+    # A conditional write that matched no row needs one extra read to tell 412 from 404.
+    if if_match is not None and await select_owned_item(db, owner_id, item_id) is not None:
+        return HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="Item has been modified")
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
 
 
 @router.get("/{item_id}", response_model=ItemRead)
-def get_item(
+async def get_item(
     item_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db_session),
-) -> ItemRead:
-    item = _get_owned_item(db, item_id, current_user)
-    return ItemRead.model_validate(item)
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: AccessClaims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_db_session),
+) -> ItemRead | Response:
+    row = await select_owned_item(db, current_user.id, item_id)
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+    etag = row_etag(row.updated_at)
+    if not none_match(if_none_match, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+    return ItemRead.model_validate(row)
 
 
 @router.patch("/{item_id}", response_model=ItemRead)
-def update_item(
+async def update_item(
     item_id: uuid.UUID,
     item_in: ItemUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db_session),
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
+    current_user: AccessClaims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_db_session),
 ) -> ItemRead:
-    item = _get_owned_item(db, item_id, current_user)
-    if item_in.name is not None:
-        item.name = item_in.name
-    db.commit()
-    db.refresh(item)
-    return ItemRead.model_validate(item)
+    if item_in.name is None:
+        row = await select_owned_item(db, current_user.id, item_id)
+        if row and not if_match_satisfied(if_match, row_etag(row.updated_at)):
+            raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="Item has been modified")
+    else:
+        row = await rename_owned_item(db, current_user.id, item_id, item_in.name, row_versions(if_match))
+    if not row:
+        raise await _write_miss(db, current_user.id, item_id, if_match)
+    await db.commit()
+    response.headers.update(etag_headers(row_etag(row.updated_at)))
+    return ItemRead.model_validate(row)
 
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_item(
+async def delete_item(
     item_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db_session),
+    if_match: Optional[str] = Header(default=None),
+    current_user: AccessClaims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_db_session),
 ) -> None:
-    item = _get_owned_item(db, item_id, current_user)
-    db.delete(item)
-    db.commit()
+    if not await delete_owned_item(db, current_user.id, item_id, row_versions(if_match)):
+        raise await _write_miss(db, current_user.id, item_id, if_match)
+    await db.commit()
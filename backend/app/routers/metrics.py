@@ -0,0 +1,164 @@
+import hmac
+import ipaddress
+from typing import Callable, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+
+from app.core.admission import admission_control
+from app.core.config import get_settings
+from app.core.logging import log_pipeline
+from app.core.metrics import CONTENT_TYPE, CallbackMetric, Samples, registry
+from app.core.principal_cache import principal_cache
+from app.core.security import password_hash_pool
+from app.core.token_cache import verified_tokens
+from app.db.health import database_health
+from app.db.replicas import replica_router
+
+router = APIRouter(tags=["metrics"])
+
+
+def _value(read: Callable[[], float]) -> Callable[[], Samples]:
+    return lambda: [((), read())]
+
+
+registry.register(
+    CallbackMetric(
+        "principal_cache_entries", "Principals currently cached.", (), _value(lambda: principal_cache.stats()["size"])
+    )
+)
+for _stat in ("hits", "misses", "evictions", "invalidations"):
+    registry.register(
+        CallbackMetric(
+            f"principal_cache_{_stat}_total",
+            f"Principal cache {_stat}.",
+            (),
+            _value(lambda stat=_stat: principal_cache.stats()[stat]),
+            kind="counter",
+        )
+    )
+registry.register(
+    CallbackMetric(
+        "token_cache_entries", "Verified access tokens cached.", (), _value(lambda: verified_tokens.stats()["size"])
+    )
+)
+for _stat in ("hits", "misses", "evictions"):
+    registry.register(
+        CallbackMetric(
+            f"token_cache_{_stat}_total",
+            f"Verified-token cache {_stat}.",
+            (),
+            _value(lambda stat=_stat: verified_tokens.stats()[stat]),
+            kind="counter",
+        )
+    )
+registry.register(
+    CallbackMetric(
+        "password_hash_in_flight", "bcrypt jobs running or queued.", (), _value(lambda: password_hash_pool.in_flight)
+    )
+)
+registry.register(
+    CallbackMetric(
+        "password_hash_rejected_total",
+        "bcrypt jobs rejected because the queue was full.",
+        (),
+        _value(lambda: password_hash_pool.rejected),
+        kind="counter",
+    )
+)
+registry.register(
+    CallbackMetric("db_up", "1 when the last background database probe succeeded.", (), _value(lambda: int(database_health.ready)))
+)
+registry.register(
+    CallbackMetric(
+        "db_circuit_open", "1 while database requests are rejected fast.", (), _value(lambda: int(database_health.circuit_open))
+    )
+)
+
+registry.register(
+    CallbackMetric(
+        "db_replica_up",
+        "1 while a read replica is in rotation.",
+        ("replica",),
+        lambda: [((name,), int(state.healthy)) for name, state in replica_router.states.items()],
+    )
+)
+registry.register(
+    CallbackMetric(
+        "db_replica_lag_seconds",
+        "Replay lag measured by the latest replica probe.",
+        ("replica",),
+        lambda: [((name,), state.lag_seconds) for name, state in replica_router.states.items() if state.lag_seconds is not None],
+    )
+)
+
+registry.register(
+    CallbackMetric(
+        "log_records_dropped_total",
+        "Log records dropped because the log queue was full.",
+        (),
+        lambda: [((), pipeline.dropped)] if (pipeline := log_pipeline()) is not None else [],
+        kind="counter",
+    )
+)
+registry.register(
+    CallbackMetric(
+        "log_queue_depth",
+        "Log records waiting for the background writer.",
+        (),
+        lambda: [((), pipeline.queued)] if (pipeline := log_pipeline()) is not None else [],
+    )
+)
+
+for _field, _doc in (
+    ("limit", "Current adaptive concurrency limit."),
+    ("in_flight", "Admitted requests still running."),
+    ("queued", "Requests waiting for admission."),
+):
+    registry.register(
+        CallbackMetric(
+            f"admission_{_field}",
+            _doc,
+            ("class",),
+            lambda field=_field: [((name,), getattr(limit, field)) for name, limit in admission_control.limits.items()],
+        )
+    )
+registry.register(
+    CallbackMetric(
+        "admission_rejected_total",
+        "Requests answered 503 by admission control.",
+        ("class", "reason"),
+        lambda: [
+            ((name, reason), count)
+            for name, limit in admission_control.limits.items()
+            for reason, count in limit.rejected.items()
+        ],
+        kind="counter",
+    )
+)
+
+
+def _loopback(host: Optional[str]) -> bool:
+    try:
+        return host is not None and ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def authorize_scrape(request: Request) -> None:
+    """``METRICS_TOKEN`` as a bearer token when set; otherwise only loopback clients may scrape."""
+    token = get_settings().metrics_token
+    if token:
+        presented = request.headers.get("authorization", "")
+        if not hmac.compare_digest(presented.encode(), f"Bearer {token}".encode()):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+    elif not _loopback(request.client.host if request.client else None):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Metrics are served to loopback clients only")
+
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(authorize_scrape)])
+async def metrics() -> Response:
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
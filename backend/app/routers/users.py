@@ -1,81 +1,171 @@
 import uuid
+from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import ensure_self_or_admin, get_current_admin, get_db_session
-from app.core.security import get_password_hash
+from app.core.etag import (
+    collection_etag,
+    etag_headers,
+    if_match_satisfied,
+    none_match,
+    not_modified,
+    row_etag,
+    row_versions,
+)
+from app.core.responses import json_bytes_response
+from app.core.revocation import REVOKE_ALL
+from app.core.security import AccessClaims, get_password_hash_async
+from app.db.replicas import replica_router
 from app.models import User
-from app.schemas.user import UserCreate, UserRead, UserUpdate
+from app.schemas.user import USER_LIST_ADAPTER, UserCreate, UserRead, UserUpdate
+from app.services.export import ExportFormat, export_response
+from app.services.principals import apply_principal_change, publish_principal_change
+from app.services.users import (
+    ACTIVE_USER,
+    USER_COLUMNS,
+    delete_user_row,
+    insert_user,
+    request_user_purge,
+    select_user,
+    start_purge,
+    update_user_fields,
+    user_collection_version,
+)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.post("", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def create_user(user_in: UserCreate, db: Session = Depends(get_db_session), _: User = Depends(get_current_admin)) -> UserRead:
-    user = User(email=user_in.email, password_hash=get_password_hash(user_in.password), role=user_in.role)
-    db.add(user)
+async def create_user(
+    user_in: UserCreate, db: AsyncSession = Depends(get_db_session), _: AccessClaims = Depends(get_current_admin)
+) -> UserRead:
+    password_hash = await get_password_hash_async(user_in.password)
     try:
-        db.commit()
+        row = await insert_user(db, user_in.email, password_hash, user_in.role)
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    db.refresh(user)
-    return UserRead.model_validate(user)
+    return UserRead.model_validate(row)
 
 
 @router.get("", response_model=list[UserRead])
-def list_users(_: User = Depends(get_current_admin), db: Session = Depends(get_db_session)) -> list[UserRead]:
-    users = db.query(User).order_by(User.created_at.desc()).all()
-    return [UserRead.model_validate(u) for u in users]
+async def list_users(
+    if_none_match: Optional[str] = Header(default=None),
+    _: AccessClaims = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    etag = collection_etag(await user_collection_version(db))
+    if not none_match(if_none_match, etag):
+        return not_modified(etag)
+
+    rows = (await db.execute(select(*USER_COLUMNS).where(ACTIVE_USER).order_by(User.created_at.desc()))).all()
+    body = USER_LIST_ADAPTER.dump_json(USER_LIST_ADAPTER.validate_python(rows, from_attributes=True))
+    return json_bytes_response(body, headers=etag_headers(etag))
+
+
+# Declared before /{user_id}; never selects password_hash.
+@router.get("/export", response_class=StreamingResponse)
+async def export_users(
+    request: Request, format: ExportFormat = Query(default="ndjson"), _: AccessClaims = Depends(get_current_admin)
+) -> StreamingResponse:
+    query = (
+        select(User.id, User.email, User.role, User.created_at, User.updated_at)
+        .where(ACTIVE_USER)
+        .order_by(User.created_at.desc(), User.id.asc())
+    )
+    return export_response(query, format, "users", replica_router.for_request(request))
+
+
+async def _write_miss(db: AsyncSession, user_id: uuid.UUID, if_match: Optional[str]) -> HTTPException:
+    # A conditional write that matched no row needs one extra read to tell 412 from 404.
+    if if_match is not None and await select_user(db, user_id) is not None:
+        return HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="User has been modified")
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
 
 @router.get("/{user_id}", response_model=UserRead)
-def get_user(
+async def get_user(
     user_id: uuid.UUID,
-    _: User = Depends(ensure_self_or_admin),
-    db: Session = Depends(get_db_session),
-) -> UserRead:
-    user = db.get(User, user_id)
-    if not user:
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    _: AccessClaims = Depends(ensure_self_or_admin),
+    db: AsyncSession = Depends(get_db_session),
+) -> UserRead | Response:
+    row = await select_user(db, user_id)
+    if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return UserRead.model_validate(user)
+    etag = row_etag(row.updated_at)
+    if not none_match(if_none_match, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+    return UserRead.model_validate(row)
 
 
 @router.patch("/{user_id}", response_model=UserRead)
-def update_user(
+async def update_user(
     user_id: uuid.UUID,
     user_in: UserUpdate,
-    actor: User = Depends(ensure_self_or_admin),
-    db: Session = Depends(get_db_session),
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
+    actor: AccessClaims = Depends(ensure_self_or_admin),
+    db: AsyncSession = Depends(get_db_session),
 ) -> UserRead:
-    user = db.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-
-    if user_in.email is not None:
-        user.email = user_in.email
-    if user_in.password is not None:
-        user.password_hash = get_password_hash(user_in.password)
-    if user_in.role is not None:
-        if actor.role != "admin":
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can change roles")
-        user.role = user_in.role
+    if user_in.role is not None and actor.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can change roles")
+    password_hash = await get_password_hash_async(user_in.password) if user_in.password is not None else None
 
     try:
-        db.commit()
+        row = await update_user_fields(
+            db,
+            user_id,
+            email=user_in.email,
+            password_hash=password_hash,
+            role=user_in.role,
+            versions=row_versions(if_match),
+        )
+        if not row:
+            raise await _write_miss(db, user_id, if_match)
+        unchanged = user_in.email is None and password_hash is None and user_in.role is None
+        if unchanged and not if_match_satisfied(if_match, row_etag(row.updated_at)):
+            raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="User has been modified")
+        # Tokens older than the (possibly bumped) version carry a stale role or password.
+        revoke_below = row.token_version if password_hash is not None or user_in.role is not None else None
+        await publish_principal_change(db, user_id, revoke_below)
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    db.refresh(user)
-    return UserRead.model_validate(user)
+    apply_principal_change(user_id, revoke_below)
+    response.headers.update(etag_headers(row_etag(row.updated_at)))
+    return UserRead.model_validate(row)
 
 
-@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(user_id: uuid.UUID, _: User = Depends(get_current_admin), db: Session = Depends(get_db_session)) -> None:
-    user = db.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    db.delete(user)
-    db.commit()
+@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT, response_model=None)
+async def delete_user(
+    user_id: uuid.UUID,
+    mode: Literal["cascade", "background"] = Query(default="cascade"),
+    if_match: Optional[str] = Header(default=None),
+    _: AccessClaims = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db_session),
+) -> Optional[Response]:
+    """``cascade`` deletes the user and, via the foreign key, their items in one statement.
+
+    ``background`` is for very large accounts: the user disappears at once (``202``) and their
+    items are deleted in small batches afterwards.
+    """
+    remove = delete_user_row if mode == "cascade" else request_user_purge
+    if not await remove(db, user_id, row_versions(if_match)):
+        raise await _write_miss(db, user_id, if_match)
+    await publish_principal_change(db, user_id, REVOKE_ALL)
+    await db.commit()
+    apply_principal_change(user_id, REVOKE_ALL)
+    if mode == "background":
+        start_purge(user_id)
+        return Response(status_code=status.HTTP_202_ACCEPTED)
+    return None
@@ -1,12 +1,35 @@
 from .auth import AuthUser, LoginRequest, Token
-from .item import ItemCreate, ItemRead, ItemUpdate
-from .user import UserCreate, UserRead, UserUpdate
+from .item import (
+    ITEM_LIST_ADAPTER,
+    ItemBulkCreate,
+    ItemBulkDelete,
+    ItemBulkDeleteResult,
+    ItemBulkError,
+    ItemBulkResult,
+    ItemBulkUpdate,
+    ItemBulkUpdateEntry,
+    ItemCreate,
+    ItemPage,
+    ItemRead,
+    ItemUpdate,
+)
+from .user import USER_LIST_ADAPTER, UserCreate, UserRead, UserUpdate
 
 __all__ = [
+    "ITEM_LIST_ADAPTER",
+    "USER_LIST_ADAPTER",
     "AuthUser",
     "LoginRequest",
     "Token",
+    "ItemBulkCreate",
+    "ItemBulkDelete",
+    "ItemBulkDeleteResult",
+    "ItemBulkError",
+    "ItemBulkResult",
+    "ItemBulkUpdate",
+    "ItemBulkUpdateEntry",
     "ItemCreate",
+    "ItemPage",
     "ItemRead",
     "ItemUpdate",
     "UserCreate",
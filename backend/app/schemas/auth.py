@@ -1,3 +1,4 @@
+import uuid
 from datetime import datetime
 from typing import Optional
 
@@ -11,6 +12,8 @@ class Token(BaseModel):
 
 class TokenPayload(BaseModel):
     sub: Optional[str] = None
+    role: Optional[str] = None
+    ver: int = 0
     exp: Optional[int] = None
 
 
@@ -20,7 +23,7 @@ class LoginRequest(BaseModel):
 
 
 class AuthUser(BaseModel):
-    id: str
+    id: uuid.UUID
     email: EmailStr
     role: str
     created_at: datetime
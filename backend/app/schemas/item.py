@@ -1,7 +1,8 @@
+import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class ItemBase(BaseModel):
@@ -16,11 +17,58 @@ class ItemUpdate(BaseModel):
     name: Optional[str] = Field(default=None, min_length=1)
 
 
+MAX_BULK_ITEMS = 1000
+
+
+class ItemBulkUpdateEntry(ItemBase):
+    id: uuid.UUID
+
+
+class ItemBulkCreate(BaseModel):
+    # Elements stay untyped here so one bad entry is reported by index instead of failing the batch.
+    items: list[Any] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class ItemBulkUpdate(BaseModel):
+    items: list[Any] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class ItemBulkDelete(BaseModel):
+    ids: list[Any] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+
 class ItemRead(BaseModel):
-    id: str
+    id: uuid.UUID
     name: str
-    owner_id: str
+    owner_id: uuid.UUID
     created_at: datetime
+    updated_at: datetime
 
     class Config:
         from_attributes = True
+
+
+# Built once: validating a whole list of rows through one adapter is far cheaper than a
+# model_validate call per row.
+ITEM_LIST_ADAPTER = TypeAdapter(list[ItemRead])
+
+
+class ItemPage(BaseModel):
+    items: list[ItemRead]
+    next_cursor: Optional[str] = None
+
+
+class ItemBulkError(BaseModel):
+    index: int
+    id: Optional[uuid.UUID] = None
+    detail: str
+
+
+class ItemBulkResult(BaseModel):
+    items: list[ItemRead]
+    errors: list[ItemBulkError]
+
+
+class ItemBulkDeleteResult(BaseModel):
+    deleted: list[uuid.UUID]
+    errors: list[ItemBulkError]
@@ -1,7 +1,8 @@
+import uuid
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter
 
 
 class UserBase(BaseModel):
@@ -20,10 +21,14 @@ class UserUpdate(BaseModel):
 
 
 class UserRead(BaseModel):
-    id: str
+    id: uuid.UUID
     email: EmailStr
     role: str
     created_at: datetime
+    updated_at: datetime
 
     class Config:
         from_attributes = True
+
+
+USER_LIST_ADAPTER = TypeAdapter(list[UserRead])
@@ -1,15 +1,30 @@
+import logging
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import verify_password
+from app.core.security import verify_and_update_password_async
 from app.models import User
+from app.services.users import replace_password_hash
 
+logger = logging.getLogger(__name__)
 
-def authenticate(db: Session, email: str, password: str) -> Optional[User]:
-    user = db.query(User).filter(User.email == email).first()
+
+async def authenticate(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    user = (await db.execute(select(User).where(User.email == email, User.purge_requested_at.is_(None)))).scalars().first()
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+    verified, new_hash = await verify_and_update_password_async(password, user.password_hash)
+    if not verified:
         return None
+    if new_hash is not None:
+        # The stored hash uses an outdated scheme or cost; upgrading it must not cost the login.
+        try:
+            await replace_password_hash(db, user.id, user.password_hash, new_hash)
+            await db.commit()
+        except SQLAlchemyError:
+            await db.rollback()
+            logger.warning("Could not store rehashed password for user %s", user.id, exc_info=True)
     return user
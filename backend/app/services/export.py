@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Literal, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, Select
+
+from app.db.session import Replica, session_scope
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_ndjson(columns: Sequence[str], rows: Sequence[Row]) -> bytes:
+    lines = [json.dumps(dict(zip(columns, map(_plain, row))), separators=(",", ":")) for row in rows]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def encode_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([[_plain(value) for value in row] for row in rows])
+    return buffer.getvalue().encode("utf-8")
+
+
+async def iter_export(statement: Select, fmt: ExportFormat, replica: Optional[Replica] = None) -> AsyncIterator[bytes]:
+    """Encode ``statement`` one server-side-cursor partition at a time.
+
+    ``statement`` must select plain columns: rows arrive as tuples with no ORM identity map, so
+    memory is bounded by ``EXPORT_BATCH_SIZE`` rather than the result size. The generator opens
+    its own session because the response body is produced after request dependencies close.
+    """
+    columns = [column.key for column in statement.selected_columns]
+    if fmt == "csv":
+        yield encode_csv([columns])
+
+    async with session_scope(replica) as db:
+        result = await db.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        try:
+            async for partition in result.partitions():
+                yield encode_csv(partition) if fmt == "csv" else encode_ndjson(columns, partition)
+        finally:
+            await result.close()
+
+
+def export_response(
+    statement: Select, fmt: ExportFormat, filename: str, replica: Optional[Replica] = None
+) -> StreamingResponse:
+    return StreamingResponse(
+        iter_export(statement, fmt, replica),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
@@ -0,0 +1,139 @@
+import uuid
+from datetime import datetime
+from typing import Optional, Sequence
+
+from sqlalchemy import (
+    Float,
+    Integer,
+    Row,
+    String,
+    any_,
+    bindparam,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Item, ItemVersion
+
+ITEM_COLUMNS = (Item.id, Item.name, Item.owner_id, Item.created_at, Item.updated_at)
+
+
+async def insert_items(db: AsyncSession, owner_id: uuid.UUID, names: Sequence[str]) -> list[Row]:
+    """Multi-row ``INSERT … RETURNING``; rows come back in the order of ``names``."""
+    if not names:
+        return []
+    result = await db.execute(
+        insert(Item).returning(*ITEM_COLUMNS, sort_by_parameter_order=True),
+        [{"name": name, "owner_id": owner_id} for name in names],
+    )
+    return list(result)
+
+
+async def select_owned_item(db: AsyncSession, owner_id: uuid.UUID, item_id: uuid.UUID) -> Optional[Row]:
+    result = await db.execute(select(*ITEM_COLUMNS).where(Item.id == item_id, Item.owner_id == owner_id))
+    return result.first()
+
+
+async def item_collection_version(db: AsyncSession, owner_id: uuid.UUID) -> int:
+    """Version of the owner's item collection: one primary-key read of ``item_versions``.
+
+    Triggers bump it in the same transaction as every insert, update and delete, so it only
+    grows in commit order; ``0`` means the owner has never had an item.
+    """
+    version = await db.scalar(select(ItemVersion.version).where(ItemVersion.owner_id == owner_id))
+    return version or 0
+
+
+def search_criteria(q: str) -> ColumnElement[bool]:
+    """Substring (``ILIKE '%q%'``) or trigram-similar (``name % q``) match on the item name.
+
+    Both operators are answered by idx_items_name_trgm; similarity uses the server's
+    ``pg_trgm.similarity_threshold`` (0.3 unless configured otherwise).
+    """
+    return or_(Item.name.icontains(q, autoescape=True), Item.name.op("%")(q))
+
+
+def search_rank(q: str) -> ColumnElement[float]:
+    """Relevance of a match: substring hits score 1 above fuzzy ones, then by trigram similarity."""
+    return cast(Item.name.icontains(q, autoescape=True), Integer) + cast(func.similarity(Item.name, q), Float)
+
+
+def _owned(owner_id: uuid.UUID, item_id: uuid.UUID, versions: Optional[Sequence[datetime]]) -> list:
+    criteria = [Item.id == item_id, Item.owner_id == owner_id]
+    if versions is not None:
+        criteria.append(Item.updated_at.in_(versions))
+    return criteria
+
+
+async def rename_owned_item(
+    db: AsyncSession,
+    owner_id: uuid.UUID,
+    item_id: uuid.UUID,
+    name: str,
+    versions: Optional[Sequence[datetime]] = None,
+) -> Optional[Row]:
+    """Ownership-checked ``UPDATE … RETURNING``.
+
+    ``None`` when the item is missing, not owned, or (given ``versions``) no longer at one of them.
+    """
+    result = await db.execute(
+        update(Item)
+        .where(*_owned(owner_id, item_id, versions))
+        .values(name=name)
+        .returning(*ITEM_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    return result.first()
+
+
+async def delete_owned_item(
+    db: AsyncSession, owner_id: uuid.UUID, item_id: uuid.UUID, versions: Optional[Sequence[datetime]] = None
+) -> bool:
+    result = await db.execute(
+        delete(Item)
+        .where(*_owned(owner_id, item_id, versions))
+        .returning(Item.id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.first() is not None
+
+
+async def update_item_names(db: AsyncSession, owner_id: uuid.UUID, changes: Sequence[tuple[uuid.UUID, str]]) -> list[Row]:
+    """Single ``UPDATE … FROM (VALUES …)`` scoped to ``owner_id``; ids not owned are simply absent."""
+    if not changes:
+        return []
+    rows = values(column("id", UUID(as_uuid=True)), column("name", String), name="changes").data(list(changes))
+    result = await db.execute(
+        update(Item)
+        .where(Item.id == rows.c.id, Item.owner_id == owner_id)
+        .values(name=rows.c.name)
+        .returning(*ITEM_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result)
+
+
+async def delete_items(db: AsyncSession, owner_id: uuid.UUID, ids: Sequence[uuid.UUID]) -> list[uuid.UUID]:
+    """``DELETE … WHERE id = ANY(:ids) AND owner_id = :owner`` returning the ids actually removed."""
+    if not ids:
+        return []
+    result = await db.execute(
+        delete(Item)
+        .where(
+            Item.id == any_(bindparam("ids", value=list(ids), type_=ARRAY(UUID(as_uuid=True)))),
+            Item.owner_id == owner_id,
+        )
+        .returning(Item.id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars())
@@ -0,0 +1,49 @@
+import uuid
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.principal_cache import INVALIDATION_CHANNEL, Principal, principal_cache
+from app.core.revocation import token_revocations
+from app.models import User
+
+
+async def load_principal(db: AsyncSession, user_id: uuid.UUID, fresh: bool = False) -> Optional[Principal]:
+    if not fresh:
+        principal = principal_cache.get(user_id)
+        if principal is not None:
+            return principal
+
+    user = await db.get(User, user_id, populate_existing=fresh)
+    if user is None or user.purge_requested_at is not None:
+        return None
+    principal = Principal(
+        id=user.id,
+        email=user.email,
+        role=user.role,
+        created_at=user.created_at,
+        token_version=user.token_version,
+    )
+    principal_cache.put(principal)
+    return principal
+
+
+def apply_principal_change(user_id: uuid.UUID, revoke_below: Optional[int] = None) -> None:
+    """Evict the cached principal and, when given, reject tokens older than ``revoke_below``."""
+    principal_cache.invalidate(user_id)
+    if revoke_below is not None:
+        token_revocations.revoke_below(user_id, revoke_below)
+
+
+def apply_principal_change_payload(payload: str) -> None:
+    user_id, _, revoke_below = payload.partition(":")
+    apply_principal_change(uuid.UUID(user_id), int(revoke_below) if revoke_below else None)
+
+
+async def publish_principal_change(db: AsyncSession, user_id: uuid.UUID, revoke_below: Optional[int] = None) -> None:
+    """Queue a cross-worker principal change; Postgres delivers it only if ``db`` commits."""
+    if get_settings().principal_cache_notify:
+        payload = str(user_id) if revoke_below is None else f"{user_id}:{revoke_below}"
+        await db.execute(select(func.pg_notify(INVALIDATION_CHANNEL, payload)))
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import Row, case, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.session import session_scope
+from app.models import CollectionVersion, Item, User
+
+logger = logging.getLogger(__name__)
+
+USER_COLUMNS = (User.id, User.email, User.role, User.created_at, User.updated_at, User.token_version)
+
+# Users being purged in the background no longer exist as far as the API is concerned.
+ACTIVE_USER = User.purge_requested_at.is_(None)
+
+
+async def insert_user(db: AsyncSession, email: str, password_hash: str, role: str) -> Row:
+    result = await db.execute(
+        insert(User).values(email=email, password_hash=password_hash, role=role).returning(*USER_COLUMNS)
+    )
+    return result.one()
+
+
+async def select_user(db: AsyncSession, user_id: uuid.UUID) -> Optional[Row]:
+    return (await db.execute(select(*USER_COLUMNS).where(User.id == user_id, ACTIVE_USER))).first()
+
+
+async def user_collection_version(db: AsyncSession) -> int:
+    """Version of the user listing: one primary-key read of ``collection_versions``.
+
+    Triggers bump it in the same transaction as every insert, update and delete of users, so it
+    only grows in commit order; ``0`` means no user was ever written.
+    """
+    version = await db.scalar(select(CollectionVersion.version).where(CollectionVersion.name == "users"))
+    return version or 0
+
+
+def _user(user_id: uuid.UUID, versions: Optional[Sequence[datetime]]) -> list:
+    criteria = [User.id == user_id, ACTIVE_USER]
+    if versions is not None:
+        criteria.append(User.updated_at.in_(versions))
+    return criteria
+
+
+async def update_user_fields(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    *,
+    email: Optional[str] = None,
+    password_hash: Optional[str] = None,
+    role: Optional[str] = None,
+    versions: Optional[Sequence[datetime]] = None,
+) -> Optional[Row]:
+    """Apply the given fields in one ``UPDATE … RETURNING``.
+
+    ``token_version`` is bumped in the same statement when the password changes or the role
+    actually differs (SET expressions see the pre-update row). With ``versions``, only a row still
+    at one of those ``updated_at`` values is changed.
+    """
+    changes: dict[str, Any] = {}
+    if email is not None:
+        changes["email"] = email
+    if role is not None:
+        changes["role"] = role
+    if password_hash is not None:
+        changes["password_hash"] = password_hash
+        changes["token_version"] = User.token_version + 1
+    elif role is not None:
+        changes["token_version"] = User.token_version + case((User.role != role, 1), else_=0)
+    if not changes:
+        return await select_user(db, user_id)
+
+    result = await db.execute(
+        update(User)
+        .where(*_user(user_id, versions))
+        .values(**changes)
+        .returning(*USER_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    return result.first()
+
+
+async def replace_password_hash(db: AsyncSession, user_id: uuid.UUID, current_hash: str, new_hash: str) -> bool:
+    """Store a rehash of the same password.
+
+    Neither ``token_version`` nor ``updated_at`` (the ETag) moves, and the row is only changed if it
+    still holds ``current_hash``, so a concurrent password change wins.
+    """
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id, User.password_hash == current_hash)
+        .values(password_hash=new_hash, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+async def delete_user_row(db: AsyncSession, user_id: uuid.UUID, versions: Optional[Sequence[datetime]] = None) -> bool:
+    """One ``DELETE … RETURNING id``; the user's items go with it through ``ON DELETE CASCADE``."""
+    result = await db.execute(
+        delete(User).where(*_user(user_id, versions)).returning(User.id).execution_options(synchronize_session=False)
+    )
+    return result.first() is not None
+
+
+async def request_user_purge(
+    db: AsyncSession, user_id: uuid.UUID, versions: Optional[Sequence[datetime]] = None
+) -> bool:
+    """Hide the user and invalidate their tokens; :func:`purge_user` deletes the data afterwards."""
+    result = await db.execute(
+        update(User)
+        .where(*_user(user_id, versions))
+        .values(purge_requested_at=func.now(), token_version=User.token_version + 1)
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.first() is not None
+
+
+async def purge_user(user_id: uuid.UUID, batch_size: int, pause_seconds: float) -> int:
+    """Delete a purge-requested user's items ``batch_size`` rows per transaction, then the user.
+
+    Short transactions with a pause in between keep row locks and WAL volume from arriving in one
+    burst the way a single cascading ``DELETE`` would. Safe to rerun or run concurrently: batches
+    skip rows another purge has locked. Returns the number of items deleted.
+    """
+    deleted = 0
+    while True:
+        batch = (
+            select(Item.id)
+            .where(Item.owner_id == user_id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        async with session_scope() as db:
+            result = await db.execute(
+                delete(Item).where(Item.id.in_(batch)).execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            break
+        await asyncio.sleep(pause_seconds)
+
+    async with session_scope() as db:
+        # Items a concurrent batch still held are removed by the FK cascade here.
+        await db.execute(
+            delete(User)
+            .where(User.id == user_id, User.purge_requested_at.is_not(None))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+    logger.info("Purged user %s (%d items)", user_id, deleted)
+    return deleted
+
+
+_purge_tasks: set[asyncio.Task] = set()
+
+
+def _purge_finished(task: asyncio.Task) -> None:
+    _purge_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("User purge failed; rerun scripts/purge_users.py", exc_info=task.exception())
+
+
+def start_purge(user_id: uuid.UUID) -> None:
+    """Run :func:`purge_user` on this worker's event loop without holding up the response.
+
+    A purge cut short by a restart leaves the user hidden; ``scripts/purge_users.py`` finishes it.
+    """
+    settings = get_settings()
+    task = asyncio.create_task(
+        purge_user(user_id, settings.user_purge_batch_size, settings.user_purge_pause_ms / 1000)
+    )
+    _purge_tasks.add(task)
+    task.add_done_callback(_purge_finished)
+
+
+async def pending_purges(db: AsyncSession) -> list[uuid.UUID]:
+    result = await db.execute(select(User.id).where(User.purge_requested_at.is_not(None)).order_by(User.purge_requested_at))
+    return list(result.scalars())
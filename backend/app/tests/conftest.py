@@ -0,0 +1,61 @@
+from contextlib import contextmanager
+from pathlib import Path
+import sys
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.security import create_access_token, get_password_hash
+from app.db.session import SessionLocal, async_engine, engine
+from app.models import User
+
+
+@contextmanager
+def _count_statements():
+    # Request handlers run on the async engine when it exists; scripts and fixtures use the sync one.
+    target = async_engine.sync_engine if async_engine is not None else engine
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(target, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(target, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def count_statements():
+    """``with count_statements() as statements:`` collects the SQL executed inside the block."""
+    return _count_statements
+
+
+@pytest.fixture(scope="module")
+def admin():
+    password = "admin-secret"
+    with SessionLocal() as session:
+        user = User(email=f"test-admin-{uuid.uuid4().hex}@example.com", password_hash=get_password_hash(password), role="admin")
+        session.add(user)
+        session.commit()
+        admin_id, email = user.id, user.email
+    yield {
+        "id": admin_id,
+        "email": email,
+        "password": password,
+        "headers": {"Authorization": f"Bearer {create_access_token(str(admin_id), role='admin')}"},
+    }
+    with SessionLocal() as session:
+        session.query(User).filter(User.id == admin_id).delete()
+        session.commit()
+
+
+@pytest.fixture(scope="module")
+def admin_headers(admin):
+    return admin["headers"]
@@ -0,0 +1,117 @@
+import asyncio
+from pathlib import Path
+import sys
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.admission import AdaptiveLimit, AdmissionControl, AdmissionMiddleware, Overloaded, request_class
+
+
+def scope(method: str, path: str) -> dict:
+    return {"type": "http", "method": method, "path": path}
+
+
+def test_requests_are_classified_and_probes_exempt():
+    assert request_class(scope("POST", "/auth/login")) == "login"
+    assert request_class(scope("GET", "/auth/me")) == "read"
+    assert request_class(scope("DELETE", "/items/bulk")) == "write"
+    assert request_class(scope("GET", "/readyz")) is None
+    assert request_class(scope("GET", "/metrics")) is None
+
+
+def test_queue_is_bounded_and_waiters_have_deadlines():
+    async def scenario() -> None:
+        limit = AdaptiveLimit(max_limit=2, queue_size=1, queue_timeout_seconds=0.05)
+        assert limit.limit == 1
+        await limit.acquire()
+
+        waiting = asyncio.create_task(limit.acquire())
+        await asyncio.sleep(0)
+        try:
+            await limit.acquire()
+        except Overloaded as exc:
+            assert exc.reason == "queue_full"
+        else:
+            raise AssertionError("queue should be full")
+
+        try:
+            await waiting
+        except Overloaded as exc:
+            assert exc.reason == "timeout"
+        assert (limit.in_flight, limit.queued) == (1, 0)
+        assert limit.rejected == {"queue_full": 1, "timeout": 1}
+
+    asyncio.run(scenario())
+
+
+def test_released_slots_go_to_waiters_in_order():
+    async def scenario() -> None:
+        limit = AdaptiveLimit(max_limit=2, queue_size=5, queue_timeout_seconds=1.0)
+        await limit.acquire()
+        first = asyncio.create_task(limit.acquire())
+        second = asyncio.create_task(limit.acquire())
+        await asyncio.sleep(0)
+
+        limit.release(None)
+        await first
+        assert not second.done()
+        limit.release(None)
+        await second
+        assert limit.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_limit_grows_while_latency_is_steady_and_shrinks_when_it_climbs():
+    limit = AdaptiveLimit(max_limit=100, queue_size=0, queue_timeout_seconds=1.0)
+    start = limit.limit
+    for _ in range(50):
+        limit.in_flight = int(limit.limit)
+        limit.release(0.010)
+    grown = limit.limit
+    assert grown > start
+
+    for _ in range(50):
+        limit.in_flight = int(limit.limit)
+        limit.release(0.200)
+    assert limit.limit < grown
+    assert limit.limit >= limit.min_limit
+
+
+def test_overloaded_requests_get_a_fast_503():
+    async def scenario() -> None:
+        release = asyncio.Event()
+
+        async def slow(_: Request) -> PlainTextResponse:
+            await release.wait()
+            return PlainTextResponse("done")
+
+        async def ready(_: Request) -> PlainTextResponse:
+            return PlainTextResponse("ready")
+
+        control = AdmissionControl({"read": AdaptiveLimit(max_limit=1, queue_size=0, queue_timeout_seconds=1.0)})
+        app = Starlette(routes=[Route("/slow", slow), Route("/readyz", ready)])
+        transport = httpx.ASGITransport(app=AdmissionMiddleware(app, control))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            admitted = asyncio.create_task(client.get("/slow"))
+            while control.limits["read"].in_flight == 0:
+                await asyncio.sleep(0.001)
+
+            rejected = await client.get("/slow")
+            assert rejected.status_code == 503
+            assert rejected.headers["Retry-After"] == "1"
+            assert (await client.get("/readyz")).status_code == 200
+
+            release.set()
+            assert (await admitted).status_code == 200
+        assert control.limits["read"].in_flight == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,93 @@
+from pathlib import Path
+import sys
+import uuid
+
+from fastapi.testclient import TestClient
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.security import create_access_token
+from app.main import app
+from app.schemas.item import MAX_BULK_ITEMS
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def other_headers(admin_headers):
+    body = {"email": f"bulk-{uuid.uuid4().hex}@example.com", "password": "secret1"}
+    other = client.post("/users", json=body, headers=admin_headers).json()
+    yield {"Authorization": f"Bearer {create_access_token(other['id'])}"}
+    client.delete(f"/users/{other['id']}", headers=admin_headers)
+
+
+def create(headers: dict[str, str], *names: str) -> list[str]:
+    response = client.post("/items/bulk", json={"items": [{"name": name} for name in names]}, headers=headers)
+    assert response.status_code == 200, response.text
+    return [item["id"] for item in response.json()["items"]]
+
+
+def test_bulk_create_reports_invalid_elements_by_index(admin_headers):
+    response = client.post(
+        "/items/bulk",
+        json={"items": [{"name": "bulk-a"}, {"name": ""}, "not an object", {"name": "bulk-b"}]},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["name"] for item in body["items"]] == ["bulk-a", "bulk-b"]
+    assert [error["index"] for error in body["errors"]] == [1, 2]
+    assert body["errors"][0]["detail"].startswith("name:")
+
+
+def test_bulk_update_reports_missing_duplicate_and_invalid_elements(admin_headers):
+    first, second = create(admin_headers, "bulk-c", "bulk-d")
+    missing = str(uuid.uuid4())
+    response = client.patch(
+        "/items/bulk",
+        json={
+            "items": [
+                {"id": first, "name": "bulk-c2"},
+                {"id": missing, "name": "ghost"},
+                {"id": first, "name": "again"},
+                {"id": "nope", "name": "bad"},
+                {"id": second, "name": "bulk-d2"},
+            ]
+        },
+        headers=admin_headers,
+    )
+    body = response.json()
+    assert [(item["id"], item["name"]) for item in body["items"]] == [(first, "bulk-c2"), (second, "bulk-d2")]
+    assert [error["index"] for error in body["errors"]] == [1, 2, 3]
+    assert [error["detail"] for error in body["errors"][:2]] == ["Item not found", "Duplicate id in batch"]
+    assert body["errors"][2]["detail"].startswith("id:")
+
+
+def test_bulk_delete_only_touches_the_callers_items(admin_headers, other_headers):
+    (mine,) = create(admin_headers, "bulk-mine")
+    (theirs,) = create(other_headers, "bulk-theirs")
+
+    response = client.request("DELETE", "/items/bulk", json={"ids": [mine, theirs, "nope"]}, headers=admin_headers)
+    body = response.json()
+    assert body["deleted"] == [mine]
+    assert [(error["index"], error["detail"]) for error in body["errors"]] == [
+        (1, "Item not found"),
+        (2, "id: Input should be a valid UUID"),
+    ]
+    assert client.get(f"/items/{theirs}", headers=other_headers).status_code == 200
+    assert client.get(f"/items/{mine}", headers=admin_headers).status_code == 404
+
+
+def test_bulk_update_cannot_rename_another_owners_item(admin_headers, other_headers):
+    (theirs,) = create(other_headers, "bulk-private")
+    body = client.patch("/items/bulk", json={"items": [{"id": theirs, "name": "taken"}]}, headers=admin_headers).json()
+    assert body["items"] == [] and body["errors"][0]["detail"] == "Item not found"
+    assert client.get(f"/items/{theirs}", headers=other_headers).json()["name"] == "bulk-private"
+
+
+def test_batches_over_the_limit_are_rejected(admin_headers):
+    response = client.post("/items/bulk", json={"items": [{"name": "x"}] * (MAX_BULK_ITEMS + 1)}, headers=admin_headers)
+    assert response.status_code == 422
@@ -0,0 +1,158 @@
+import asyncio
+from pathlib import Path
+import sys
+from typing import Optional
+import zlib
+
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, GzipEncoder, negotiate
+
+
+def run(
+    response: Response,
+    accept_encoding: str = "gzip",
+    minimum_size: int = 100,
+    request_headers: Optional[dict[str, str]] = None,
+    offload_size: int = compression.OFFLOAD_SIZE,
+) -> list[dict]:
+    """Send one GET through the middleware and return the raw ASGI messages it emits."""
+    middleware = CompressionMiddleware(
+        response,
+        minimum_size=minimum_size,
+        content_types=["application/json", "application/x-ndjson"],
+        levels={"gzip": 5},
+        encoders={"gzip": GzipEncoder},
+        offload_size=offload_size,
+    )
+    raw = [(b"accept-encoding", accept_encoding.encode())]
+    raw += [(name.lower().encode(), value.encode()) for name, value in (request_headers or {}).items()]
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": raw}
+    messages: list[dict] = []
+
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive() -> dict:
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()  # the client stays connected
+        raise AssertionError("unreachable")
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    return messages
+
+
+def headers(start: dict) -> dict[str, str]:
+    return {key.decode(): value.decode() for key, value in start["headers"]}
+
+
+def test_negotiation_honours_q_values_and_server_order():
+    assert negotiate("gzip, br", ["zstd", "br", "gzip"]) == "br"
+    assert negotiate("gzip;q=1.0, br;q=0.5", ["br", "gzip"]) == "gzip"
+    assert negotiate("br;q=0, *", ["br", "gzip"]) == "gzip"
+    assert negotiate("identity", ["gzip"]) is None
+    assert negotiate("", ["gzip"]) is None
+
+
+def test_large_allowlisted_bodies_are_compressed():
+    body = b'{"items": [' + b'{"name": "item"},' * 200 + b"{}]}"
+    start, message = run(Response(body, media_type="application/json"))
+
+    assert headers(start)["content-encoding"] == "gzip"
+    assert headers(start)["vary"] == "Accept-Encoding"
+    assert int(headers(start)["content-length"]) == len(message["body"]) < len(body)
+    assert zlib.decompress(message["body"], 16 + zlib.MAX_WBITS) == body
+
+
+def test_small_unlisted_or_unwanted_bodies_pass_through():
+    small = run(Response(b'{"ok": true}', media_type="application/json"))
+    assert "content-encoding" not in headers(small[0])
+    assert headers(small[0])["vary"] == "Accept-Encoding"
+    assert small[1]["body"] == b'{"ok": true}'
+
+    text = run(PlainTextResponse("x" * 1000))
+    assert "content-encoding" not in headers(text[0])
+
+    identity = run(Response(b"{}" * 1000, media_type="application/json"), accept_encoding="identity")
+    assert "content-encoding" not in headers(identity[0])
+
+
+def test_streams_are_compressed_chunk_by_chunk():
+    rows = [b'{"id": %d}\n' % n for n in range(5)]
+
+    async def produce():
+        for row in rows:
+            yield row
+
+    start, *bodies = run(StreamingResponse(produce(), media_type="application/x-ndjson"))
+
+    assert headers(start)["content-encoding"] == "gzip"
+    assert "content-length" not in headers(start)
+    # Every row is flushed as its own chunk, then the stream is finished.
+    assert [message["more_body"] for message in bodies] == [True] * len(rows) + [False]
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for row, message in zip(rows, bodies):
+        assert decompressor.decompress(message["body"]) == row
+    assert decompressor.decompress(bodies[-1]["body"]) + decompressor.flush() == b""
+
+
+BODY = b'{"items": [' + b'{"name": "item"},' * 200 + b"{}]}"
+
+
+def test_compressed_bodies_get_a_per_coding_etag():
+    start, _ = run(Response(BODY, media_type="application/json", headers={"ETag": '"abc"'}))
+    assert headers(start)["etag"] == '"abc-gzip"'
+
+    weak = run(Response(BODY, media_type="application/json", headers={"ETag": 'W/"abc"'}))
+    assert headers(weak[0])["etag"] == 'W/"abc"'
+
+    small = run(Response(b"{}", media_type="application/json", headers={"ETag": '"abc"'}))
+    assert headers(small[0])["etag"] == '"abc"'
+
+
+def test_conditional_headers_reach_the_app_without_the_suffix():
+    seen: dict[str, str] = {}
+
+    async def app(scope, receive, send):
+        request = Headers(scope=scope)
+        seen.update(request)
+        status = 304 if request.get("if-none-match") == '"abc"' else 200
+        await Response(BODY if status == 200 else b"", status, {"ETag": '"abc"'}, "application/json")(scope, receive, send)
+
+    start, _ = run(app, request_headers={"If-None-Match": '"old-gzip", "abc-gzip"', "If-Match": '"abc-gzip"'})
+    assert seen["if-match"] == '"abc"'
+    assert seen["if-none-match"] == '"old", "abc"'
+    assert start["status"] == 200
+
+    start, _ = run(app, request_headers={"If-None-Match": '"abc-gzip"'})
+    assert start["status"] == 304
+    assert headers(start)["etag"] == '"abc-gzip"'
+
+    start, _ = run(app, request_headers={"If-None-Match": '"abc"'}, accept_encoding="identity")
+    assert start["status"] == 304
+    assert headers(start)["etag"] == '"abc"'
+
+
+def test_large_bodies_are_compressed_off_the_event_loop(monkeypatch):
+    offloaded: list[int] = []
+
+    async def in_threadpool(fn):
+        offloaded.append(len(BODY))
+        return fn()
+
+    monkeypatch.setattr(compression, "run_in_threadpool", in_threadpool)
+    start, message = run(Response(BODY, media_type="application/json"), offload_size=len(BODY))
+    assert offloaded == [len(BODY)]
+    assert zlib.decompress(message["body"], 16 + zlib.MAX_WBITS) == BODY
+
+    run(Response(BODY, media_type="application/json"), offload_size=len(BODY) + 1)
+    assert offloaded == [len(BODY)]
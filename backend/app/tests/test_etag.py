@@ -0,0 +1,102 @@
+from pathlib import Path
+import sys
+import uuid
+
+from fastapi.testclient import TestClient
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.security import create_access_token
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def owner_headers(admin_headers):
+    body = {"email": f"etag-{uuid.uuid4().hex}@example.com", "password": "secret1"}
+    owner = client.post("/users", json=body, headers=admin_headers).json()
+    yield {"Authorization": f"Bearer {create_access_token(owner['id'])}"}
+    client.delete(f"/users/{owner['id']}", headers=admin_headers)
+
+
+def listing_etag(headers: dict[str, str]) -> str:
+    response = client.get("/items", headers=headers)
+    assert response.status_code == 200
+    return response.headers["ETag"]
+
+
+def test_matching_if_none_match_gets_304(owner_headers):
+    client.post("/items", json={"name": "cached"}, headers=owner_headers)
+    etag = listing_etag(owner_headers)
+
+    response = client.get("/items", headers={**owner_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    assert client.get("/items", headers={**owner_headers, "If-None-Match": f"W/{etag}"}).status_code == 304
+
+
+def test_every_kind_of_write_changes_the_listing_etag(owner_headers):
+    empty = listing_etag(owner_headers)
+    item = client.post("/items", json={"name": "first"}, headers=owner_headers).json()
+    created = listing_etag(owner_headers)
+
+    assert client.patch(f"/items/{item['id']}", json={"name": "second"}, headers=owner_headers).status_code == 200
+    renamed = listing_etag(owner_headers)
+
+    assert client.delete(f"/items/{item['id']}", headers=owner_headers).status_code == 204
+    deleted = listing_etag(owner_headers)
+
+    assert len({empty, created, renamed, deleted}) == 4
+    assert client.get("/items", headers={**owner_headers, "If-None-Match": renamed}).status_code == 200
+
+
+def test_writes_by_another_owner_leave_the_etag_alone(owner_headers, admin_headers):
+    client.post("/items", json={"name": "mine"}, headers=owner_headers)
+    etag = listing_etag(owner_headers)
+    client.post("/items", json={"name": "theirs"}, headers=admin_headers)
+    assert client.get("/items", headers={**owner_headers, "If-None-Match": etag}).status_code == 304
+
+
+def test_stale_if_match_gets_412(owner_headers):
+    item = client.post("/items", json={"name": "v1"}, headers=owner_headers).json()
+    stale = client.get(f"/items/{item['id']}", headers=owner_headers).headers["ETag"]
+
+    response = client.patch(f"/items/{item['id']}", json={"name": "v2"}, headers={**owner_headers, "If-Match": stale})
+    assert response.status_code == 200
+    current = response.headers["ETag"]
+    assert current != stale
+
+    stale_headers = {**owner_headers, "If-Match": stale}
+    assert client.patch(f"/items/{item['id']}", json={"name": "v3"}, headers=stale_headers).status_code == 412
+    assert client.delete(f"/items/{item['id']}", headers=stale_headers).status_code == 412
+    assert client.get(f"/items/{item['id']}", headers=owner_headers).json()["name"] == "v2"
+
+    assert client.delete(f"/items/{item['id']}", headers={**owner_headers, "If-Match": current}).status_code == 204
+    assert client.delete(f"/items/{item['id']}", headers={**owner_headers, "If-Match": current}).status_code == 404
+
+
+def test_every_kind_of_write_changes_the_user_listing_etag(admin_headers):
+    def users_etag() -> str:
+        response = client.get("/users", headers=admin_headers)
+        assert response.status_code == 200
+        return response.headers["ETag"]
+
+    before = users_etag()
+    body = {"email": f"etag-{uuid.uuid4().hex}@example.com", "password": "secret1"}
+    user = client.post("/users", json=body, headers=admin_headers).json()
+    created = users_etag()
+
+    assert client.patch(f"/users/{user['id']}", json={"role": "admin"}, headers=admin_headers).status_code == 200
+    promoted = users_etag()
+
+    assert client.delete(f"/users/{user['id']}", headers=admin_headers).status_code == 204
+    deleted = users_etag()
+
+    assert len({before, created, promoted, deleted}) == 4
+    assert client.get("/users", headers={**admin_headers, "If-None-Match": deleted}).status_code == 304
+    assert client.get("/users", headers={**admin_headers, "If-None-Match": promoted}).status_code == 200
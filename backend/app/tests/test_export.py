@@ -0,0 +1,79 @@
+import asyncio
+import json
+from pathlib import Path
+import sys
+import tracemalloc
+import uuid
+
+import pytest
+from sqlalchemy import delete, insert, select
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.session import SessionLocal
+from app.models import Item, User
+from app.services.export import EXPORT_BATCH_SIZE, iter_export
+from app.services.items import ITEM_COLUMNS
+
+SMALL = EXPORT_BATCH_SIZE
+LARGE = EXPORT_BATCH_SIZE * 20
+
+
+@pytest.fixture(scope="module")
+def owners():
+    owner_ids = {}
+    with SessionLocal() as session:
+        for count in (SMALL, LARGE):
+            owner = User(email=f"export-{uuid.uuid4().hex}@example.com", password_hash="!")
+            session.add(owner)
+            session.flush()
+            session.execute(insert(Item), [{"name": f"export-{n}", "owner_id": owner.id} for n in range(count)])
+            owner_ids[count] = owner.id
+        session.commit()
+    yield owner_ids
+    with SessionLocal() as session:
+        session.execute(delete(Item).where(Item.owner_id.in_(owner_ids.values())))
+        session.execute(delete(User).where(User.id.in_(owner_ids.values())))
+        session.commit()
+
+
+def measure_export(owner_id: uuid.UUID, fmt: str) -> tuple[int, bytes, int]:
+    """Drain the export generator; return (row lines, first line, traced peak bytes)."""
+
+    async def drain() -> tuple[int, bytes]:
+        lines, first = 0, b""
+        query = select(*ITEM_COLUMNS).where(Item.owner_id == owner_id).order_by(Item.created_at.desc(), Item.id.asc())
+        async for chunk in iter_export(query, fmt):
+            first = first or chunk.split(b"\n", 1)[0]
+            lines += chunk.count(b"\n")
+        return lines, first
+
+    tracemalloc.start()
+    try:
+        lines, first = asyncio.run(drain())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return lines, first, peak
+
+
+def test_export_formats(owners):
+    lines, first, _ = measure_export(owners[SMALL], "ndjson")
+    assert lines == SMALL
+    assert set(json.loads(first)) == {"id", "name", "owner_id", "created_at", "updated_at"}
+
+    lines, first, _ = measure_export(owners[SMALL], "csv")
+    assert lines == SMALL + 1
+    assert first.strip() == b"id,name,owner_id,created_at,updated_at"
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_export_peak_memory_is_flat(owners, fmt):
+    measure_export(owners[SMALL], fmt)  # warm statement caches and the connection pool
+    _, _, small_peak = measure_export(owners[SMALL], fmt)
+    lines, _, large_peak = measure_export(owners[LARGE], fmt)
+    assert lines >= LARGE
+    # Twenty times the rows must not cost meaningfully more than a single batch.
+    assert large_peak < small_peak * 2, (small_peak, large_peak)
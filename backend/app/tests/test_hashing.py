@@ -0,0 +1,52 @@
+import asyncio
+from pathlib import Path
+import sys
+import time
+
+from fastapi.testclient import TestClient
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.config import Settings
+from app.core.hashing import HashingQueueFull, PasswordHashPool
+from app.core.security import password_hash_pool
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_jobs_beyond_workers_plus_queue_are_rejected_at_once():
+    async def scenario() -> None:
+        pool = PasswordHashPool(workers=1, queue_size=1)
+        try:
+            running = [asyncio.create_task(pool.run(time.sleep, 0.5)) for _ in range(2)]
+            await asyncio.sleep(0)
+            assert pool.in_flight == 2
+
+            started = time.perf_counter()
+            with pytest.raises(HashingQueueFull):
+                await pool.run(time.sleep, 0.5)
+            assert time.perf_counter() - started < 0.1
+            assert pool.rejected == 1
+
+            await asyncio.gather(*running)
+            assert pool.in_flight == 0
+        finally:
+            pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_answers_login_with_503_and_retry_after(admin, monkeypatch):
+    monkeypatch.setattr(password_hash_pool, "in_flight", password_hash_pool.capacity)
+    response = client.post("/auth/login", json={"email": admin["email"], "password": admin["password"]})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_pool_needs_at_least_one_worker():
+    with pytest.raises(ValueError):
+        Settings(DATABASE_URL="postgresql+psycopg://localhost/app", JWT_SECRET="x", PASSWORD_HASH_WORKERS=0)
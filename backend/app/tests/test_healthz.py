@@ -1,12 +1,16 @@
+import asyncio
 from pathlib import Path
 import sys
+import time
 
 from fastapi.testclient import TestClient
+import pytest
 
 ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from app.db.health import database_health
 from app.main import app
 
 
@@ -17,3 +21,70 @@ def test_healthz():
     response = client.get("/healthz")
     assert response.status_code == 200
     assert response.json()["status"] == "ok"
+
+
+@pytest.fixture(autouse=True)
+def probe_state(monkeypatch):
+    # The lifespan prober is not running under a bare TestClient; tests drive probe() themselves.
+    for name in ("last_success", "last_probe", "last_latency", "last_error", "consecutive_failures"):
+        monkeypatch.setattr(database_health, name, getattr(database_health, name))
+    monkeypatch.setattr(database_health, "failure_threshold", 2)
+    monkeypatch.setattr(database_health, "timeout_seconds", 0.1)
+
+
+def database_is(monkeypatch, up: bool) -> None:
+    async def select_one() -> None:
+        if not up:
+            raise ConnectionRefusedError("connection refused")
+
+    monkeypatch.setattr(database_health, "_select_one", select_one)
+
+
+def test_readyz_follows_the_background_probe(monkeypatch):
+    database_is(monkeypatch, up=True)
+    assert asyncio.run(database_health.probe())
+    assert client.get("/readyz").status_code == 200
+
+    database_is(monkeypatch, up=False)
+    assert not asyncio.run(database_health.probe())
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    body = response.json()
+    assert body["status"] == "unavailable"
+    assert body["database"]["consecutive_failures"] == 1
+    assert body["database"]["last_error"] == "ConnectionRefusedError: connection refused"
+
+
+def test_hung_probe_times_out_and_counts_as_a_failure(monkeypatch):
+    async def select_one() -> None:
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(database_health, "_select_one", select_one)
+    started = time.perf_counter()
+    assert not asyncio.run(database_health.probe())
+    assert time.perf_counter() - started < 1
+    assert database_health.last_error == "TimeoutError"
+
+
+def test_open_circuit_fails_database_requests_fast(monkeypatch, admin_headers, count_statements):
+    database_is(monkeypatch, up=False)
+    asyncio.run(database_health.probe())
+    assert not database_health.circuit_open
+    asyncio.run(database_health.probe())
+    assert database_health.circuit_open
+
+    with count_statements() as statements:
+        started = time.perf_counter()
+        response = client.get("/items", headers=admin_headers)
+        elapsed = time.perf_counter() - started
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(int(database_health.interval_seconds))
+    assert elapsed < 0.5
+    assert statements == []
+    # Liveness never depends on the database.
+    assert client.get("/livez").status_code == 200
+
+    database_is(monkeypatch, up=True)
+    asyncio.run(database_health.probe())
+    assert not database_health.circuit_open
+    assert client.get("/items", headers=admin_headers).status_code == 200
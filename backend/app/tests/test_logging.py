@@ -0,0 +1,106 @@
+import asyncio
+import io
+import json
+import logging
+from pathlib import Path
+import sys
+
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.logging import AccessLogMiddleware, DroppingQueueHandler, LogPipeline, access_logger
+
+
+class Collect(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def make_record(msg: object, *args: object) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+
+
+def test_full_queue_drops_and_counts_instead_of_blocking():
+    handler = DroppingQueueHandler(maxsize=2)
+    for n in range(5):
+        handler.handle(make_record("record %d", n))
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+    assert handler.queue.get_nowait().msg == "record 0"
+
+
+def test_listener_writes_on_its_own_thread():
+    pipeline = LogPipeline(logging.INFO, queue_size=100)
+    collect = Collect()
+    pipeline.output = collect
+    pipeline.start()
+    try:
+        mutable = ["before"]
+        pipeline.handler.handle(make_record("value %s", mutable))
+        mutable[0] = "after"
+    finally:
+        pipeline.stop()
+    assert [record.getMessage() for record in collect.records] == ["value ['before']"]
+    assert pipeline.queued == 0
+
+
+def test_dict_messages_keep_their_fields():
+    pipeline = LogPipeline(logging.INFO, queue_size=100)
+    stream = io.StringIO()
+    pipeline.output.setStream(stream)
+    pipeline.start()
+    try:
+        pipeline.handler.handle(make_record({"event": "purge", "items": 3}))
+    finally:
+        pipeline.stop()
+    line = json.loads(stream.getvalue())
+    assert (line["event"], line["items"]) == ("purge", 3)
+
+
+def sampled_app(rng_value: float, delay: float = 0.0) -> TestClient:
+    async def ok(_: Request) -> PlainTextResponse:
+        await asyncio.sleep(delay)
+        return PlainTextResponse("ok")
+
+    async def broken(_: Request) -> PlainTextResponse:
+        return PlainTextResponse("no", status_code=503)
+
+    app = Starlette(routes=[Route("/ok", ok), Route("/broken", broken)])
+    return TestClient(AccessLogMiddleware(app, sample_rate=0.25, slow_seconds=0.05, rng=lambda: rng_value))
+
+
+def access_records(client: TestClient, path: str) -> list[logging.LogRecord]:
+    collect = Collect()
+    access_logger.addHandler(collect)
+    level = access_logger.level
+    access_logger.setLevel(logging.INFO)
+    try:
+        client.get(path)
+    finally:
+        access_logger.removeHandler(collect)
+        access_logger.setLevel(level)
+    return collect.records
+
+
+def test_ordinary_requests_are_sampled():
+    assert access_records(sampled_app(rng_value=0.9), "/ok") == []
+    [record] = access_records(sampled_app(rng_value=0.1), "/ok")
+    assert (record.method, record.path, record.status, record.sampled) == ("GET", "/ok", 200, True)
+
+
+def test_errors_and_slow_requests_are_always_logged():
+    [error] = access_records(sampled_app(rng_value=0.9), "/broken")
+    assert (error.status, error.sampled) == (503, False)
+    [slow] = access_records(sampled_app(rng_value=0.9, delay=0.06), "/ok")
+    assert slow.duration_ms >= 50 and not slow.sampled
@@ -0,0 +1,77 @@
+import asyncio
+from pathlib import Path
+import sys
+
+from fastapi.testclient import TestClient
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.config import get_settings
+from app.db.session import Databases, databases
+from app.main import app
+
+client = TestClient(app)
+
+
+async def from_loopback(scope, receive, send):
+    await app({**scope, "client": ("127.0.0.1", 40000)}, receive, send)
+
+
+local_client = TestClient(from_loopback)
+
+
+def scrape() -> str:
+    response = local_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return response.text
+
+
+def test_metrics_report_requests_statements_and_pools(admin_headers):
+    assert client.get("/items", headers=admin_headers).status_code == 200
+    text = scrape()
+
+    assert 'http_requests_total{method="GET",route="/items",status="200"}' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/items",le="+Inf"}' in text
+    assert 'http_request_db_queries_count{route="/items"}' in text
+    assert "# TYPE db_query_duration_seconds histogram" in text
+    # Pool checkouts are labelled with the engine that served them, like the pool gauges.
+    engines = {line.split('"')[1] for line in text.splitlines() if line.startswith("db_pool_size{")}
+    waits = {line.split('"')[1] for line in text.splitlines() if line.startswith("db_pool_checkout_wait_seconds_count{")}
+    assert waits and waits <= engines
+    for name in ("principal_cache_hits_total", "token_cache_entries", "password_hash_in_flight", "db_up"):
+        assert f"\n{name} " in text
+
+
+def test_metrics_are_refused_to_remote_clients_without_a_token():
+    assert client.get("/metrics").status_code == 403
+
+
+def test_metrics_token_is_required_when_set(monkeypatch):
+    monkeypatch.setattr(get_settings(), "metrics_token", "scrape-secret")
+    assert local_client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+
+
+def test_pool_labels_name_the_engine_and_survive_dispose():
+    engine = databases().engine
+    assert engine.pool.metrics_label == "sync"
+    engine.dispose()
+    assert engine.pool.metrics_label == "sync"
+    for replica in databases().replicas:
+        assert replica.engine.pool.metrics_label == replica.name
+
+
+
+def test_closed_engines_leave_the_pool_gauges():
+    def sizes() -> list[str]:
+        return [line for line in scrape().splitlines() if line.startswith("db_pool_size{")]
+
+    before = sizes()
+    replaced = Databases(get_settings())
+    assert len(sizes()) > len(before)
+    asyncio.run(replaced.close())
+    assert sizes() == before
@@ -0,0 +1,100 @@
+import os
+from pathlib import Path
+import sys
+import uuid
+
+import psycopg
+from psycopg import sql
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+from migrate import (
+    Migration,
+    applied_checksums,
+    apply_migration,
+    concurrent_index_name,
+    ensure_table,
+    load_migrations,
+    normalize_dsn,
+    read_directives,
+    split_statements,
+)
+
+
+@pytest.fixture
+def scratch():
+    """Autocommit cursor whose search_path is a throwaway schema."""
+    schema = f"migrate_{uuid.uuid4().hex[:12]}"
+    with psycopg.connect(normalize_dsn(os.environ["DATABASE_URL"]), autocommit=True) as conn, conn.cursor() as cur:
+        cur.execute(sql.SQL("CREATE SCHEMA {}").format(sql.Identifier(schema)))
+        cur.execute(sql.SQL("SET search_path TO {}").format(sql.Identifier(schema)))
+        try:
+            yield conn, cur
+        finally:
+            cur.execute(sql.SQL("DROP SCHEMA {} CASCADE").format(sql.Identifier(schema)))
+
+
+def test_split_keeps_quoted_and_dollar_quoted_semicolons():
+    script = """
+    -- header; with a semicolon
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx ON t (x);
+    DO $$ BEGIN PERFORM 1; END $$;
+    INSERT INTO t VALUES ('a;''b', $body$x;y$body$); /* trailing; comment */
+    -- done;
+    """
+    assert [statement.splitlines()[-1].strip() for statement in split_statements(script)] == [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx ON t (x)",
+        "DO $$ BEGIN PERFORM 1; END $$",
+        "INSERT INTO t VALUES ('a;''b', $body$x;y$body$)",
+    ]
+
+
+def test_directives_are_read_from_the_header_only():
+    assert read_directives("-- Build without blocking writes\n-- migrate: no-transaction\nSELECT 1;") == {
+        "no-transaction"
+    }
+    assert read_directives("SELECT 1;\n-- migrate: no-transaction\n") == set()
+
+
+def test_shipped_migrations_parse():
+    migrations = load_migrations()
+    assert [m.name for m in migrations] == sorted(m.name for m in migrations)
+    assert all(split_statements(m.sql) for m in migrations)
+    assert len({m.checksum for m in migrations}) == len(migrations)
+
+
+def test_concurrent_index_names_are_found_after_comments():
+    assert concurrent_index_name("-- why\nCREATE INDEX CONCURRENTLY IF NOT EXISTS Idx_A ON t (x)") == "idx_a"
+    assert concurrent_index_name('create unique index concurrently "Mixed""Case" on t (x)') == 'Mixed"Case'
+    assert concurrent_index_name("CREATE INDEX idx_b ON t (x)") is None
+    assert concurrent_index_name("DROP INDEX CONCURRENTLY IF EXISTS idx_c") is None
+
+
+def test_tables_without_a_checksum_column_read_as_unrecorded(scratch):
+    _, cur = scratch
+    # The layout written by the runner before checksums were added.
+    cur.execute("CREATE TABLE _schema_migrations (id SERIAL PRIMARY KEY, filename TEXT UNIQUE NOT NULL)")
+    cur.execute("INSERT INTO _schema_migrations (filename) VALUES ('0001_init.sql')")
+    assert applied_checksums(cur) == {"0001_init.sql": None}
+
+
+def test_invalid_index_from_a_failed_concurrent_build_is_rebuilt(scratch):
+    conn, cur = scratch
+    cur.execute("CREATE TABLE t (x INTEGER)")
+    cur.execute("INSERT INTO t VALUES (1), (1)")
+    statement = "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_t_x ON t (x)"
+    with pytest.raises(psycopg.errors.UniqueViolation):
+        cur.execute(statement)
+    cur.execute("DELETE FROM t WHERE ctid = (SELECT max(ctid) FROM t)")
+
+    ensure_table(cur)
+    migration = Migration(Path("0002_unique_x.sql"), f"-- migrate: no-transaction\n{statement};", "x", False)
+    apply_migration(conn, migration, "5s")
+
+    cur.execute("SELECT indisvalid FROM pg_index WHERE indexrelid = 'idx_t_x'::regclass")
+    assert cur.fetchone() == (True,)
+    with pytest.raises(psycopg.errors.UniqueViolation):
+        cur.execute("INSERT INTO t VALUES (1)")
@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import Item
+
+client = TestClient(app)
+
+TIED_AT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def items(admin):
+    # Seven rows share one created_at, so pages must break ties on id to neither skip nor repeat.
+    rows = [{"name": f"tied-{n}", "owner_id": admin["id"], "created_at": TIED_AT} for n in range(7)]
+    rows += [
+        {"name": f"page-{n}", "owner_id": admin["id"], "created_at": datetime(2026, 2, 1 + n, tzinfo=timezone.utc)}
+        for n in range(5)
+    ]
+    with SessionLocal() as session:
+        session.execute(insert(Item), rows)
+        session.commit()
+
+
+def test_walking_every_page_returns_each_item_once_in_order(admin_headers):
+    everything = client.get("/items", params={"limit": 200}, headers=admin_headers).json()["items"]
+    assert len(everything) >= 12
+
+    seen: list[dict] = []
+    after = None
+    pages = 0
+    while True:
+        response = client.get("/items", params={"limit": 3, **({"after": after} if after else {})}, headers=admin_headers)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page["items"]) <= 3
+        seen.extend(page["items"])
+        pages += 1
+        after = page["next_cursor"]
+        if after is None:
+            break
+
+    assert [item["id"] for item in seen] == [item["id"] for item in everything]
+    assert len({item["id"] for item in seen}) == len(seen)
+    assert pages == -(-len(everything) // 3)
+    tied = [item["id"] for item in seen if item["name"].startswith("tied-")]
+    assert tied == sorted(tied, key=uuid.UUID)
+
+
+def test_malformed_cursor_is_rejected(admin_headers):
+    assert client.get("/items", params={"after": "not-a-cursor"}, headers=admin_headers).status_code == 400
@@ -0,0 +1,64 @@
+from pathlib import Path
+import sys
+import uuid
+
+from fastapi.testclient import TestClient
+from passlib.hash import bcrypt
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.config import get_settings
+from app.core.security import build_password_context, password_context
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import User
+
+client = TestClient(app)
+
+
+def context(**changes):
+    return build_password_context(get_settings().model_copy(update=changes))
+
+
+def test_hashes_at_another_cost_verify_and_are_upgraded():
+    current = context(password_bcrypt_rounds=4)
+    for rounds in (5, 4):
+        verified, new_hash = current.verify_and_update("secret", bcrypt.using(rounds=rounds).hash("secret"))
+        assert verified
+        assert (new_hash is None) == (rounds == 4)
+        if new_hash:
+            assert bcrypt.from_string(new_hash).rounds == 4
+    assert current.verify_and_update("wrong", bcrypt.using(rounds=5).hash("secret")) == (False, None)
+
+
+def test_switching_scheme_upgrades_old_hashes():
+    pytest.importorskip("argon2")
+    current = context(password_hash_scheme="argon2", password_argon2_time_cost=1, password_argon2_memory_kib=64)
+    verified, new_hash = current.verify_and_update("secret", bcrypt.using(rounds=4).hash("secret"))
+    assert verified
+    assert new_hash.startswith("$argon2")
+    assert current.verify_and_update("secret", new_hash) == (True, None)
+
+
+def test_login_rehashes_outdated_hashes_without_revoking_tokens():
+    email = f"rehash-{uuid.uuid4().hex}@example.com"
+    outdated = bcrypt.using(rounds=4).hash("secret1")
+    with SessionLocal() as session:
+        user = User(email=email, password_hash=outdated)
+        session.add(user)
+        session.commit()
+        user_id, updated_at = user.id, user.updated_at
+    try:
+        assert client.post("/auth/login", json={"email": email, "password": "secret1"}).status_code == 200
+        with SessionLocal() as session:
+            user = session.get(User, user_id)
+            assert user.password_hash != outdated
+            assert not password_context().needs_update(user.password_hash)
+            assert (user.token_version, user.updated_at) == (0, updated_at)
+    finally:
+        with SessionLocal() as session:
+            session.query(User).filter(User.id == user_id).delete()
+            session.commit()
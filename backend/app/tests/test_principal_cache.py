@@ -0,0 +1,83 @@
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+import uuid
+
+from fastapi.testclient import TestClient
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.config import Settings, get_settings
+from app.core.principal_cache import Principal, listen_for_principal_changes, principal_cache
+from app.core.security import create_access_token
+from app.db.session import SessionLocal, ThreadedSession, libpq_dsn
+from app.main import app
+from app.services.principals import apply_principal_change_payload, publish_principal_change
+
+client = TestClient(app)
+
+
+def test_updates_and_deletes_evict_the_cached_principal(admin_headers):
+    body = {"email": f"cached-{uuid.uuid4().hex}@example.com", "password": "secret1"}
+    user = client.post("/users", json=body, headers=admin_headers).json()
+    user_id = uuid.UUID(user["id"])
+    headers = {"Authorization": f"Bearer {create_access_token(user['id'])}"}
+
+    assert client.get("/auth/me", headers=headers).json()["email"] == body["email"]
+    assert principal_cache.get(user_id) is not None
+
+    new_email = f"renamed-{uuid.uuid4().hex}@example.com"
+    assert client.patch(f"/users/{user_id}", json={"email": new_email}, headers=admin_headers).status_code == 200
+    assert principal_cache.get(user_id) is None
+    assert client.get("/auth/me", headers=headers).json()["email"] == new_email
+
+    assert client.delete(f"/users/{user_id}", headers=admin_headers).status_code == 204
+    assert principal_cache.get(user_id) is None
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+
+def test_notify_evicts_the_principal_in_other_workers(monkeypatch):
+    monkeypatch.setattr(get_settings(), "principal_cache_notify", True)
+    user_id = uuid.uuid4()
+    principal = Principal(id=user_id, email="elsewhere@example.com", role="user", created_at=datetime.now(timezone.utc))
+
+    async def scenario() -> None:
+        connected = asyncio.Event()
+        listener = asyncio.create_task(
+            listen_for_principal_changes(libpq_dsn, apply_principal_change_payload, connected.set)
+        )
+        try:
+            await asyncio.wait_for(connected.wait(), timeout=5)
+            principal_cache.put(principal)
+
+            # Another worker's write: the change is published in its transaction and delivered on commit.
+            session = ThreadedSession(SessionLocal())
+            try:
+                await publish_principal_change(session, user_id)
+                await session.commit()
+            finally:
+                await session.close()
+
+            for _ in range(100):
+                if principal_cache.get(user_id) is None:
+                    return
+                await asyncio.sleep(0.05)
+            raise AssertionError("principal was not evicted by NOTIFY")
+        finally:
+            listener.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await listener
+
+    asyncio.run(scenario())
+
+
+def test_cache_sizes_are_bounded():
+    base = {"DATABASE_URL": "postgresql+psycopg://localhost/app", "JWT_SECRET": "x"}
+    with pytest.raises(ValueError):
+        Settings(**base, PRINCIPAL_CACHE_MAX_ENTRIES=-1)
+    with pytest.raises(ValueError):
+        Settings(**base, PRINCIPAL_CACHE_TTL_SECONDS=-1)
@@ -0,0 +1,104 @@
+"""Upper bounds on SQL statements per endpoint.
+
+A budget failing usually means an N+1 (a query per listed row), a lazy load, or an extra
+refresh/select round-trip after a write. Raise a budget only together with the change that
+genuinely needs the extra statement.
+"""
+
+from pathlib import Path
+import sys
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import Item, User
+
+SEEDED_ITEMS = 25
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seeded_items(admin):
+    # Enough rows that a per-row query would blow every list budget.
+    with SessionLocal() as session:
+        session.execute(insert(Item), [{"name": f"budget-{n}", "owner_id": admin["id"]} for n in range(SEEDED_ITEMS)])
+        session.commit()
+    yield
+    with SessionLocal() as session:
+        session.execute(delete(Item).where(Item.owner_id == admin["id"]))
+        session.commit()
+
+
+def _new_item(headers: dict[str, str]) -> str:
+    return client.post("/items", json={"name": "budget"}, headers=headers).json()["id"]
+
+
+@pytest.fixture
+def new_email():
+    """Fresh addresses for the users a budget creates; those users are deleted afterwards."""
+    emails: list[str] = []
+
+    def make() -> str:
+        emails.append(f"budget-{uuid.uuid4().hex}@example.com")
+        return emails[-1]
+
+    yield make
+    with SessionLocal() as session:
+        session.execute(delete(User).where(User.email.in_(emails)))
+        session.commit()
+
+
+def _new_user(headers: dict[str, str], email: str) -> str:
+    return client.post("/users", json={"email": email, "password": "secret1"}, headers=headers).json()["id"]
+
+
+# (method, path, body, max statements). "{item}" / "{user}" are replaced by a freshly created
+# row before counting starts; callable bodies receive those ids and an unused "email".
+BUDGETS = [
+    ("POST", "/auth/login", lambda admin, ids: {"email": admin["email"], "password": admin["password"]}, 1),
+    ("GET", "/auth/me", None, 1),
+    ("GET", "/healthz", None, 1),
+    ("GET", "/items", None, 2),
+    ("GET", "/items?q=budget", None, 2),
+    ("GET", "/items/export", None, 1),
+    ("GET", "/items/{item}", None, 1),
+    ("POST", "/items", {"name": "budget"}, 1),
+    ("PATCH", "/items/{item}", {"name": "renamed"}, 1),
+    ("DELETE", "/items/{item}", None, 1),
+    ("POST", "/items/bulk", {"items": [{"name": f"bulk-{n}"} for n in range(SEEDED_ITEMS)]}, 1),
+    ("PATCH", "/items/bulk/{item}", lambda admin, ids: {"items": [{"id": ids["item"], "name": "bulk"}]}, 1),
+    ("DELETE", "/items/bulk/{item}", lambda admin, ids: {"ids": [ids["item"]]}, 1),
+    ("GET", "/users", None, 2),
+    ("GET", "/users/export", None, 1),
+    ("GET", "/users/{user}", None, 1),
+    ("POST", "/users", lambda admin, ids: {"email": ids["email"], "password": "secret1"}, 1),
+    ("PATCH", "/users/{user}", {"role": "admin"}, 1),
+    ("DELETE", "/users/{user}", None, 1),
+]
+
+
+@pytest.mark.parametrize("method,path,body,budget", BUDGETS, ids=[f"{m} {p}" for m, p, _, _ in BUDGETS])
+def test_statement_budget(admin, count_statements, new_email, method, path, body, budget):
+    headers = admin["headers"]
+    ids = {"email": new_email()}
+    if "{item}" in path:
+        ids["item"] = _new_item(headers)
+    if "{user}" in path:
+        ids["user"] = _new_user(headers, new_email())
+    # Bulk routes take ids in the body; the placeholder only marks that a row is needed.
+    url = path.replace("/bulk/{item}", "/bulk").format(**ids)
+    payload = body(admin, ids) if callable(body) else body
+
+    with count_statements() as statements:
+        response = client.request(method, url, json=payload, headers=headers)
+    assert response.status_code < 300, response.text
+    assert len(statements) <= budget, "\n".join(statements)
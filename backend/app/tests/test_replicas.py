@@ -0,0 +1,100 @@
+import asyncio
+from pathlib import Path
+import sys
+import time
+from typing import Optional
+
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.replicas import PRIMARY_UNTIL_COOKIE, PRIMARY_UNTIL_HEADER, ReadYourWritesMiddleware, ReplicaRouter
+from app.db.session import Replica
+
+
+class StubRouter(ReplicaRouter):
+    """Probes return canned lag values (``None`` = unknown, an exception = unreachable)."""
+
+    def __init__(self, lags: dict[str, object]) -> None:
+        super().__init__(list(lags), interval_seconds=1.0, timeout_seconds=1.0, max_lag_seconds=2.0)
+        self.lags = lags
+
+    @property
+    def replicas(self) -> list[Replica]:
+        return [Replica(name, engine=None, session_factory=None) for name in self.lags]
+
+    async def _lag(self, replica: Replica) -> Optional[float]:
+        lag = self.lags[replica.name]
+        if isinstance(lag, Exception):
+            raise lag
+        return lag
+
+    def probe_all(self) -> None:
+        async def probe() -> None:
+            await asyncio.gather(*(self.probe(replica) for replica in self.replicas))
+
+        asyncio.run(probe())
+
+
+def make_request(method: str = "GET", headers: Optional[dict[str, str]] = None) -> Request:
+    raw = [(key.lower().encode(), value.encode()) for key, value in (headers or {}).items()]
+    return Request({"type": "http", "method": method, "path": "/items", "headers": raw, "query_string": b""})
+
+
+def test_replicas_join_after_a_probe_and_rotate():
+    router = StubRouter({"replica1": 0.0, "replica2": 0.5})
+    assert router.choose() is None
+    router.probe_all()
+    assert [router.choose().name for _ in range(4)] == ["replica1", "replica2", "replica1", "replica2"]
+
+
+def test_lagging_or_unreachable_replicas_are_ejected_until_they_recover():
+    router = StubRouter({"replica1": 5.0, "replica2": ConnectionError("refused"), "replica3": None})
+    router.probe_all()
+    assert router.choose() is None
+    assert router.states["replica2"].last_error == "ConnectionError: refused"
+
+    router.lags["replica1"] = 1.0
+    router.probe_all()
+    assert {router.choose().name for _ in range(3)} == {"replica1"}
+
+
+def test_only_unpinned_reads_are_routed_to_replicas():
+    router = StubRouter({"replica1": 0.0})
+    router.probe_all()
+    assert router.for_request(make_request()).name == "replica1"
+    assert router.for_request(make_request("POST")) is None
+
+    future, past = f"{time.time() + 60:.3f}", f"{time.time() - 60:.3f}"
+    assert router.for_request(make_request(headers={PRIMARY_UNTIL_HEADER: future})) is None
+    assert router.for_request(make_request(headers={"Cookie": f"{PRIMARY_UNTIL_COOKIE}={future}"})) is None
+    assert router.for_request(make_request(headers={"Cookie": f"{PRIMARY_UNTIL_COOKIE}={past}"})).name == "replica1"
+    assert router.for_request(make_request(headers={PRIMARY_UNTIL_HEADER: "garbage"})).name == "replica1"
+
+
+def test_successful_writes_pin_the_client_to_the_primary():
+    async def ok(_: Request) -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    async def rejected(_: Request) -> PlainTextResponse:
+        return PlainTextResponse("no", status_code=409)
+
+    app = Starlette(routes=[Route("/ok", ok, methods=["GET", "POST", "OPTIONS"]), Route("/rejected", rejected, methods=["POST"])])
+    client = TestClient(ReadYourWritesMiddleware(app, window_seconds=6.0))
+
+    assert PRIMARY_UNTIL_COOKIE not in client.get("/ok").cookies
+    # CORS preflights precede writes; they must not pin the client a second time.
+    assert PRIMARY_UNTIL_HEADER not in client.options("/ok").headers
+    assert PRIMARY_UNTIL_COOKIE not in client.post("/rejected").cookies
+
+    before = time.time()
+    response = client.post("/ok")
+    until = float(response.headers[PRIMARY_UNTIL_HEADER])
+    assert before + 6.0 <= until <= time.time() + 6.0
+    assert response.cookies[PRIMARY_UNTIL_COOKIE] == response.headers[PRIMARY_UNTIL_HEADER]
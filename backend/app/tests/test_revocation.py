@@ -0,0 +1,81 @@
+from pathlib import Path
+import subprocess
+import sys
+import uuid
+
+from fastapi.testclient import TestClient
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.principal_cache import principal_cache
+from app.core.revocation import TokenRevocations, token_revocations
+from app.core.security import create_access_token
+from app.main import app
+
+client = TestClient(app)
+
+OTHER_WORKER = """
+import sys
+from fastapi.testclient import TestClient
+from app.main import app
+
+method, path, token, body = sys.argv[1:5]
+client = TestClient(app)
+headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+response = client.request(method, path, headers=headers, content=body or None)
+print(response.status_code)
+"""
+
+
+def in_other_process(method: str, path: str, token: str, body: str = "") -> int:
+    """Run one request through a separate app process; nothing it learns reaches this one."""
+    result = subprocess.run(
+        [sys.executable, "-c", OTHER_WORKER, method, path, token, body],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return int(result.stdout.strip().splitlines()[-1])
+
+
+def restart(monkeypatch) -> None:
+    """Drop this process's in-memory auth state, as a restarted worker would start."""
+    principal_cache.clear()
+    monkeypatch.setattr(token_revocations, "_floors", TokenRevocations(0)._floors)
+
+
+@pytest.fixture
+def promoted_user(admin_headers):
+    body = {"email": f"revoke-{uuid.uuid4().hex}@example.com", "password": "secret1", "role": "admin"}
+    user = client.post("/users", json=body, headers=admin_headers).json()
+    yield user
+    client.delete(f"/users/{user['id']}", headers=admin_headers)
+
+
+def test_demotion_in_another_process_is_enforced_after_restart(admin, promoted_user, monkeypatch):
+    token = create_access_token(promoted_user["id"], role="admin")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/users", headers=headers).status_code == 200
+
+    demote = '{"role": "user"}'
+    assert in_other_process("PATCH", f"/users/{promoted_user['id']}", admin["headers"]["Authorization"][7:], demote) == 200
+    restart(monkeypatch)
+
+    assert client.get("/users", headers=headers).status_code == 401
+    assert in_other_process("GET", "/users", token) == 401
+
+
+def test_deletion_in_another_process_is_enforced_after_restart(admin, promoted_user, monkeypatch):
+    token = create_access_token(promoted_user["id"], role="admin")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/users", headers=headers).status_code == 200
+
+    assert in_other_process("DELETE", f"/users/{promoted_user['id']}", admin["headers"]["Authorization"][7:]) == 204
+    restart(monkeypatch)
+
+    assert client.get("/users", headers=headers).status_code == 401
+    assert in_other_process("GET", "/users", token) == 401
@@ -0,0 +1,81 @@
+from pathlib import Path
+import sys
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.security import create_access_token
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import Item
+
+NAMES = ["quarterly report", "Report archive", "repot", "holiday photos", "50% off coupon", "5000 units"]
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def items(admin):
+    # The admin fixture's user is deleted at module teardown; its items cascade with it.
+    with SessionLocal() as session:
+        session.execute(insert(Item), [{"name": name, "owner_id": admin["id"]} for name in NAMES])
+        session.commit()
+
+
+def search(headers: dict[str, str], q: str, **params) -> dict:
+    response = client.get("/items", params={"q": q, **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_substring_matches_rank_before_fuzzy_ones(admin_headers):
+    names = [item["name"] for item in search(admin_headers, "report")["items"]]
+    assert set(names[:2]) == {"quarterly report", "Report archive"}
+    assert "repot" in names[2:]
+    assert "holiday photos" not in names
+
+
+def test_misspelled_query_finds_similar_names(admin_headers):
+    assert [item["name"] for item in search(admin_headers, "holiday fotos")["items"]] == ["holiday photos"]
+
+
+def test_search_is_scoped_to_the_owner(admin_headers):
+    body = {"email": f"search-{uuid.uuid4().hex}@example.com", "password": "secret1"}
+    other = client.post("/users", json=body, headers=admin_headers).json()
+    try:
+        headers = {"Authorization": f"Bearer {create_access_token(other['id'])}"}
+        assert search(headers, "report")["items"] == []
+    finally:
+        client.delete(f"/users/{other['id']}", headers=admin_headers)
+
+
+def test_like_wildcards_are_literal(admin_headers):
+    # "%" must not widen the substring match to "5000 units".
+    assert [item["name"] for item in search(admin_headers, "50%")["items"]][:1] == ["50% off coupon"]
+
+
+def test_pages_cover_every_match_once(admin_headers):
+    everything = [item["id"] for item in search(admin_headers, "re", limit=200)["items"]]
+    seen: list[str] = []
+    after = None
+    while True:
+        page = search(admin_headers, "re", limit=1, **({"after": after} if after else {}))
+        seen.extend(item["id"] for item in page["items"])
+        after = page["next_cursor"]
+        if after is None:
+            break
+    assert seen == everything
+
+
+def test_search_cursor_is_validated(admin_headers):
+    response = client.get("/items", params={"q": "report", "after": "bogus"}, headers=admin_headers)
+    assert response.status_code == 400
+    recent_cursor = client.get("/items", params={"limit": 1}, headers=admin_headers).json()["next_cursor"]
+    response = client.get("/items", params={"q": "report", "after": recent_cursor}, headers=admin_headers)
+    assert response.status_code == 400
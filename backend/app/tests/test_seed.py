@@ -0,0 +1,100 @@
+import argparse
+from pathlib import Path
+import random
+import sys
+import uuid
+
+import pytest
+from sqlalchemy import delete, select
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+import seed
+from seed import generate, generate_user, items_per_user, load_email
+
+from app.db.session import SessionLocal
+from app.models import Item, User
+
+
+def test_generated_users_are_a_pure_function_of_seed_and_index():
+    zipf = items_per_user("zipf", 1.1, 50)
+    assert generate_user(7, 42, zipf) == generate_user(7, 42, zipf)
+    assert generate_user(7, 42, zipf) != generate_user(8, 42, zipf)
+    assert generate_user(7, 42, zipf) != generate_user(7, 43, zipf)
+    assert len(generate_user(7, 42, items_per_user("3", 1.1, 50))[1]) == 3
+    assert max(zipf(random.Random(n)) for n in range(2000)) == 50
+
+
+@pytest.fixture
+def seed_value():
+    value = uuid.uuid4().int % 1_000_000 + 1_000_000
+    yield value
+    with SessionLocal() as session:
+        session.execute(delete(User).where(User.email.like(f"load{value}-%")))
+        session.commit()
+
+
+def run(seed_value: int, users: int, batch_users: int = 10_000) -> None:
+    generate(
+        argparse.Namespace(
+            users=users,
+            items_per_user="2",
+            zipf_alpha=1.1,
+            max_items_per_user=10,
+            seed=seed_value,
+            batch_users=batch_users,
+            batch_items=500_000,
+        )
+    )
+
+
+def loaded(seed_value: int) -> dict[str, set[str]]:
+    with SessionLocal() as session:
+        rows = session.execute(
+            select(User.email, Item.id).outerjoin(Item, Item.owner_id == User.id).where(User.email.like(f"load{seed_value}-%"))
+        )
+        found: dict[str, set[str]] = {}
+        for email, item_id in rows:
+            found.setdefault(email, set()).add(item_id.hex)
+        return found
+
+
+def expected(seed_value: int, users: int) -> dict[str, set[str]]:
+    count = items_per_user("2", 1.1, 10)
+    return {
+        load_email(seed_value, index): {line.split("\t", 1)[0] for line in generate_user(seed_value, index, count)[1]}
+        for index in range(users)
+    }
+
+
+def test_reruns_resume_after_the_existing_prefix(seed_value, capsys):
+    run(seed_value, users=3)
+    assert loaded(seed_value) == expected(seed_value, 3)
+
+    run(seed_value, users=7, batch_users=2)
+    assert "Generating users 3..6" in capsys.readouterr().out
+    assert loaded(seed_value) == expected(seed_value, 7)
+
+    run(seed_value, users=7)
+    assert "All 7 users" in capsys.readouterr().out
+    assert loaded(seed_value) == expected(seed_value, 7)
+
+
+def test_an_interrupted_run_resumes_where_it_stopped(seed_value, monkeypatch):
+    batches = seed._batches
+
+    def interrupted(*args):
+        iterator = batches(*args)
+        yield next(iterator)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(seed, "_batches", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        run(seed_value, users=6, batch_users=2)
+    assert loaded(seed_value) == expected(seed_value, 2)
+
+    monkeypatch.undo()
+    run(seed_value, users=6, batch_users=2)
+    assert loaded(seed_value) == expected(seed_value, 6)
@@ -0,0 +1,165 @@
+import os
+from pathlib import Path
+import subprocess
+import sys
+import textwrap
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Microseconds. Importing the entry point must not pull in the framework or drivers (cumulative
+# time); building the application spends at most the second budget in its own module bodies.
+ENTRY_POINT_BUDGET_US = 50_000
+APP_MODULES_BUDGET_US = 300_000
+HEAVY_MODULES = ("fastapi", "sqlalchemy", "psycopg", "passlib", "jose")
+
+
+def run(code: str, *flags: str, **env: str) -> subprocess.CompletedProcess:
+    """Run ``code`` in a fresh interpreter without the test environment's database settings."""
+    clean = {key: value for key, value in os.environ.items() if key not in ("DATABASE_URL", "JWT_SECRET")}
+    result = subprocess.run(
+        [sys.executable, *flags, "-c", textwrap.dedent(code)],
+        cwd=ROOT,
+        env={**clean, **env},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return result
+
+
+def import_times(module: str, **env: str) -> dict[str, tuple[int, int]]:
+    """``-X importtime`` (self, cumulative) microseconds per module."""
+    stderr = run(f"import {module}", "-X", "importtime", **env).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        if own.strip().isdigit():
+            times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def test_importing_the_entry_point_is_cheap():
+    loaded = run(f"import sys, app.main; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    assert loaded.stdout.strip() == ""
+    _, cumulative = import_times("app.main")["app.main"]
+    assert cumulative < ENTRY_POINT_BUDGET_US
+
+
+def test_application_modules_fit_the_import_budget():
+    times = import_times("app.application", DATABASE_URL="sqlite://", JWT_SECRET="import-budget")
+    own = {name: own for name, (own, _) in times.items() if name == "app" or name.startswith("app.")}
+    assert sum(own.values()) < APP_MODULES_BUDGET_US, sorted(own.items(), key=lambda item: -item[1])[:5]
+
+
+def test_models_and_sessions_import_without_settings():
+    # No DATABASE_URL: reading settings would fail, so this also proves nothing is read.
+    run(
+        """
+        import app.db.session as session
+        import app.models
+        from app.core import config
+        assert session._databases is None
+        assert config._settings is None
+        """
+    )
+
+
+def test_security_imports_without_settings():
+    run(
+        """
+        import app.core.security
+        from app.core import config
+        assert config._settings is None
+        """
+    )
+
+
+def test_create_app_uses_the_given_settings():
+    run(
+        """
+        from app.core.config import Settings, get_settings
+        from app.db.session import databases
+        from app.main import create_app
+
+        settings = Settings(DATABASE_URL="sqlite://", JWT_SECRET="factory", DB_ASYNC=False)
+        application = create_app(settings)
+        assert get_settings() is settings
+        assert any(route.path == "/items" for route in application.routes)
+        assert str(databases().engine.url) == "sqlite://"
+        """
+    )
+
+
+def test_build_app_configures_shared_components_from_the_given_settings():
+    # The environment has no settings at all: anything still read from it would fail.
+    run(
+        """
+        import asyncio
+
+        from app.application import build_app
+        from app.core.admission import admission_control
+        from app.core.config import Settings, get_settings
+        from app.core.principal_cache import principal_cache
+        from app.core.revocation import token_revocations
+        from app.core.security import get_password_hash_async, password_hash_pool
+        from app.core.token_cache import verified_tokens
+        from app.db.health import database_health
+        from app.db.replicas import replica_router
+
+        settings = Settings(
+            DATABASE_URL="sqlite://",
+            JWT_SECRET="factory",
+            DB_ASYNC=False,
+            DATABASE_REPLICA_URLS="sqlite://",
+            PRINCIPAL_CACHE_TTL_SECONDS=7,
+            TOKEN_CACHE_MAX_ENTRIES=11,
+            access_token_expire_minutes=3,
+            HEALTH_FAILURE_THRESHOLD=4,
+            ADMISSION_LIMIT_READ=9,
+            PASSWORD_HASH_WORKERS=1,
+            PASSWORD_HASH_QUEUE_SIZE=5,
+            PASSWORD_BCRYPT_ROUNDS=5,
+        )
+        build_app(settings)
+        assert get_settings() is settings
+        assert principal_cache.ttl_seconds == 7 and verified_tokens.max_entries == 11
+        assert token_revocations.retention_seconds == 180
+        assert database_health.failure_threshold == 4
+        assert list(replica_router.states) == ["replica1"]
+        assert admission_control.limits["read"].max_limit == 9
+        assert password_hash_pool.capacity == 6
+        # Spawned hash workers get the hashing configuration from this process, not the environment.
+        try:
+            assert asyncio.run(get_password_hash_async("secret")).startswith("$2b$05$")
+        finally:
+            password_hash_pool.shutdown()
+        """
+    )
+
+
+def test_databases_follow_the_settings_of_the_app():
+    run(
+        """
+        import asyncio
+
+        from app.core.config import Settings
+        from app.db.session import databases, init_databases, use_databases
+
+        first = Settings(DATABASE_URL="sqlite://", JWT_SECRET="a", DB_ASYNC=False)
+        second = Settings(DATABASE_URL="sqlite:///replaced.db", JWT_SECRET="a", DB_ASYNC=False)
+        assert init_databases(first) is init_databases(first.model_copy())
+        try:
+            init_databases(second)
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("engines built from other settings were reused")
+        asyncio.run(use_databases(second))
+        assert str(databases().engine.url) == "sqlite:///replaced.db"
+        """
+    )
@@ -0,0 +1,77 @@
+from datetime import timedelta
+from pathlib import Path
+import sys
+import time
+import uuid
+
+from jose import jwt
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core import security
+from app.core.config import get_settings
+from app.core.security import KeyRing, create_access_token, decode_access_token, use_key_ring
+from app.core.token_cache import VerifiedTokenCache, verified_tokens
+
+
+def key_ring(current: str, *previous: str) -> KeyRing:
+    return KeyRing.from_settings(
+        get_settings().model_copy(update={"jwt_secret": current, "jwt_previous_secrets": ",".join(previous)})
+    )
+
+
+def test_repeat_presentations_skip_verification(monkeypatch):
+    user_id = uuid.uuid4()
+    token = create_access_token(str(user_id), role="admin", token_version=3)
+    verified_tokens.clear()
+    first = decode_access_token(token)
+    assert (first.id, first.role, first.token_version) == (user_id, "admin", 3)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached tokens are not decoded again")
+
+    monkeypatch.setattr(security.jwt, "decode", fail)
+    assert decode_access_token(token) is first
+    assert verified_tokens.stats()["hits"] >= 1
+
+
+def test_expired_and_invalid_tokens_are_not_cached():
+    verified_tokens.clear()
+    assert decode_access_token(create_access_token(str(uuid.uuid4()), timedelta(seconds=-1))) is None
+    assert decode_access_token("not-a-token") is None
+    forged = jwt.encode({"sub": str(uuid.uuid4()), "exp": 2**31}, "wrong", algorithm="HS256")
+    assert decode_access_token(forged) is None
+    assert verified_tokens.stats()["size"] == 0
+
+
+def test_rotation_keeps_previous_secrets_and_clears_the_cache():
+    original = security.current_key_ring()
+    try:
+        use_key_ring(key_ring("old-secret"))
+        old_token = create_access_token(str(uuid.uuid4()))
+        assert decode_access_token(old_token) is not None
+        assert verified_tokens.stats()["size"] == 1
+
+        use_key_ring(key_ring("new-secret", "old-secret"))
+        assert verified_tokens.stats()["size"] == 0
+        assert jwt.get_unverified_header(create_access_token(str(uuid.uuid4())))["kid"] == security.key_id("new-secret")
+        assert decode_access_token(old_token) is not None
+
+        use_key_ring(key_ring("new-secret"))
+        assert decode_access_token(old_token) is None
+    finally:
+        use_key_ring(original)
+
+
+def test_cache_is_sized_on_first_use_unless_configured():
+    cache = VerifiedTokenCache()
+    cache.put(b"a", time.time() + 60, "claims")
+    assert cache.max_entries == get_settings().token_cache_max_entries
+    assert cache.get(b"a") == "claims"
+
+    cache.configure(0)
+    assert cache.get(b"a") is None
+    cache.put(b"b", time.time() + 60, "claims")
+    assert cache.stats()["size"] == 0
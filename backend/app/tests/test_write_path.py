@@ -0,0 +1,105 @@
+import asyncio
+from pathlib import Path
+import sys
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, insert, select
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.security import get_password_hash
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import Item, User
+from app.routers import users as users_router
+from app.services.users import purge_user
+
+
+client = TestClient(app)
+
+
+def test_item_mutations_are_single_statements(admin_headers, count_statements):
+    # Warm the principal cache so only the write itself is counted.
+    client.get("/auth/me", headers=admin_headers)
+    with count_statements() as statements:
+        response = client.post("/items", json={"name": "write-path"}, headers=admin_headers)
+    assert response.status_code == 201
+    assert response.json()["created_at"]
+    assert len(statements) == 1
+    item_id = response.json()["id"]
+
+    with count_statements() as statements:
+        response = client.patch(f"/items/{item_id}", json={"name": "renamed"}, headers=admin_headers)
+    assert response.json()["name"] == "renamed"
+    assert len(statements) == 1
+
+    with count_statements() as statements:
+        assert client.delete(f"/items/{item_id}", headers=admin_headers).status_code == 204
+    assert len(statements) == 1
+
+    with count_statements() as statements:
+        assert client.delete(f"/items/{item_id}", headers=admin_headers).status_code == 404
+    assert len(statements) == 1
+
+
+def test_user_mutations_are_single_statements(admin_headers, count_statements):
+    email = f"write-path-{uuid.uuid4().hex}@example.com"
+    with count_statements() as statements:
+        response = client.post("/users", json={"email": email, "password": "secret1"}, headers=admin_headers)
+    assert response.status_code == 201
+    assert len(statements) == 1
+    user_id = response.json()["id"]
+
+    with count_statements() as statements:
+        response = client.patch(f"/users/{user_id}", json={"role": "admin"}, headers=admin_headers)
+    assert response.json()["role"] == "admin"
+    assert len(statements) == 1
+
+    with count_statements() as statements:
+        assert client.delete(f"/users/{user_id}", headers=admin_headers).status_code == 204
+    assert len(statements) == 1
+
+
+def make_user_with_items(count: int) -> tuple[uuid.UUID, str]:
+    email = f"purge-{uuid.uuid4().hex}@example.com"
+    with SessionLocal() as session:
+        user = User(email=email, password_hash=get_password_hash("secret1"))
+        session.add(user)
+        session.flush()
+        session.execute(insert(Item), [{"name": f"purge-{n}", "owner_id": user.id} for n in range(count)])
+        session.commit()
+        return user.id, email
+
+
+def test_orm_user_delete_leaves_items_to_the_database(count_statements):
+    user_id, _ = make_user_with_items(3)
+    with SessionLocal() as session:
+        user = session.get(User, user_id)
+        with count_statements() as statements:
+            session.delete(user)
+            session.commit()
+    assert not [statement for statement in statements if "items" in statement]
+    with SessionLocal() as session:
+        # The items went with the ON DELETE CASCADE on items.owner_id, declared in the migrations.
+        assert session.scalar(select(func.count()).select_from(Item).where(Item.owner_id == user_id)) == 0
+
+
+def test_background_purge_hides_the_user_then_deletes_in_batches(admin_headers, monkeypatch):
+    started: list[uuid.UUID] = []
+    monkeypatch.setattr(users_router, "start_purge", started.append)
+    user_id, email = make_user_with_items(5)
+
+    response = client.delete(f"/users/{user_id}", params={"mode": "background"}, headers=admin_headers)
+    assert response.status_code == 202
+    assert started == [user_id]
+    assert client.get(f"/users/{user_id}", headers=admin_headers).status_code == 404
+    assert client.post("/auth/login", json={"email": email, "password": "secret1"}).status_code == 401
+    assert str(user_id) not in {user["id"] for user in client.get("/users", headers=admin_headers).json()}
+
+    assert asyncio.run(purge_user(user_id, batch_size=2, pause_seconds=0)) == 5
+    with SessionLocal() as session:
+        assert session.get(User, user_id) is None
+        assert session.scalar(select(func.count()).where(Item.owner_id == user_id)) == 0
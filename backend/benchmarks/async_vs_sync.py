@@ -0,0 +1,82 @@
+"""Compare request throughput between the async and sync database modes.
+
+Boots ``uvicorn app.main:app`` once with ``DB_ASYNC=true`` and once with ``DB_ASYNC=false``
+against ``DATABASE_URL`` and drives an authenticated read endpoint at high concurrency:
+
+    python backend/benchmarks/async_vs_sync.py --concurrency 200 --requests 5000
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from common import ensure_bench_user, percentile, start_server, stop_server, wait_ready
+
+from app.core.security import create_access_token
+
+
+async def drive(base_url: str, path: str, token: str, total: int, concurrency: int) -> dict[str, float]:
+    latencies: list[float] = []
+    errors = 0
+    remaining = total
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60.0) as client:
+
+        async def worker() -> None:
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": errors,
+    }
+
+
+async def run_mode(mode: str, args: argparse.Namespace, token: str) -> dict[str, float]:
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = start_server(args.port, {"DB_ASYNC": "true" if mode == "async" else "false"})
+    try:
+        await wait_ready(base_url, server)
+        await drive(base_url, args.path, token, min(args.requests, 500), args.concurrency)
+        return await drive(base_url, args.path, token, args.requests, args.concurrency)
+    finally:
+        stop_server(server)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--path", default="/items")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    token = create_access_token(ensure_bench_user())
+    print(f"{'mode':<6} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8}")
+    for mode in ("sync", "async"):
+        result = await run_mode(mode, args, token)
+        print(f"{mode:<6} {result['rps']:>10.1f} {result['p50_ms']:>10.1f} {result['p99_ms']:>10.1f} {result['errors']:>8}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
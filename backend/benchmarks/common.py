@@ -0,0 +1,84 @@
+"""Helpers shared by the benchmark scripts: bench data, server lifecycle and percentiles."""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Optional
+
+import httpx
+from sqlalchemy import func, insert, select
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.security import get_password_hash  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.models import Item, User  # noqa: E402
+
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "benchpass"
+BENCH_ITEMS = 50
+
+
+def ensure_bench_user() -> str:
+    with SessionLocal() as session:
+        user = session.execute(select(User).where(User.email == BENCH_EMAIL)).scalar_one_or_none()
+        if not user:
+            user = User(email=BENCH_EMAIL, password_hash=get_password_hash(BENCH_PASSWORD), role="user")
+            session.add(user)
+            session.flush()
+            session.add_all(Item(name=f"bench-{i}", owner_id=user.id) for i in range(BENCH_ITEMS))
+            session.commit()
+        return str(user.id)
+
+
+def seed_bench_items(
+    user_id: str, target: int, batch_size: int = 5000, name: Callable[[int], str] = "bench-{}".format
+) -> None:
+    """Top the bench user's items up to ``target`` rows (never deletes); ``name(n)`` names row ``n``."""
+    owner_id = uuid.UUID(user_id)
+    with SessionLocal() as session:
+        existing = session.execute(select(func.count()).where(Item.owner_id == owner_id)).scalar_one()
+        for start in range(existing, target, batch_size):
+            rows = [{"name": name(n), "owner_id": owner_id} for n in range(start, min(start + batch_size, target))]
+            session.execute(insert(Item), rows)
+            session.commit()
+
+
+def start_server(port: int, env: Optional[dict[str, str]] = None) -> subprocess.Popen:
+    server_env = {**os.environ, "LOG_LEVEL": "WARNING", **(env or {})}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--no-access-log"],
+        cwd=ROOT,
+        env=server_env,
+    )
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.terminate()
+    server.wait(timeout=10)
+
+
+async def wait_ready(base_url: str, server: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline and server.poll() is None:
+            try:
+                if (await client.get("/healthz")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not become ready")
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
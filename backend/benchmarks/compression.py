@@ -0,0 +1,101 @@
+"""Bytes saved versus CPU cost of each response coding, per payload size and level.
+
+No database or server is needed: payloads are item pages rendered the way ``list_items`` renders
+them (``ItemPage`` JSON) and, with ``--ndjson``, export lines flushed one row at a time the way
+``CompressionMiddleware`` encodes streams. brotli and zstd rows appear when their packages are
+installed.
+
+    python backend/benchmarks/compression.py --rows 10 100 1000 10000
+    python backend/benchmarks/compression.py --levels gzip=1,5,9 br=1,4,6 --ndjson
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.compression import ENCODERS, Encoder  # noqa: E402
+from app.schemas.item import ItemPage, ItemRead  # noqa: E402
+
+DEFAULT_LEVELS = {"gzip": [1, 5, 9], "br": [1, 4, 6], "zstd": [1, 3, 9]}
+
+
+def make_items(count: int) -> list[ItemRead]:
+    owner_id = uuid.uuid4()
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        ItemRead(id=uuid.uuid4(), name=f"item-{n}", owner_id=owner_id, created_at=created, updated_at=created)
+        for n, created in ((n, start + timedelta(seconds=n)) for n in range(count))
+    ]
+
+
+def make_page(count: int) -> bytes:
+    return ItemPage(items=make_items(count), next_cursor=None).model_dump_json().encode()
+
+
+def make_lines(count: int) -> list[bytes]:
+    return [item.model_dump_json().encode() + b"\n" for item in make_items(count)]
+
+
+def whole(encoder: Encoder, chunks: list[bytes]) -> int:
+    return len(encoder.compress(b"".join(chunks)) + encoder.finish())
+
+
+def streamed(encoder: Encoder, chunks: list[bytes]) -> int:
+    size = sum(len(encoder.compress(chunk) + encoder.flush()) for chunk in chunks)
+    return size + len(encoder.finish())
+
+
+def best_of(
+    factory: Callable[[int], Encoder], level: int, mode: Callable[[Encoder, list[bytes]], int], chunks: list[bytes], repeat: int
+) -> tuple[float, int]:
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = mode(factory(level), chunks)
+        timings.append(time.perf_counter() - started)
+    return min(timings), size
+
+
+def parse_levels(values: list[str]) -> dict[str, list[int]]:
+    levels = {}
+    for value in values:
+        coding, _, numbers = value.partition("=")
+        levels[coding] = [int(number) for number in numbers.split(",")]
+    return levels
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1_000, 10_000])
+    parser.add_argument("--levels", nargs="+", default=[], help="coding=level,level ... (default: a low/default/high set)")
+    parser.add_argument("--ndjson", action="store_true", help="measure per-row flushed streams instead of whole pages")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    levels = parse_levels(args.levels) or DEFAULT_LEVELS
+    mode = streamed if args.ndjson else whole
+
+    print(f"{'rows':>6} {'bytes':>9} {'coding':>6} {'level':>5} {'out':>9} {'saved_%':>7} {'cpu_ms':>8} {'MB_per_s':>8}")
+    for count in args.rows:
+        chunks = make_lines(count) if args.ndjson else [make_page(count)]
+        size = sum(len(chunk) for chunk in chunks)
+        for coding, factory in ENCODERS.items():
+            for level in levels.get(coding, []):
+                elapsed, out = best_of(factory, level, mode, chunks, args.repeat)
+                print(
+                    f"{count:>6} {size:>9} {coding:>6} {level:>5} {out:>9} {(1 - out / size) * 100:>7.1f}"
+                    f" {elapsed * 1000:>8.2f} {size / elapsed / 1e6:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Load-test the API in-process and record throughput and latency percentiles.
+
+Boots ``app.main:app`` under uvicorn inside this process against ``DATABASE_URL`` (the compose
+``db`` service or any throwaway Postgres), seeds the bench user up to ``--items`` rows, then
+drives each scenario at ``--concurrency`` for ``--requests`` requests:
+
+    python backend/benchmarks/load.py --save baseline.json
+    python backend/benchmarks/load.py --compare baseline.json --tolerance 0.15
+
+``--compare`` exits non-zero when any scenario loses more than ``--tolerance`` of its
+throughput or gains more than that on p95 latency. Baselines are machine-specific; record and
+compare them on the same host.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+from typing import Any, Awaitable, Callable
+
+import httpx
+import uvicorn
+
+from common import BENCH_EMAIL, BENCH_PASSWORD, ensure_bench_user, percentile, seed_bench_items
+
+from app.core.security import create_access_token
+
+Operation = Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]
+
+
+def build_scenarios(item_ids: list[str]) -> dict[str, Operation]:
+    async def login(client: httpx.AsyncClient) -> httpx.Response:
+        return await client.post("/auth/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+
+    async def list_page(client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get("/items", params={"limit": 50})
+
+    async def get_item(client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get(f"/items/{random.choice(item_ids)}")
+
+    async def create_item(client: httpx.AsyncClient) -> httpx.Response:
+        return await client.post("/items", json={"name": "load"})
+
+    async def crud_cycle(client: httpx.AsyncClient) -> httpx.Response:
+        created = await client.post("/items", json={"name": "load"})
+        if created.status_code != 201:
+            return created
+        item_id = created.json()["id"]
+        renamed = await client.patch(f"/items/{item_id}", json={"name": "load-renamed"})
+        if renamed.status_code != 200:
+            return renamed
+        return await client.delete(f"/items/{item_id}")
+
+    return {
+        "login": login,
+        "list": list_page,
+        "get": get_item,
+        "create": create_item,
+        "crud": crud_cycle,
+    }
+
+
+async def drive(client: httpx.AsyncClient, operation: Operation, total: int, concurrency: int) -> dict[str, float]:
+    latencies: list[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                response = await operation(client)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "rps": total / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": errors,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    user_id = ensure_bench_user()
+    seed_bench_items(user_id, args.items)
+    token = create_access_token(user_id)
+
+    config = uvicorn.Config("app.main:app", host="127.0.0.1", port=args.port, log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+    serving = asyncio.create_task(server.serve())
+    base_url = f"http://127.0.0.1:{args.port}"
+    results: dict[str, dict[str, float]] = {}
+    try:
+        while not server.started:
+            if serving.done():
+                raise RuntimeError(f"server at {base_url} failed to start")
+            await asyncio.sleep(0.05)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        headers = {"Authorization": f"Bearer {token}"}
+        async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60.0) as client:
+            page = (await client.get("/items", params={"limit": 200})).json()
+            scenarios = build_scenarios([item["id"] for item in page["items"]])
+            for name in args.scenarios:
+                operation = scenarios[name]
+                await drive(client, operation, min(args.warmup, args.requests), args.concurrency)
+                results[name] = await drive(client, operation, args.requests, args.concurrency)
+                print(_format_row(name, results[name]), flush=True)
+    finally:
+        server.should_exit = True
+        await serving
+
+    return {
+        "meta": {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "items": args.items,
+            "python": platform.python_version(),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+
+
+HEADER = f"{'scenario':<8} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}"
+
+
+def _format_row(name: str, result: dict[str, float]) -> str:
+    return (
+        f"{name:<8} {result['rps']:>10.1f} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} "
+        f"{result['p99_ms']:>9.1f} {result['errors']:>7}"
+    )
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    regressions: list[str] = []
+    print(f"\n{'scenario':<8} {'req/s Δ':>10} {'p95 Δ':>10}")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<8} {'(new)':>10}")
+            continue
+        rps_change = result["rps"] / before["rps"] - 1 if before["rps"] else 0.0
+        p95_change = result["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        print(f"{name:<8} {rps_change:>+10.1%} {p95_change:>+10.1%}")
+        if rps_change < -tolerance:
+            regressions.append(f"{name}: throughput {rps_change:+.1%}")
+        if p95_change > tolerance:
+            regressions.append(f"{name}: p95 {p95_change:+.1%}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    scenario_names = ["login", "list", "get", "create", "crud"]
+    parser.add_argument("--scenarios", nargs="+", choices=scenario_names, default=scenario_names)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=200, help="unmeasured requests per scenario")
+    parser.add_argument("--items", type=int, default=10_000, help="bench user's item count")
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression")
+    args = parser.parse_args()
+
+    print(HEADER)
+    current = asyncio.run(run(args))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(current, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            regressions = compare(current, json.load(fh), args.tolerance)
+        if regressions:
+            print("\nRegressions beyond tolerance:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Measure login throughput and collateral latency under a concurrent login storm.
+
+For each ``PASSWORD_HASH_WORKERS`` value, boots the app, runs ``--logins`` concurrent login
+loops for ``--duration`` seconds and, in parallel, probes a non-auth endpoint at a steady rate.
+Reports successful logins/sec, fast rejects (503) and the probe's p50/p99:
+
+    python backend/benchmarks/login_storm.py --workers 1,2,4 --logins 64 --duration 15
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from common import BENCH_EMAIL, BENCH_PASSWORD, ensure_bench_user, percentile, start_server, stop_server, wait_ready
+
+
+async def login_loop(client: httpx.AsyncClient, stop_at: float, counts: dict[str, int]) -> None:
+    payload = {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}
+    while time.monotonic() < stop_at:
+        try:
+            response = await client.post("/auth/login", json=payload)
+        except httpx.HTTPError:
+            counts["errors"] += 1
+            continue
+        if response.status_code == 200:
+            counts["ok"] += 1
+        elif response.status_code == 503:
+            counts["rejected"] += 1
+            await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+        else:
+            counts["errors"] += 1
+
+
+async def probe_loop(client: httpx.AsyncClient, path: str, interval: float, stop_at: float) -> list[float]:
+    latencies: list[float] = []
+    while time.monotonic() < stop_at:
+        started = time.perf_counter()
+        try:
+            await client.get(path)
+        except httpx.HTTPError:
+            pass
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return sorted(latencies)
+
+
+async def run_storm(workers: int, args: argparse.Namespace) -> dict[str, float]:
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = start_server(args.port, {"PASSWORD_HASH_WORKERS": str(workers)})
+    try:
+        await wait_ready(base_url, server)
+        counts = {"ok": 0, "rejected": 0, "errors": 0}
+        limits = httpx.Limits(max_connections=args.logins + 1)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+            stop_at = time.monotonic() + args.duration
+            probe = asyncio.create_task(probe_loop(client, args.probe_path, args.probe_interval, stop_at))
+            await asyncio.gather(*(login_loop(client, stop_at, counts) for _ in range(args.logins)))
+            probe_latencies = await probe
+    finally:
+        stop_server(server)
+
+    return {
+        "logins_per_sec": counts["ok"] / args.duration,
+        "rejected": counts["rejected"],
+        "errors": counts["errors"],
+        "probe_p50_ms": percentile(probe_latencies, 50) * 1000,
+        "probe_p99_ms": percentile(probe_latencies, 99) * 1000,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2", help="comma-separated PASSWORD_HASH_WORKERS values")
+    parser.add_argument("--logins", type=int, default=64, help="concurrent login loops")
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--probe-path", default="/")
+    parser.add_argument("--probe-interval", type=float, default=0.02)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    ensure_bench_user()
+    print(f"{'workers':>7} {'logins/s':>9} {'rejected':>9} {'errors':>7} {'probe p50':>10} {'probe p99':>10}")
+    for workers in (int(value) for value in args.workers.split(",")):
+        result = await run_storm(workers, args)
+        print(
+            f"{workers:>7} {result['logins_per_sec']:>9.1f} {result['rejected']:>9} {result['errors']:>7}"
+            f" {result['probe_p50_ms']:>8.1f}ms {result['probe_p99_ms']:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
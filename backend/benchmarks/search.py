@@ -0,0 +1,136 @@
+"""Latency of ``GET /items?q=`` against a large owner, next to the plain recent-first listing.
+
+Tops the bench user up to ``--items`` rows (1M by default; seeding that many takes a few
+minutes the first time) named from a deterministic word list, runs ``ANALYZE items``, boots
+``uvicorn app.main:app`` against ``DATABASE_URL`` and issues each query sequentially so the
+numbers are per-request latency rather than throughput:
+
+    python backend/benchmarks/search.py --items 1000000 --requests 200
+    python backend/benchmarks/search.py --explain   # also print each search's query plan
+
+Rows seeded earlier by other scripts keep their ``bench-N`` names and simply never match.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from typing import Optional
+
+import httpx
+from sqlalchemy import select, text
+
+from common import ensure_bench_user, percentile, seed_bench_items, start_server, stop_server, wait_ready
+
+from app.core.security import create_access_token
+from app.db.session import SessionLocal
+from app.models import Item
+from app.services.items import ITEM_COLUMNS, search_criteria, search_rank
+
+SYLLABLES = ["ka", "lo", "mi", "ren", "tas", "vo", "quin", "ber", "sol", "dra", "pel", "zu", "ton", "gri", "ash"]
+VOCAB = sorted({"".join(random.Random(n).choices(SYLLABLES, k=2 + n % 2)) for n in range(4000)})
+
+
+def item_name(n: int) -> str:
+    rng = random.Random(n)
+    return " ".join(rng.choices(VOCAB, k=rng.randint(2, 4)))
+
+
+def _typo(word: str) -> str:
+    middle = len(word) // 2
+    return word[: middle - 1] + word[middle] + word[middle - 1] + word[middle + 1 :]
+
+
+# name -> q (None is the plain listing). "word" hits a few thousand rows, "syllable" a large
+# share of the table (the worst case: every match is ranked), "typo" only matches by similarity.
+QUERIES: dict[str, Optional[str]] = {
+    "recent": None,
+    "word": VOCAB[len(VOCAB) // 3],
+    "syllable": "quin",
+    "phrase": " ".join(item_name(7).split()[:2]),
+    "typo": _typo(VOCAB[len(VOCAB) // 3]),
+    "miss": "xyzzyq",
+}
+
+
+def explain(owner_id: str, q: str, limit: int) -> str:
+    rank = search_rank(q)
+    query = (
+        select(*ITEM_COLUMNS, rank.label("rank"))
+        .where(Item.owner_id == uuid.UUID(owner_id), search_criteria(q))
+        .order_by(rank.desc(), Item.id.desc())
+        .limit(limit + 1)
+    )
+    with SessionLocal() as session:
+        connection = session.connection()
+        compiled = query.compile(dialect=connection.dialect)
+        plan = connection.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {compiled}", compiled.params).scalars()
+        return "\n".join(plan)
+
+
+def measure(client: httpx.Client, q: Optional[str], limit: int, requests: int) -> dict[str, float]:
+    params: dict[str, object] = {"limit": limit}
+    if q is not None:
+        params["q"] = q
+    first = client.get("/items", params=params)
+    first.raise_for_status()
+    body = first.json()
+    cursor = body["next_cursor"]
+
+    latencies: list[float] = []
+    for n in range(requests):
+        # Alternate first pages with the second page so cursor continuation is measured too.
+        page_params = {**params, "after": cursor} if cursor and n % 2 else params
+        started = time.perf_counter()
+        client.get("/items", params=page_params).raise_for_status()
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "hits": len(body["items"]),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1_000_000, help="bench user's item count")
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per query")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8768)
+    parser.add_argument("--explain", action="store_true", help="print EXPLAIN ANALYZE for each search")
+    args = parser.parse_args()
+
+    user_id = ensure_bench_user()
+    seed_bench_items(user_id, args.items, batch_size=10_000, name=item_name)
+    with SessionLocal() as session:
+        session.execute(text("ANALYZE items"))
+        session.commit()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = start_server(args.port)
+    try:
+        asyncio.run(wait_ready(base_url, server))
+        headers = {"Authorization": f"Bearer {create_access_token(user_id)}"}
+        with httpx.Client(base_url=base_url, headers=headers, timeout=60.0) as client:
+            print(f"{'query':<9} {'q':<22} {'hits':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+            for name, q in QUERIES.items():
+                result = measure(client, q, args.limit, args.requests)
+                print(
+                    f"{name:<9} {q or '-':<22} {result['hits']:>5} {result['p50_ms']:>9.1f} "
+                    f"{result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f}",
+                    flush=True,
+                )
+    finally:
+        stop_server(server)
+
+    if args.explain:
+        for name, q in QUERIES.items():
+            if q is not None:
+                print(f"\n-- {name}: q={q!r}\n{explain(user_id, q, args.limit)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Per-row cost of serializing an item page, old path versus the list-adapter path.
+
+No database or server is needed: rows are synthetic column tuples shaped like ``ITEM_COLUMNS``.
+
+* ``per_row``: ``ItemRead.model_validate`` per row, then FastAPI's ``response_model`` pass
+  (``serialize_response``) and ``JSONResponse`` rendering, which is what ``list_items`` used to do.
+* ``adapter``: one ``ITEM_LIST_ADAPTER.validate_python`` call and ``model_dump_json`` to bytes.
+
+    python backend/benchmarks/serialization.py --rows 1000 10000 100000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.schemas.item import ITEM_LIST_ADAPTER, ItemPage, ItemRead  # noqa: E402
+
+ItemRow = namedtuple("ItemRow", ["id", "name", "owner_id", "created_at", "updated_at"])
+
+RESPONSE_FIELD = create_response_field(name="Response_list_items", type_=ItemPage)
+
+
+def make_rows(count: int) -> list[ItemRow]:
+    owner_id = uuid.uuid4()
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    stamps = [start + timedelta(seconds=n) for n in range(count)]
+    return [ItemRow(uuid.uuid4(), f"item-{n}", owner_id, stamp, stamp) for n, stamp in enumerate(stamps)]
+
+
+def per_row(rows: list[ItemRow]) -> bytes:
+    page = ItemPage(items=[ItemRead.model_validate(row) for row in rows], next_cursor=None)
+    content = asyncio.run(serialize_response(field=RESPONSE_FIELD, response_content=page, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def adapter(rows: list[ItemRow]) -> bytes:
+    items = ITEM_LIST_ADAPTER.validate_python(rows, from_attributes=True)
+    return ItemPage.model_construct(items=items, next_cursor=None).model_dump_json().encode()
+
+
+STRATEGIES: dict[str, Callable[[list[ItemRow]], bytes]] = {"per_row": per_row, "adapter": adapter}
+
+
+def best_of(fn: Callable[[list[ItemRow]], bytes], rows: list[ItemRow], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(rows)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sample = make_rows(10)
+    assert per_row(sample) == adapter(sample), "strategies must produce identical bodies"
+
+    print(f"{'rows':>8} {'strategy':>8} {'total_ms':>10} {'us_per_row':>11}")
+    for count in args.rows:
+        rows = make_rows(count)
+        for name, fn in STRATEGIES.items():
+            elapsed = best_of(fn, rows, args.repeat)
+            print(f"{count:>8} {name:>8} {elapsed * 1000:>10.1f} {elapsed / count * 1e6:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""Production server: gunicorn managing uvicorn workers.
+
+    gunicorn -c backend/gunicorn.conf.py app.main:app
+
+The master imports and builds the application once (``preload_app``), binds the listening socket
+and forks ``WEB_CONCURRENCY`` workers that share it. Nothing connection-like exists before the
+fork: engines, the password-hash process pool and the health probers start in each worker's
+lifespan, so size ``DB_POOL_SIZE`` + ``DB_MAX_OVERFLOW`` per worker.
+"""
+
+import os
+from pathlib import Path
+
+chdir = str(Path(__file__).resolve().parent)
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY") or os.cpu_count() or 1)
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+# Lets in-flight requests and lifespan shutdown (engine disposal) finish on deploys.
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.environ.get("WORKER_TIMEOUT", "60"))
+accesslog = None
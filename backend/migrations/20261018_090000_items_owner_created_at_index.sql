@@ -0,0 +1,5 @@
+-- Keyset pagination on GET /items walks (owner_id, created_at DESC, id); this index
+-- serves each page as one range scan and supersedes the single-column owner index.
+CREATE INDEX IF NOT EXISTS idx_items_owner_created_at_id ON items (owner_id, created_at DESC, id);
+
+DROP INDEX IF EXISTS idx_items_owner_id;
@@ -0,0 +1,2 @@
+-- Bumped on role change, password change or delete; access tokens carry it as the "ver" claim.
+ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0;
@@ -0,0 +1,4 @@
+-- Row versions for ETags and If-Match. Every UPDATE sets updated_at = now(); existing rows
+-- take the migration time via the (non-rewriting) constant default.
+ALTER TABLE items ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+ALTER TABLE users ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
@@ -0,0 +1,6 @@
+-- GET /items?q= matches names by substring (ILIKE '%q%') and by trigram similarity
+-- (name % q); a GIN trigram index answers both without scanning the owner's rows.
+-- pg_trgm is a trusted extension (PostgreSQL 13+), so the database owner can create it.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_items_name_trgm ON items USING gin (name gin_trgm_ops);
@@ -0,0 +1,8 @@
+-- migrate: no-transaction
+-- Accounts being purged in batches (DELETE /users/{id}?mode=background); NULL for everyone else.
+ALTER TABLE users ADD COLUMN IF NOT EXISTS purge_requested_at TIMESTAMPTZ;
+
+-- Lets scripts/purge_users.py find interrupted purges without scanning users. Built concurrently so
+-- writes to users are not blocked while it builds.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_purge_requested_at ON users (purge_requested_at)
+  WHERE purge_requested_at IS NOT NULL;
@@ -0,0 +1,41 @@
+-- Per-owner version of the item collection, for GET /items ETags. Statement-level triggers bump it
+-- on every INSERT, UPDATE and DELETE (COPY and the purge batches included), in the writer's
+-- transaction: concurrent writers serialize on the owner's row, so versions only ever grow in
+-- commit order and readers never see a lower one after a higher one.
+CREATE TABLE IF NOT EXISTS item_versions (
+  owner_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+  version BIGINT NOT NULL
+);
+
+CREATE OR REPLACE FUNCTION bump_item_versions() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    -- No upsert: during ON DELETE CASCADE from users the owner (and its version row) is already gone.
+    UPDATE item_versions SET version = version + 1
+    WHERE owner_id IN (SELECT DISTINCT owner_id FROM old_rows);
+  ELSIF TG_OP = 'INSERT' THEN
+    INSERT INTO item_versions AS v (owner_id, version)
+    SELECT DISTINCT owner_id, 1 FROM new_rows
+    ON CONFLICT (owner_id) DO UPDATE SET version = v.version + 1;
+  ELSE
+    INSERT INTO item_versions AS v (owner_id, version)
+    SELECT owner_id, 1 FROM new_rows UNION SELECT owner_id, 1 FROM old_rows
+    ON CONFLICT (owner_id) DO UPDATE SET version = v.version + 1;
+  END IF;
+  RETURN NULL;
+END$$;
+
+DROP TRIGGER IF EXISTS items_version_insert ON items;
+CREATE TRIGGER items_version_insert AFTER INSERT ON items
+  REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_item_versions();
+DROP TRIGGER IF EXISTS items_version_update ON items;
+CREATE TRIGGER items_version_update AFTER UPDATE ON items
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_item_versions();
+DROP TRIGGER IF EXISTS items_version_delete ON items;
+CREATE TRIGGER items_version_delete AFTER DELETE ON items
+  REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_item_versions();
+
+-- Owners that already have items start at 1, so their first delete moves the version too.
+INSERT INTO item_versions (owner_id, version)
+SELECT DISTINCT owner_id, 1 FROM items
+ON CONFLICT (owner_id) DO NOTHING;
@@ -0,0 +1,38 @@
+-- Version of the user listing, for GET /users ETags. Statement-level triggers bump it on every
+-- INSERT, UPDATE and DELETE of users (purge batches included), in the writer's transaction:
+-- concurrent writers serialize on the 'users' row, so the version only ever grows in commit
+-- order. count(*) and max(updated_at) could not see an update whose now() was older than the max.
+CREATE TABLE IF NOT EXISTS collection_versions (
+  name TEXT PRIMARY KEY,
+  version BIGINT NOT NULL
+);
+
+CREATE OR REPLACE FUNCTION bump_user_list_version() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  -- Statements that matched no row leave the listing as it was.
+  IF TG_OP = 'DELETE' THEN
+    PERFORM 1 FROM old_rows LIMIT 1;
+  ELSE
+    PERFORM 1 FROM new_rows LIMIT 1;
+  END IF;
+  IF FOUND THEN
+    INSERT INTO collection_versions AS v (name, version) VALUES ('users', 1)
+    ON CONFLICT (name) DO UPDATE SET version = v.version + 1;
+  END IF;
+  RETURN NULL;
+END$$;
+
+DROP TRIGGER IF EXISTS users_version_insert ON users;
+CREATE TRIGGER users_version_insert AFTER INSERT ON users
+  REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_user_list_version();
+DROP TRIGGER IF EXISTS users_version_update ON users;
+CREATE TRIGGER users_version_update AFTER UPDATE ON users
+  REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_user_list_version();
+DROP TRIGGER IF EXISTS users_version_delete ON users;
+CREATE TRIGGER users_version_delete AFTER DELETE ON users
+  REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_user_list_version();
+
+-- Existing users start at 1, so the first write after this migration moves the version too.
+INSERT INTO collection_versions (name, version)
+SELECT 'users', 1 WHERE EXISTS (SELECT 1 FROM users)
+ON CONFLICT (name) DO NOTHING;
@@ -0,0 +1,86 @@
+"""Pick the password-hash cost that fits this host's latency budget.
+
+Hashes a sample password at increasing cost and reports the median time per hash. The highest
+cost whose median stays within ``--target-ms`` is printed as settings for ``.env``. For bcrypt that
+is ``PASSWORD_BCRYPT_ROUNDS``. For argon2 the memory and parallelism are fixed by the options and
+``PASSWORD_ARGON2_TIME_COST`` is searched. No database or app settings are needed:
+
+    python backend/scripts/calibrate_password_hash.py --target-ms 250
+    python backend/scripts/calibrate_password_hash.py --scheme argon2 --memory-kib 65536 --parallelism 2
+
+Run it on the production hardware, one hash at a time: each login costs about this long on one of
+the ``PASSWORD_HASH_WORKERS`` processes. Existing hashes are upgraded on their next login.
+"""
+
+import argparse
+import statistics
+import time
+from typing import Any, Callable, Optional
+
+from passlib.hash import argon2, bcrypt
+
+SAMPLE_PASSWORD = "calibration-password"
+
+
+def median_ms(handler: Any, samples: int) -> float:
+    handler.hash(SAMPLE_PASSWORD)  # warm-up: loads the backend on first use
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        handler.hash(SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def search(costs: range, handler_for: Callable[[int], Any], target_ms: float, samples: int) -> Optional[int]:
+    """Highest cost within ``target_ms``; costs only ever get slower, so stop at the first miss."""
+    chosen = None
+    for cost in costs:
+        elapsed = median_ms(handler_for(cost), samples)
+        fits = elapsed <= target_ms
+        print(f"{cost:>5} {elapsed:>10.1f}{'' if fits else '  over target'}", flush=True)
+        if not fits:
+            break
+        chosen = cost
+    return chosen
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="median time allowed per hash")
+    parser.add_argument("--samples", type=int, default=3, help="hashes timed per cost")
+    parser.add_argument("--memory-kib", type=int, default=65_536, help="argon2 memory cost")
+    parser.add_argument("--parallelism", type=int, default=4, help="argon2 lanes")
+    args = parser.parse_args()
+
+    if args.scheme == "bcrypt":
+        print(f"{'rounds':>5} {'median_ms':>10}")
+        chosen = search(range(4, 32), lambda rounds: bcrypt.using(rounds=rounds), args.target_ms, args.samples)
+        settings = {"PASSWORD_HASH_SCHEME": "bcrypt", "PASSWORD_BCRYPT_ROUNDS": chosen}
+    else:
+        print(f"{'time':>5} {'median_ms':>10}")
+        chosen = search(
+            range(1, 64),
+            lambda time_cost: argon2.using(
+                type="ID", rounds=time_cost, memory_cost=args.memory_kib, parallelism=args.parallelism
+            ),
+            args.target_ms,
+            args.samples,
+        )
+        settings = {
+            "PASSWORD_HASH_SCHEME": "argon2",
+            "PASSWORD_ARGON2_TIME_COST": chosen,
+            "PASSWORD_ARGON2_MEMORY_KIB": args.memory_kib,
+            "PASSWORD_ARGON2_PARALLELISM": args.parallelism,
+        }
+
+    if chosen is None:
+        raise SystemExit(f"Even the lowest cost takes longer than {args.target_ms:g} ms; raise --target-ms.")
+    print()
+    for name, value in settings.items():
+        print(f"{name}={value}")
+
+
+if __name__ == "__main__":
+    main()
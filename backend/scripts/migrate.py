@@ -1,5 +1,30 @@
+"""Apply pending ``backend/migrations/*.sql`` files in lexicographical order.
+
+Each file runs in its own transaction and is recorded in ``_schema_migrations`` with a SHA-256
+checksum and its execution time. A whole run holds a PostgreSQL advisory lock, so concurrent
+release-phase runs apply every file exactly once. Files that must run outside a transaction
+(``CREATE INDEX CONCURRENTLY`` and friends) start with the directive::
+
+    -- migrate: no-transaction
+
+Their statements are then executed one by one in autocommit mode. A ``CREATE INDEX CONCURRENTLY``
+that failed part-way leaves an INVALID index behind, which ``IF NOT EXISTS`` would silently keep;
+the runner drops such an index before building it again.
+
+    python backend/scripts/migrate.py                   # apply
+    python backend/scripts/migrate.py --dry-run         # print the plan, change nothing
+    python backend/scripts/migrate.py --update-checksums  # accept edits to applied files
+"""
+
+import argparse
+import hashlib
 import os
+import re
+import sys
+import time
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 import psycopg
 from psycopg import sql
@@ -9,11 +34,10 @@ ROOT = Path(__file__).resolve().parents[2]
 load_dotenv(ROOT / ".env")
 load_dotenv(ROOT / "backend" / ".env")
 
-DATABASE_URL = os.environ.get("DATABASE_URL")
-if not DATABASE_URL:
-    raise RuntimeError("DATABASE_URL is required")
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
 
-DB_SCHEMA = os.environ.get("DB_SCHEMA") or "public"
+# Arbitrary application-wide key; combined with the schema name so separate schemas migrate independently.
+LOCK_NAMESPACE = 0x5EED
 
 
 def normalize_dsn(url: str) -> str:
@@ -28,48 +52,297 @@ CREATE TABLE IF NOT EXISTS _schema_migrations (
   filename TEXT UNIQUE NOT NULL,
   applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
+ALTER TABLE _schema_migrations ADD COLUMN IF NOT EXISTS checksum TEXT;
+ALTER TABLE _schema_migrations ADD COLUMN IF NOT EXISTS execution_ms INTEGER;
 """
 
+_DIRECTIVE = re.compile(r"^--\s*migrate:\s*(?P<value>[\w-]+)\s*$", re.IGNORECASE)
+_DOLLAR_TAG = re.compile(r"\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$")
+_CONCURRENT_INDEX = re.compile(
+    r"^\s*CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?(?P<name>\"(?:[^\"]|\"\")+\"|[\w$]+)",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class Migration:
+    path: Path
+    sql: str
+    checksum: str
+    transactional: bool
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+
+def read_directives(text: str) -> set[str]:
+    """``-- migrate: <value>`` lines from the comment header, before the first statement."""
+    directives: set[str] = set()
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if not stripped.startswith("--"):
+            break
+        match = _DIRECTIVE.match(stripped)
+        if match:
+            directives.add(match.group("value").lower())
+    return directives
+
+
+def split_statements(text: str) -> list[str]:
+    """Split a SQL script on top-level semicolons.
+
+    Quoted strings and identifiers, dollar-quoted bodies and comments are skipped, so ``DO``
+    blocks and literals containing ``;`` stay whole. Comment-only fragments are dropped.
+    """
+    statements: list[str] = []
+    start = 0
+    has_code = False
+    i = 0
+    n = len(text)
+    while i < n:
+        if text.startswith("--", i):
+            newline = text.find("\n", i)
+            i = n if newline == -1 else newline + 1
+            continue
+        if text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            continue
+        char = text[i]
+        if char in "'\"":
+            end = i + 1
+            while True:
+                end = text.find(char, end)
+                if end == -1 or not text.startswith(char * 2, end):
+                    break
+                end += 2
+            i = n if end == -1 else end + 1
+            has_code = True
+            continue
+        if char == "$":
+            tag = _DOLLAR_TAG.match(text, i)
+            if tag:
+                end = text.find(tag.group(0), tag.end())
+                i = n if end == -1 else end + len(tag.group(0))
+                has_code = True
+                continue
+        if char == ";":
+            if has_code:
+                statements.append(text[start:i].strip())
+            start = i + 1
+            has_code = False
+        elif not char.isspace():
+            has_code = True
+        i += 1
+    if has_code:
+        statements.append(text[start:].strip())
+    return statements
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> list[Migration]:
+    migrations = []
+    for path in sorted(directory.glob("*.sql")):
+        raw = path.read_bytes()
+        text = raw.decode("utf-8")
+        migrations.append(
+            Migration(
+                path=path,
+                sql=text,
+                checksum=hashlib.sha256(raw).hexdigest(),
+                transactional="no-transaction" not in read_directives(text),
+            )
+        )
+    return migrations
+
 
 def ensure_table(cur: psycopg.Cursor) -> None:
     cur.execute(DDL_MIGRATIONS_TABLE)
 
 
-def applied_set(cur: psycopg.Cursor) -> set[str]:
-    cur.execute("SELECT filename FROM _schema_migrations;")
-    return {row[0] for row in cur.fetchall()}
+def applied_checksums(cur: psycopg.Cursor) -> dict[str, Optional[str]]:
+    # Tables written by the old runner have no checksum column until ensure_table adds it, and
+    # --dry-run never alters anything: read their checksums as NULL.
+    cur.execute(
+        "SELECT 1 FROM information_schema.columns WHERE table_schema = current_schema() "
+        "AND table_name = '_schema_migrations' AND column_name = 'checksum'"
+    )
+    checksum = "checksum" if cur.fetchone() is not None else "NULL"
+    cur.execute(f"SELECT filename, {checksum} FROM _schema_migrations")
+    return {filename: checksum for filename, checksum in cur.fetchall()}
 
 
-def apply_sql(cur: psycopg.Cursor, path: Path) -> None:
-    with path.open("r", encoding="utf-8") as file:
-        statements = file.read()
-    if not statements.strip():
+def acquire_lock(cur: psycopg.Cursor, schema: str) -> None:
+    cur.execute("SELECT pg_try_advisory_lock(%s, hashtext(%s))", (LOCK_NAMESPACE, schema))
+    if cur.fetchone()[0]:
         return
-    cur.execute(statements)
+    print("Another migration run holds the lock; waiting ...", flush=True)
+    cur.execute("SELECT pg_advisory_lock(%s, hashtext(%s))", (LOCK_NAMESPACE, schema))
+
+
+def release_lock(cur: psycopg.Cursor, schema: str) -> None:
+    cur.execute("SELECT pg_advisory_unlock(%s, hashtext(%s))", (LOCK_NAMESPACE, schema))
+
+
+def apply_migration(conn: psycopg.Connection, migration: Migration, lock_timeout: str) -> float:
+    """Run one file and record it; returns the elapsed milliseconds."""
+    started = time.perf_counter()
+    if migration.transactional:
+        with conn.transaction(), conn.cursor() as cur:
+            # Fail fast instead of queueing every query on the table behind a blocked DDL lock.
+            cur.execute("SELECT set_config('lock_timeout', %s, true)", (lock_timeout,))
+            if migration.sql.strip():
+                cur.execute(migration.sql)
+            elapsed = (time.perf_counter() - started) * 1000
+            record(cur, migration, elapsed)
+        return elapsed
+
+    with conn.cursor() as cur:
+        cur.execute("SELECT set_config('lock_timeout', %s, false)", (lock_timeout,))
+        for statement in split_statements(migration.sql):
+            index = concurrent_index_name(statement)
+            if index is not None:
+                drop_invalid_index(cur, index)
+            cur.execute(statement)
+        elapsed = (time.perf_counter() - started) * 1000
+        record(cur, migration, elapsed)
+        cur.execute("RESET lock_timeout")
+    return elapsed
+
+
+def concurrent_index_name(statement: str) -> Optional[str]:
+    """Name of the index a ``CREATE INDEX CONCURRENTLY`` statement builds, as stored in ``pg_class``."""
+    code = "\n".join(line for line in statement.splitlines() if not line.lstrip().startswith("--"))
+    match = _CONCURRENT_INDEX.match(code)
+    if match is None:
+        return None
+    name = match.group("name")
+    return name[1:-1].replace('""', '"') if name.startswith('"') else name.lower()
+
+
+def drop_invalid_index(cur: psycopg.Cursor, name: str) -> None:
+    """Drop ``name`` if an earlier, interrupted concurrent build left it INVALID."""
+    cur.execute(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = %s AND c.relnamespace = current_schema()::regnamespace AND NOT i.indisvalid",
+        (name,),
+    )
+    if cur.fetchone() is not None:
+        print(f"dropping INVALID index {name} left by an earlier run ...", end=" ", flush=True)
+        cur.execute(sql.SQL("DROP INDEX CONCURRENTLY IF EXISTS {}").format(sql.Identifier(name)))
+
+
+def record(cur: psycopg.Cursor, migration: Migration, elapsed_ms: float) -> None:
+    cur.execute(
+        "INSERT INTO _schema_migrations (filename, checksum, execution_ms) VALUES (%s, %s, %s)",
+        (migration.name, migration.checksum, round(elapsed_ms)),
+    )
+
+
+def changed_files(migrations: list[Migration], applied: dict[str, Optional[str]]) -> list[Migration]:
+    return [m for m in migrations if applied.get(m.name) not in (None, m.checksum)]
+
+
+def print_plan(migrations: list[Migration], applied: dict[str, Optional[str]]) -> None:
+    pending = [m for m in migrations if m.name not in applied]
+    for migration in changed_files(migrations, applied):
+        print(f"CHANGED  {migration.name} (applied checksum differs from the file)")
+    for migration in migrations:
+        if migration.name in applied and applied[migration.name] is None:
+            print(f"BACKFILL {migration.name} (checksum will be recorded)")
+    for migration in pending:
+        mode = "transaction" if migration.transactional else "no-transaction"
+        statements = len(split_statements(migration.sql))
+        print(f"PENDING  {migration.name} [{mode}, {statements} statement(s)]")
+    if not pending:
+        print("No pending migrations.")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="print pending and changed files without applying")
+    parser.add_argument(
+        "--update-checksums", action="store_true", help="record current checksums of edited, already-applied files"
+    )
+    parser.add_argument(
+        "--lock-timeout",
+        default=os.environ.get("MIGRATION_LOCK_TIMEOUT", "5s"),
+        help="PostgreSQL lock_timeout while a file runs (default: %(default)s; 0 waits forever)",
+    )
+    return parser.parse_args()
 
 
 def main() -> None:
-    migrations_dir = Path(__file__).resolve().parent.parent / "migrations"
-    with psycopg.connect(normalize_dsn(DATABASE_URL)) as conn:
-        with conn.cursor() as cur:
-            cur.execute(sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(sql.Identifier(DB_SCHEMA)))
-            cur.execute(sql.SQL("SET search_path TO {}").format(sql.Identifier(DB_SCHEMA)))
+    args = parse_args()
+    database_url = os.environ.get("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL is required")
+    schema = os.environ.get("DB_SCHEMA") or "public"
+    migrations = load_migrations()
+
+    # Autocommit: every file opens its own transaction, or none for no-transaction files.
+    with psycopg.connect(normalize_dsn(database_url), autocommit=True) as conn, conn.cursor() as cur:
+        if args.dry_run:
+            cur.execute("SELECT to_regclass(quote_ident(%s) || '._schema_migrations')", (schema,))
+            exists = cur.fetchone()[0] is not None
+            if exists:
+                cur.execute(sql.SQL("SET search_path TO {}").format(sql.Identifier(schema)))
+            print_plan(migrations, applied_checksums(cur) if exists else {})
+            return
+
+        cur.execute(sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(sql.Identifier(schema)))
+        cur.execute(sql.SQL("SET search_path TO {}").format(sql.Identifier(schema)))
+        acquire_lock(cur, schema)
+        try:
             ensure_table(cur)
-            completed = applied_set(cur)
+            # Read after locking so a run that waited sees what the previous holder applied.
+            applied = applied_checksums(cur)
 
-            files = sorted(Path(migrations_dir).glob("*.sql"))
-            for path in files:
-                name = path.name
-                if name in completed:
-                    continue
-                print(f"Applying {name} ...")
-                apply_sql(cur, path)
-                cur.execute(
-                    "INSERT INTO _schema_migrations (filename) VALUES (%s)",
-                    (name,),
+            changed = changed_files(migrations, applied)
+            if changed and args.update_checksums:
+                for migration in changed:
+                    cur.execute(
+                        "UPDATE _schema_migrations SET checksum = %s WHERE filename = %s",
+                        (migration.checksum, migration.name),
+                    )
+                    print(f"Updated checksum of {migration.name}")
+            elif changed:
+                names = ", ".join(m.name for m in changed)
+                sys.exit(
+                    f"Applied migrations were edited: {names}. Add a new migration instead, or rerun with "
+                    "--update-checksums if the edit is intentionally a no-op."
                 )
-        conn.commit()
-    print("Migrations complete.")
+
+            for migration in migrations:
+                if migration.name in applied and applied[migration.name] is None:
+                    # Recorded before checksums existed: trust the file as it is now.
+                    cur.execute(
+                        "UPDATE _schema_migrations SET checksum = %s WHERE filename = %s",
+                        (migration.checksum, migration.name),
+                    )
+
+            total = 0.0
+            for migration in migrations:
+                if migration.name in applied:
+                    continue
+                mode = "" if migration.transactional else " (no transaction)"
+                print(f"Applying {migration.name}{mode} ...", end=" ", flush=True)
+                try:
+                    elapsed = apply_migration(conn, migration, args.lock_timeout)
+                except psycopg.errors.LockNotAvailable:
+                    sys.exit(
+                        f"\n{migration.name} gave up waiting for a table lock after {args.lock_timeout}; "
+                        "retry when traffic is lower or raise --lock-timeout."
+                    )
+                total += elapsed
+                print(f"{elapsed:.0f} ms", flush=True)
+        finally:
+            # Session-level locks also die with the connection; this only matters on success paths.
+            if not conn.closed:
+                release_lock(cur, schema)
+    print(f"Migrations complete in {total:.0f} ms.")
 
 
 if __name__ == "__main__":
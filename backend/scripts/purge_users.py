@@ -0,0 +1,51 @@
+"""Finish user purges left behind by a restart.
+
+``DELETE /users/{id}?mode=background`` hides the user at once and deletes their items in
+batches on the worker that took the request. If that worker stops first, the user stays hidden
+with some items left; this script completes every such purge (safe alongside running workers):
+
+    python backend/scripts/purge_users.py
+    python backend/scripts/purge_users.py --batch-size 1000 --pause-ms 500
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.config import get_settings  # noqa: E402
+from app.db.session import dispose_engines, session_scope  # noqa: E402
+from app.services.users import pending_purges, purge_user  # noqa: E402
+
+
+async def run(batch_size: int, pause_seconds: float) -> None:
+    try:
+        async with session_scope() as db:
+            user_ids = await pending_purges(db)
+        if not user_ids:
+            print("No pending purges.")
+            return
+        for user_id in user_ids:
+            started = time.perf_counter()
+            deleted = await purge_user(user_id, batch_size, pause_seconds)
+            print(f"Purged {user_id}: {deleted} items in {time.perf_counter() - started:.1f}s", flush=True)
+    finally:
+        await dispose_engines()
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=settings.user_purge_batch_size)
+    parser.add_argument("--pause-ms", type=float, default=settings.user_purge_pause_ms)
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size, args.pause_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,24 @@
 """Seed initial data.
 
-The script is idempotent and safe to run multiple times.
+The script is idempotent and safe to run multiple times. Without arguments it provisions the
+admin user and a sample item. With ``--users`` it instead streams synthetic users and items
+through ``COPY`` for load testing:
+
+    python backend/scripts/seed.py --users 100000 --items-per-user zipf --seed 1
+    python backend/scripts/seed.py --users 1000 --items-per-user 50
+
+Generated data is a pure function of ``--seed``, the distribution options and the user index.
+Users are committed in order together with all their items, so the users that exist always form a prefix; a rerun
+(or a run with a larger ``--users``) resumes after it and an identical rerun does nothing.
 """
 
+import argparse
+import random
 import sys
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Callable, Iterator
 
 from sqlalchemy import select
 
@@ -13,12 +27,19 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from app.core.security import get_password_hash  # noqa: E402
-from app.db.session import SessionLocal  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
 from app.models import Item, User  # noqa: E402
 
 ADMIN_EMAIL = "admin@example.com"
 ADMIN_PASSWORD = "adminpass"
 
+LOAD_PASSWORD = "loadpass"
+LOAD_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+LOAD_SPAN_SECONDS = 365 * 24 * 3600
+
+ADJECTIVES = ["red", "quick", "silent", "ancient", "bright", "hollow", "golden", "rusty", "tiny", "vast", "frozen", "lucky"]
+NOUNS = ["report", "invoice", "ledger", "photo", "draft", "ticket", "order", "receipt", "note", "sketch", "backup", "plan"]
+
 
 def seed() -> None:
     with SessionLocal() as session:
@@ -44,5 +65,128 @@ def seed() -> None:
         print("Seed completed.")
 
 
+def load_email(seed_value: int, index: int) -> str:
+    return f"load{seed_value}-{index:09d}@load.example.com"
+
+
+def _user_rng(seed_value: int, index: int) -> random.Random:
+    return random.Random((seed_value << 40) ^ index)
+
+
+def items_per_user(spec: str, alpha: float, cap: int) -> Callable[[random.Random], int]:
+    """A constant count, or ``zipf``: a power-law tail where most users own a handful of
+    items and a few own up to ``cap`` (P(count >= k) ~ k^-alpha)."""
+    if spec != "zipf":
+        count = int(spec)
+        return lambda rng: count
+    return lambda rng: min(cap, int(rng.paretovariate(alpha)))
+
+
+def generate_user(seed_value: int, index: int, count_items: Callable[[random.Random], int]) -> tuple[str, list[str]]:
+    """Return the user's COPY line and its items' COPY lines.
+
+    Values are plain ASCII without tabs or backslashes, so they need no COPY text escaping.
+    """
+    rng = _user_rng(seed_value, index)
+    user_id = f"{rng.getrandbits(128):032x}"
+    items = []
+    for _ in range(count_items(rng)):
+        created_at = LOAD_EPOCH - timedelta(seconds=rng.randrange(LOAD_SPAN_SECONDS))
+        name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {rng.randrange(100000)}"
+        items.append(f"{rng.getrandbits(128):032x}\t{name}\t{user_id}\t{created_at.isoformat()}\n")
+    return user_id, items
+
+
+def existing_prefix(cursor, seed_value: int, users: int) -> int:
+    """Number of generated users already present; existing ones always form a prefix."""
+    low, high = 0, users
+    while low < high:
+        middle = (low + high) // 2
+        cursor.execute("SELECT 1 FROM users WHERE email = %s", (load_email(seed_value, middle),))
+        if cursor.fetchone():
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _batches(args: argparse.Namespace, start: int, password_hash: str) -> Iterator[tuple[int, list[str], list[str]]]:
+    count_items = items_per_user(args.items_per_user, args.zipf_alpha, args.max_items_per_user)
+    users: list[str] = []
+    items: list[str] = []
+    for index in range(start, args.users):
+        user_id, user_items = generate_user(args.seed, index, count_items)
+        users.append(f"{user_id}\t{load_email(args.seed, index)}\t{password_hash}\tuser\n")
+        items.extend(user_items)
+        if len(users) >= args.batch_users or len(items) >= args.batch_items:
+            yield index + 1, users, items
+            users, items = [], []
+    if users:
+        yield args.users, users, items
+
+
+def generate(args: argparse.Namespace) -> None:
+    # One bcrypt hash shared by every generated user: hashing millions of passwords would take
+    # days, and logins cost the same either way.
+    password_hash = get_password_hash(LOAD_PASSWORD)
+    raw = engine.raw_connection()
+    try:
+        conn = raw.driver_connection
+        with conn.cursor() as cursor:
+            # Synthetic data: trade durability of the last commits for load speed, and lift the
+            # API's statement timeout for large COPY batches.
+            cursor.execute("SET synchronous_commit = off")
+            cursor.execute("SET statement_timeout = 0")
+            start = existing_prefix(cursor, args.seed, args.users)
+            conn.commit()
+            if start >= args.users:
+                print(f"All {args.users} users for seed {args.seed} already exist.")
+                return
+            print(f"Generating users {start}..{args.users - 1} for seed {args.seed} (password {LOAD_PASSWORD!r}).")
+
+            started = time.perf_counter()
+            loaded_users = loaded_items = 0
+            for done, users, items in _batches(args, start, password_hash):
+                with cursor.copy("COPY users (id, email, password_hash, role) FROM STDIN") as copy:
+                    copy.write("".join(users))
+                if items:
+                    with cursor.copy("COPY items (id, name, owner_id, created_at) FROM STDIN") as copy:
+                        copy.write("".join(items))
+                conn.commit()
+                loaded_users += len(users)
+                loaded_items += len(items)
+                elapsed = time.perf_counter() - started
+                rate = (loaded_users + loaded_items) / elapsed
+                print(f"  {done}/{args.users} users, {loaded_items} items, {rate:,.0f} rows/s", flush=True)
+
+            cursor.execute("ANALYZE users")
+            cursor.execute("ANALYZE items")
+            conn.commit()
+            print(f"Loaded {loaded_users} users and {loaded_items} items in {time.perf_counter() - started:.1f}s.")
+    finally:
+        raw.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, help="generate this many synthetic users (enables generator mode)")
+    parser.add_argument("--items-per-user", default="zipf", help="a fixed count, or 'zipf' (default)")
+    parser.add_argument("--zipf-alpha", type=float, default=1.1, help="tail exponent; lower is more skewed")
+    parser.add_argument("--max-items-per-user", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0, help="data is deterministic per seed")
+    parser.add_argument("--batch-users", type=int, default=10_000, help="users per COPY transaction")
+    parser.add_argument("--batch-items", type=int, default=500_000, help="item rows that close a batch early")
+    args = parser.parse_args()
+    if args.items_per_user != "zipf" and not args.items_per_user.isdigit():
+        parser.error("--items-per-user must be a non-negative integer or 'zipf'")
+    if args.zipf_alpha <= 0:
+        parser.error("--zipf-alpha must be positive")
+    return args
+
+
 if __name__ == "__main__":
-    seed()
+    arguments = parse_args()
+    if arguments.users is None:
+        seed()
+    else:
+        generate(arguments)
@@ -0,0 +1,5 @@
+#!/bin/bash
+# Runs once, when the primary's data directory is initialised: lets the db-replica service
+# stream WAL over the compose network as the (superuser) application role.
+set -euo pipefail
+echo "host replication ${POSTGRES_USER} all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,15 @@
+#!/bin/bash
+# Hot standby of the compose `db` service. The first start clones the primary with
+# pg_basebackup; -R writes standby.signal and primary_conninfo so the server streams from it.
+set -euo pipefail
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+  until pg_basebackup -h "$PRIMARY_HOST" -U "$PRIMARY_USER" -D "$PGDATA" -R -X stream -c fast; do
+    echo "waiting for the primary at $PRIMARY_HOST ..."
+    rm -rf "${PGDATA:?}"/*
+    sleep 2
+  done
+  chmod 700 "$PGDATA"
+fi
+
+exec postgres -c hot_standby=on
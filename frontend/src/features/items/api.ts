@@ -1,16 +1,35 @@
 import { apiClient } from '@/lib/api';
 import {
   createItemSchema,
-  itemListSchema,
+  itemPageSchema,
   itemSchema,
   updateItemSchema,
   type CreateItemInput,
   type Item,
+  type ItemPage,
   type UpdateItemInput,
 } from './schemas';
 
+// Largest page GET /items accepts (MAX_PAGE_SIZE in backend/app/routers/items.py).
+const MAX_PAGE_SIZE = 200;
+
+export const listItemsPage = async (after?: string | null, limit?: number): Promise<ItemPage> => {
+  const params = new URLSearchParams();
+  if (limit) params.set('limit', String(limit));
+  if (after) params.set('after', after);
+  const query = params.toString();
+  return apiClient.get<ItemPage>(`/items${query ? `?${query}` : ''}`, itemPageSchema);
+};
+
 export const listItems = async (): Promise<Item[]> => {
-  return apiClient.get<Item[]>('/items', itemListSchema);
+  const items: Item[] = [];
+  let after: string | null = null;
+  do {
+    const page: ItemPage = await listItemsPage(after, MAX_PAGE_SIZE);
+    items.push(...page.items);
+    after = page.next_cursor;
+  } while (after);
+  return items;
 };
 
 export const createItem = async (input: CreateItemInput): Promise<Item> => {
@@ -5,10 +5,16 @@ export const itemSchema = z.object({
   name: z.string(),
   owner_id: z.string().uuid(),
   created_at: z.string(),
+  updated_at: z.string(),
 });
 
 export const itemListSchema = z.array(itemSchema);
 
+export const itemPageSchema = z.object({
+  items: itemListSchema,
+  next_cursor: z.string().nullable(),
+});
+
 export const createItemSchema = z.object({
   name: z.string().min(1),
 });
@@ -16,5 +22,6 @@ export const createItemSchema = z.object({
 export const updateItemSchema = createItemSchema.partial();
 
 export type Item = z.infer<typeof itemSchema>;
+export type ItemPage = z.infer<typeof itemPageSchema>;
 export type CreateItemInput = z.infer<typeof createItemSchema>;
 export type UpdateItemInput = z.infer<typeof updateItemSchema>;
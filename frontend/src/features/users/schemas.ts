@@ -7,6 +7,7 @@ export const userSchema = z.object({
   email: z.string().email(),
   role: userRoleSchema,
   created_at: z.string(),
+  updated_at: z.string(),
 });
 
 export const userListSchema = z.array(userSchema);